@@ -0,0 +1,118 @@
+"""Request latency of concurrent coroutines sharing a database, and the lag
+of the event loop, measured by a coroutine ticking every millisecond.
+
+A number of coroutines each repeatedly create a node and find its neighbors,
+while another coroutine scans the whole graph with a filter and saves it.
+Calling GraphDatabase directly from the coroutines blocks the event loop for
+the whole scan or save, delaying every other request. The run is repeated
+with AsyncGraphDatabase, which runs them in an executor and scans in chunks.
+
+    python benchmarks/async_latency.py [nodes] [coroutines]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from edgeable import AsyncGraphDatabase, GraphDatabase
+
+
+def populate(nodes):
+    db = GraphDatabase(filename=os.path.join(tempfile.mkdtemp(), "latency.db"))
+    previous = None
+    for i in range(nodes):
+        node = db.put_node(i, {"value": i})
+        if previous is not None:
+            node.attach(previous)
+        previous = node
+    return db
+
+
+async def heartbeat():
+    lag = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - start - 0.001)
+    except asyncio.CancelledError:
+        return lag
+
+
+async def blocking(db, coroutines, requests):
+    latencies = []
+
+    async def client(c):
+        for i in range(requests):
+            # a request arrives after 1ms of other work, which is delayed
+            # while the event loop is blocked
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            node = db.put_node("client-%d-%d" % (c, i))
+            node.find_neighbors()
+            latencies.append(time.perf_counter() - start - 0.001)
+
+    async def scanner():
+        await asyncio.sleep(0.01)
+        db.get_nodes(lambda node: node.get_property("value") == -1)
+        db.save()
+
+    lag = asyncio.ensure_future(heartbeat())
+    await asyncio.gather(scanner(), *(client(c) for c in range(coroutines)))
+    lag.cancel()
+    return latencies, await lag
+
+
+async def facade(db, coroutines, requests):
+    adb = AsyncGraphDatabase(db)
+    latencies = []
+
+    async def client(c):
+        for i in range(requests):
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            node = await adb.put_node("client-%d-%d" % (c, i))
+            await adb.find_neighbors(node)
+            latencies.append(time.perf_counter() - start - 0.001)
+
+    async def scanner():
+        await asyncio.sleep(0.01)
+        async for node in adb.iter_nodes(lambda node: node.get_property("value") == -1):
+            pass
+        await adb.save()
+
+    lag = asyncio.ensure_future(heartbeat())
+    await asyncio.gather(scanner(), *(client(c) for c in range(coroutines)))
+    lag.cancel()
+    return latencies, await lag
+
+
+def report(label, latencies, lag):
+    latencies = sorted(latencies)
+    print(
+        "%-10s p50 %7.2fms  p99 %7.2fms  max %7.2fms  loop lag %7.2fms"
+        % (
+            label,
+            statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000,
+            latencies[-1] * 1000,
+            lag * 1000,
+        )
+    )
+
+
+if __name__ == "__main__":
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    coroutines = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    for label, fn in (("blocking", blocking), ("async", facade)):
+        db = populate(nodes)
+        loop = asyncio.new_event_loop()
+        latencies, lag = loop.run_until_complete(fn(db, coroutines, 50))
+        loop.close()
+        report(label, latencies, lag)
@@ -0,0 +1,88 @@
+"""Lock contention across independent databases.
+
+Each worker thread writes to and reads from its own database, with a create
+node callback that sleeps to simulate I/O while the write lock is held. The
+run is repeated with every database sharing a single lock, as all databases
+did when the lock was module global.
+
+A second run has the threads attach edges between their own nodes of a single
+database, comparing a graph-wide lock with lock striping. Its create edge
+callback is asynchronous, as a synchronous one would make attaching take the
+graph-wide lock even with striping.
+
+    python benchmarks/contention.py [databases] [operations]
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from edgeable import GraphDatabase, GraphLock
+
+
+def run(databases, operations, shared):
+    lock = GraphLock()
+    dbs = []
+    for i in range(databases):
+        db = GraphDatabase(filename="contention-%d.db" % i)
+        db.on_create_node(lambda node: time.sleep(0.001))
+        if shared:
+            db._graph_lock = lock
+        dbs.append(db)
+
+    def work(db):
+        for i in range(operations):
+            db.put_node(i)
+            db.get_nodes()
+
+    threads = [threading.Thread(target=work, args=(db,)) for db in dbs]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def run_striped(threads, operations, lock_stripes):
+    db = GraphDatabase(filename="contention.db", lock_stripes=lock_stripes)
+    nodes = [db.put_node(i) for i in range(threads * 2)]
+    db.on_create_edge(lambda edge: time.sleep(0.001), asynchronous=True)
+
+    def work(source, destination):
+        for i in range(operations):
+            source.attach(destination, directed=True)
+            source.detach(destination, directed=True)
+
+    workers = [
+        threading.Thread(target=work, args=(nodes[i * 2], nodes[i * 2 + 1]))
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    databases = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    for label, shared in (("shared lock", True), ("per database", False)):
+        elapsed = run(databases, operations, shared)
+        print(
+            "%-14s %d databases x %d operations: %.3fs (%.0f ops/s)"
+            % (label, databases, operations, elapsed, databases * operations / elapsed)
+        )
+
+    for label, lock_stripes in (("graph lock", 0), ("64 stripes", 64)):
+        elapsed = run_striped(databases, operations, lock_stripes)
+        print(
+            "%-14s %d threads x %d attaches: %.3fs (%.0f ops/s)"
+            % (label, databases, operations, elapsed, databases * operations / elapsed)
+        )
@@ -0,0 +1,92 @@
+"""Time and memory allocated per call of the property accessors, on nodes
+with a number of properties, as in a read-heavy serving path.
+
+get_properties copies the properties of a node on every call, while
+get_properties_view returns a read-only view of them. set_properties merges
+the new values into the properties in place. The bytes allocated per call
+are measured by keeping the results of the calls alive, so that they are
+not freed before they are counted.
+
+    python benchmarks/properties.py [nodes] [properties]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from edgeable import GraphDatabase
+
+
+def populate(nodes, properties):
+    db = GraphDatabase()
+    for i in range(nodes):
+        db.put_node(i, {"key-%d" % k: k for k in range(properties)})
+    return db
+
+
+def get_properties(node, i):
+    return node.get_properties()
+
+
+def get_properties_view(node, i):
+    return node.get_properties_view()
+
+
+def set_properties(node, i):
+    return node.set_properties({"key-0": i, "key-1": i})
+
+
+def read_properties(node, i):
+    return node.get_properties()["key-0"]
+
+
+def read_properties_view(node, i):
+    return node.get_properties_view()["key-0"]
+
+
+OPERATIONS = [
+    get_properties,
+    get_properties_view,
+    set_properties,
+    read_properties,
+    read_properties_view,
+]
+
+
+def measure(fn, nodes):
+    """Return the seconds per call, and bytes allocated per call."""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for i, node in enumerate(nodes):
+            fn(node, i)
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        results = [fn(node, i) for (i, node) in enumerate(nodes)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del results
+    finally:
+        gc.enable()
+    return seconds / len(nodes), allocated / len(nodes)
+
+
+def main(nodes=100000, properties=10):
+    db = populate(nodes, properties)
+    targets = db.get_nodes()
+    print("%d nodes with %d properties" % (nodes, properties))
+    print("%-24s %12s %12s" % ("operation", "us/call", "bytes/call"))
+    for fn in OPERATIONS:
+        seconds, allocated = measure(fn, targets)
+        print("%-24s %12.3f %12.0f" % (fn.__name__, seconds * 1e6, allocated))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,336 @@
+"""Benchmark suite of the hot paths of GraphDatabase on reproducible
+synthetic graphs of several sizes and degree distributions.
+
+Graphs are generated from a seed with GraphGenerator, so every run
+measures the same graphs:
+
+    uniform    edges between nodes chosen uniformly at random
+    powerlaw   preferential attachment, so a few hubs have most edges
+
+Each benchmark times a number of operations on random nodes, repeated and
+reported as the best time per operation. Results are written as JSON, and
+compared against a baseline of an earlier run:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline results.json --threshold 0.2
+
+With a threshold, operations which have become slower than it allows are
+reported as regressions, and the exit status is 1 if there are any.
+Baselines depend on the machine, so record one with --output on the
+machine used to compare changes.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from edgeable import GraphDatabase, GraphGenerator
+
+TYPES = ["user", "group", "document", "device"]
+
+
+def node_properties(id, rng):
+    return {"value": id, "type": rng.choice(TYPES)}
+
+
+def edge_properties(source_id, destination_id, rng):
+    return {"weight": rng.random()}
+
+
+def uniform(generator, nodes, degree):
+    """Edges between nodes chosen uniformly, an Erdos-Renyi graph."""
+    generator.erdos_renyi(
+        nodes, degree / max(nodes - 1, 1), False, None, node_properties, edge_properties
+    )
+
+
+def powerlaw(generator, nodes, degree):
+    """Preferential attachment, so a few hubs have most edges."""
+    generator.barabasi_albert(
+        nodes, max(1, degree // 2), None, node_properties, edge_properties
+    )
+
+
+DISTRIBUTIONS = {"uniform": uniform, "powerlaw": powerlaw}
+
+
+def populate(directory, nodes, distribution, degree, seed):
+    db = GraphDatabase(filename=os.path.join(directory, "suite.db"))
+    DISTRIBUTIONS[distribution](GraphGenerator(db, seed), nodes, degree)
+    return db
+
+
+class Context:
+    """State shared by the benchmarks of one graph."""
+
+    def __init__(self, db, seed):
+        self.db = db
+        self.rng = random.Random(seed)
+        self.size = db.get_node_count()
+
+    def nodes(self, count):
+        return [self.db.get_node(self.rng.randrange(self.size)) for _ in range(count)]
+
+    def pairs(self, count):
+        return list(zip(self.nodes(count), self.nodes(count)))
+
+
+# Each benchmark is (name, operations, setup), where setup returns the
+# function timed and the number of operations it performs, which may be
+# fewer than requested. Operations are fewer for those which scan the
+# graph, so large graphs finish in reasonable time.
+
+
+def bench_put_delete_node(ctx, count):
+    ids = ["new-%d" % i for i in range(count)]
+
+    def run():
+        for id in ids:
+            ctx.db.put_node(id, {"value": 0})
+        for id in ids:
+            ctx.db.get_node(id).delete()
+
+    return run, count
+
+
+def bench_attach_detach(ctx, count):
+    pairs = [(a, b) for (a, b) in ctx.pairs(count) if not a.has_edge(b) and a != b]
+
+    def run():
+        for source, destination in pairs:
+            source.attach(destination)
+        for source, destination in pairs:
+            source.detach(destination)
+
+    # pairs which are already attached, or the same node, are skipped
+    return run, len(pairs)
+
+
+def bench_get_property(ctx, count):
+    nodes = ctx.nodes(count)
+
+    def run():
+        for node in nodes:
+            node.get_property("value")
+
+    return run, count
+
+
+def bench_set_property(ctx, count):
+    nodes = ctx.nodes(count)
+
+    def run():
+        for node in nodes:
+            node.set_property("value", 0)
+
+    return run, count
+
+
+def bench_get_nodes(ctx, count):
+    def run():
+        for _ in range(count):
+            ctx.db.get_nodes(lambda node: node.get_property("type") == "user")
+
+    return run, count
+
+
+def bench_get_edges(ctx, count):
+    def run():
+        for _ in range(count):
+            ctx.db.get_edges(
+                lambda edge: edge.get_property("weight") > 0.5,
+                lambda node: node.get_property("type") == "user",
+            )
+
+    return run, count
+
+
+def bench_find_route_to(ctx, count):
+    pairs = ctx.pairs(count)
+
+    def run():
+        for source, destination in pairs:
+            source.find_route_to(destination)
+
+    return run, count
+
+
+def bench_find_routes_to(ctx, count):
+    pairs = ctx.pairs(count)
+
+    def run():
+        for source, destination in pairs:
+            source.find_routes_to(destination, effort=1)
+
+    return run, count
+
+
+def bench_find_neighbors(ctx, count):
+    nodes = ctx.nodes(count)
+
+    def run():
+        for node in nodes:
+            node.find_neighbors(2)
+
+    return run, count
+
+
+def bench_get_edge_count(ctx, count):
+    def run():
+        for _ in range(count):
+            ctx.db.get_edge_count()
+
+    return run, count
+
+
+def bench_save_reload(ctx, count):
+    def run():
+        for _ in range(count):
+            ctx.db.save()
+            ctx.db.reload()
+
+    return run, count
+
+
+BENCHMARKS = [
+    ("put_delete_node", 10000, bench_put_delete_node),
+    ("attach_detach", 10000, bench_attach_detach),
+    ("get_property", 100000, bench_get_property),
+    ("set_property", 10000, bench_set_property),
+    ("get_nodes", 3, bench_get_nodes),
+    ("get_edges", 3, bench_get_edges),
+    ("find_route_to", 3, bench_find_route_to),
+    ("find_routes_to", 1, bench_find_routes_to),
+    ("find_neighbors", 1000, bench_find_neighbors),
+    ("get_edge_count", 3, bench_get_edge_count),
+    ("save_reload", 1, bench_save_reload),
+]
+
+
+def measure(fn, repeat):
+    """Return the best of repeated timings of fn, with the collector off.
+    Runs taking over a second are not repeated, as their noise is small."""
+    best = None
+    for _ in range(repeat):
+        if best is not None and best > 1.0:
+            break
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes, distributions, degree, seed, repeat, only=None):
+    results = {}
+    for size in sizes:
+        for distribution in distributions:
+            directory = tempfile.mkdtemp()
+            try:
+                db = populate(directory, size, distribution, degree, seed)
+                ctx = Context(db, seed)
+                for name, count, setup in BENCHMARKS:
+                    if only and name not in only:
+                        continue
+                    fn, operations = setup(ctx, count)
+                    seconds = measure(fn, repeat)
+                    key = "%s/%s/%d" % (name, distribution, size)
+                    results[key] = {
+                        "operations": operations,
+                        "seconds": seconds,
+                        "us_per_op": seconds / max(operations, 1) * 1e6,
+                    }
+                    print(
+                        "%-36s %12.2f us/op" % (key, results[key]["us_per_op"]),
+                        flush=True,
+                    )
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold=None):
+    """Print the change of each result against the baseline, returning the
+    keys of those which are slower by more than the threshold, if any."""
+    regressions = []
+    print()
+    print("%-36s %12s %12s %8s" % ("benchmark", "baseline", "current", "change"))
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]["us_per_op"]
+        after = result["us_per_op"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if threshold is not None and change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(
+            "%-36s %12.2f %12.2f %+7.0f%%%s" % (key, before, after, change * 100, flag)
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--distributions", default=",".join(DISTRIBUTIONS))
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="comma separated benchmark names")
+    parser.add_argument("--output", help="file to write the results to")
+    parser.add_argument("--baseline", help="results of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="fraction slower than the baseline reported as a regression, "
+        "exiting with status 1",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    distributions = args.distributions.split(",")
+    for distribution in distributions:
+        if distribution not in DISTRIBUTIONS:
+            parser.error("unknown distribution '%s'" % distribution)
+    only = args.only.split(",") if args.only else None
+
+    results = run(sizes, distributions, args.degree, args.seed, args.repeat, only)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "degree": args.degree,
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print("\n%d regressions" % len(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,34 @@
-from edgeable.threadlock import GraphModifyLock, GraphReadLock
+from edgeable.threadlock import (
+    GraphModifyLock,
+    GraphLocalModifyLock,
+    GraphReadLock,
+    GraphLock,
+)
+from edgeable.components import GraphComponents
+from edgeable.reachability import GraphReachability
+from edgeable.cache import GraphCache
+from edgeable.dispatcher import GraphDispatcher
+from edgeable.subscriptions import GraphSubscriptions
+from edgeable.profiler import GraphProfiler
+from edgeable.slowlog import GraphSlowLog, GraphSlowLogged
+from edgeable.predicates import P, GraphPredicate
+from edgeable.index import GraphIndex
 
 from edgeable.edge import GraphEdge
 from edgeable.node import GraphNode
+from edgeable.snapshot import GraphSnapshot, GraphSnapshotNode, GraphSnapshotEdge
+from edgeable.view import GraphView, GraphViewNode, GraphViewEdge
+from edgeable.transaction import GraphTransaction
+from edgeable.feed import GraphFeed, GraphFeedServer, GraphReplica
+from edgeable.server import GraphServer
+from edgeable.client import (
+    GraphClient,
+    GraphClientBatch,
+    GraphRemoteNode,
+    GraphRemoteEdge,
+)
 from edgeable.database import GraphDatabase
+from edgeable.analytics import GraphAnalytics
+from edgeable.generators import GraphGenerator
+from edgeable.query import GraphQuery
+from edgeable.async_database import AsyncGraphDatabase, AsyncGraphTransaction
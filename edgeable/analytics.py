@@ -0,0 +1,201 @@
+import random
+
+from edgeable import GraphReadLock
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+class GraphAnalytics:
+    """Vectorized centrality measures over a graph database. The graph is
+    converted to a sparse adjacency structure of NumPy arrays, which is
+    cached until the graph is structurally modified. Requires NumPy."""
+
+    def __init__(self, db):
+        if numpy is None:
+            raise RuntimeError("Graph analytics requires numpy to be installed.")
+        self._db = db
+        self._generation = None
+        self._ids = []
+        self._sources = None
+        self._destinations = None
+        self._offsets = None
+
+    @GraphReadLock
+    def _matrix(self):
+        """Build the adjacency arrays, or return the cached ones if the graph
+        has not changed. Edges are stored sorted by source, with _offsets
+        giving the slice of each node's outgoing edges."""
+        if self._generation == self._db._generation:
+            return
+
+        ids = list(self._db._graph.keys())
+        index = {id: i for (i, id) in enumerate(ids)}
+        sources = []
+        destinations = []
+        for i, id in enumerate(ids):
+            for destination_id in self._db._graph[id]._edges:
+                # directed edges to deleted nodes are skipped, as in traversals
+                if destination_id in index:
+                    sources.append(i)
+                    destinations.append(index[destination_id])
+
+        self._ids = ids
+        self._sources = numpy.array(sources, dtype=numpy.int64)
+        self._destinations = numpy.array(destinations, dtype=numpy.int64)
+        self._offsets = numpy.zeros(len(ids) + 1, dtype=numpy.int64)
+        numpy.cumsum(
+            numpy.bincount(self._sources, minlength=len(ids)), out=self._offsets[1:]
+        )
+        self._generation = self._db._generation
+
+    def _results(self, scores, property_key):
+        results = dict(zip(self._ids, scores.tolist()))
+        if property_key is not None:
+            for id, score in results.items():
+                if id in self._db._graph:
+                    self._db._graph[id].set_property(property_key, score)
+        return results
+
+    def degree_centrality(self, property_key=None):
+        """Return a dict of node id to out-degree, normalized by the number
+        of other nodes. If property_key is provided the score is also set as a
+        property on each node."""
+        self._matrix()
+        n = len(self._ids)
+        degrees = numpy.diff(self._offsets).astype(numpy.float64)
+        return self._results(degrees / max(n - 1, 1), property_key)
+
+    def pagerank(
+        self, damping=0.85, max_iterations=100, tolerance=1.0e-6, property_key=None
+    ):
+        """Return a dict of node id to PageRank score, computed by power
+        iteration. Rank from nodes without outgoing edges is spread evenly
+        across all nodes. If property_key is provided the score is also set as a
+        property on each node."""
+        self._matrix()
+        n = len(self._ids)
+        if not n:
+            return {}
+
+        out_degree = numpy.diff(self._offsets).astype(numpy.float64)
+        dangling = out_degree == 0
+        weights = 1.0 / out_degree[self._sources] if len(self._sources) else None
+
+        rank = numpy.full(n, 1.0 / n)
+        for _ in range(max_iterations):
+            spread = numpy.bincount(
+                self._destinations,
+                weights=rank[self._sources] * weights if weights is not None else None,
+                minlength=n,
+            )
+            updated = (
+                damping * (spread + rank[dangling].sum() / n) + (1.0 - damping) / n
+            )
+            converged = numpy.abs(updated - rank).sum() < n * tolerance
+            rank = updated
+            if converged:
+                break
+
+        return self._results(rank, property_key)
+
+    def eigenvector_centrality(
+        self, max_iterations=100, tolerance=1.0e-6, property_key=None
+    ):
+        """Return a dict of node id to eigenvector centrality, based on
+        incoming edges and computed by power iteration. If property_key is
+        provided the score is also set as a property on each node."""
+        self._matrix()
+        n = len(self._ids)
+        if not n:
+            return {}
+
+        x = numpy.full(n, 1.0 / n)
+        for _ in range(max_iterations):
+            # adding x shifts the spectrum, avoiding oscillation on bipartite graphs
+            updated = x + numpy.bincount(
+                self._destinations, weights=x[self._sources], minlength=n
+            )
+            norm = numpy.linalg.norm(updated)
+            updated = updated / norm if norm else updated
+            converged = numpy.abs(updated - x).sum() < n * tolerance
+            x = updated
+            if converged:
+                break
+
+        return self._results(x, property_key)
+
+    def betweenness_centrality(
+        self, samples=None, seed=None, normalized=True, property_key=None
+    ):
+        """Return a dict of node id to betweenness centrality, computed with
+        Brandes' algorithm. If samples is provided only that many randomly
+        chosen source nodes are used and the result is scaled to estimate
+        the exact value. If property_key is provided the score is also set as a
+        property on each node."""
+        self._matrix()
+        n = len(self._ids)
+        if not n:
+            return {}
+
+        sources = range(n)
+        if samples is not None and samples < n:
+            sources = random.Random(seed).sample(range(n), samples)
+
+        betweenness = numpy.zeros(n)
+        for source in sources:
+            betweenness += self._dependencies(source)
+
+        if samples is not None and samples < n:
+            betweenness *= n / samples
+        if normalized and n > 2:
+            betweenness /= (n - 1) * (n - 2)
+
+        return self._results(betweenness, property_key)
+
+    def _dependencies(self, source):
+        """Single-source shortest path dependencies, expanding the search one
+        whole level of edges at a time."""
+        n = len(self._ids)
+        distance = numpy.full(n, -1, dtype=numpy.int64)
+        paths = numpy.zeros(n)
+        distance[source] = 0
+        paths[source] = 1.0
+
+        levels = []
+        frontier = numpy.array([source], dtype=numpy.int64)
+        depth = 0
+        while len(frontier):
+            # gather every outgoing edge of the frontier
+            starts = self._offsets[frontier]
+            counts = self._offsets[frontier + 1] - starts
+            if not counts.sum():
+                break
+            edges = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts)
+            edges += numpy.arange(counts.sum())
+            parents = self._sources[edges]
+            children = self._destinations[edges]
+
+            unseen = children[distance[children] == -1]
+            distance[unseen] = depth + 1
+
+            shortest = distance[children] == depth + 1
+            parents = parents[shortest]
+            children = children[shortest]
+            numpy.add.at(paths, children, paths[parents])
+            levels.append((parents, children))
+
+            frontier = numpy.unique(unseen)
+            depth += 1
+
+        dependency = numpy.zeros(n)
+        for parents, children in reversed(levels):
+            numpy.add.at(
+                dependency,
+                parents,
+                paths[parents] / paths[children] * (1.0 + dependency[children]),
+            )
+        dependency[source] = 0.0
+        return dependency
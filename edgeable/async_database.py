@@ -0,0 +1,238 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from edgeable import GraphNode, GraphReadLock
+from edgeable.database import GraphDatabase
+from edgeable.parallel import _everything
+
+
+@GraphReadLock
+def _scan(db, ids, filter_fn):
+    """Return the nodes with the provided ids which still exist and match."""
+    graph = db._graph
+    return [graph[id] for id in ids if id in graph and filter_fn(graph[id])]
+
+
+@GraphReadLock
+def _ids(db):
+    return list(db._graph)
+
+
+class AsyncGraphDatabase:
+    """Asyncio facade for a GraphDatabase. Operations which lock the graph,
+    scan it or access the file system run in an executor, so waiting for
+    the lock or for a long search never blocks the event loop. Scans and
+    traversals are fetched in chunks, yielding to the loop between them.
+    Nodes and edges returned are those of the underlying database; their
+    getters do not lock and may be used directly."""
+
+    def __init__(self, db=None, executor=None, chunk_size=1000):
+        if db is not None and type(db) is not GraphDatabase:
+            raise RuntimeError("Database must be an instance of GraphDatabase.")
+        if type(chunk_size) is not int or chunk_size < 1:
+            raise RuntimeError("Chunk size must be a positive integer.")
+        self._db = db if db is not None else GraphDatabase()
+        self._executor = executor
+        self._chunk_size = chunk_size
+
+    @classmethod
+    async def open(cls, *args, executor=None, chunk_size=1000, **kwargs):
+        """Create a GraphDatabase with the provided arguments, loading its
+        file in the executor, and return a facade for it."""
+        loop = asyncio.get_event_loop()
+        db = await loop.run_in_executor(
+            executor, functools.partial(GraphDatabase, *args, **kwargs)
+        )
+        return cls(db, executor, chunk_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.save()
+
+    @property
+    def db(self):
+        """The underlying GraphDatabase."""
+        return self._db
+
+    async def run(self, fn, *args, **kwargs):
+        """Call any function in the executor and return its result."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _iterate(self, iterator):
+        while True:
+            chunk = await self.run(
+                lambda: list(itertools.islice(iterator, self._chunk_size))
+            )
+            for item in chunk:
+                yield item
+            if len(chunk) < self._chunk_size:
+                return
+
+    async def get_node(self, id):
+        """Get the node with the provided id, or None if it does not exist."""
+        return self._db.get_node(id)
+
+    async def has_node(self, id):
+        """Boolean indicating if the node is defined."""
+        return self._db.has_node(id)
+
+    async def put_node(self, id, properties={}):
+        """Create a node, or update it if it already exists. Returns the node."""
+        return await self.run(self._db.put_node, id, properties)
+
+    async def delete_node(self, node):
+        """Delete the node and all associated edges."""
+        return await self.run(node.delete)
+
+    async def attach(self, source, destination, properties={}, directed=False):
+        """Attach two nodes with an edge, as GraphNode.attach."""
+        return await self.run(source.attach, destination, properties, directed)
+
+    async def detach(self, source, destination=None, directed=False):
+        """Detach two nodes, as GraphNode.detach."""
+        return await self.run(source.detach, destination, directed)
+
+    async def get_nodes(self, filter_fn=_everything, parallel=False, workers=None):
+        """Return all nodes, or nodes which match the optional filter function."""
+        return await self.run(self._db.get_nodes, filter_fn, parallel, workers)
+
+    async def get_edges(
+        self,
+        edge_filter_fn=_everything,
+        node_filter_fn=_everything,
+        parallel=False,
+        workers=None,
+    ):
+        """Return all edges, or edges which match the optional filter function."""
+        return await self.run(
+            self._db.get_edges, edge_filter_fn, node_filter_fn, parallel, workers
+        )
+
+    async def transform_nodes(
+        self, transform_fn, filter_fn=_everything, parallel=False, workers=None
+    ):
+        """Set properties on nodes from the dicts returned by transform_fn."""
+        return await self.run(
+            self._db.transform_nodes, transform_fn, filter_fn, parallel, workers
+        )
+
+    async def iter_nodes(self, filter_fn=lambda node: True):
+        """Asynchronously iterate over all nodes, or nodes which match the
+        optional filter function. The read lock is only held while each
+        chunk is scanned, so writers and other coroutines run in between.
+        Nodes created during the scan are not included."""
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        ids = await self.run(_ids, self._db)
+        for start in range(0, len(ids), self._chunk_size):
+            chunk = ids[start : start + self._chunk_size]
+            for node in await self.run(_scan, self._db, chunk, filter_fn):
+                yield node
+
+    async def bfs(self, node, **kwargs):
+        """Asynchronously traverse the graph breadth first, as GraphNode.bfs."""
+        if type(node) is not GraphNode:
+            raise RuntimeError("Node must be an instance of GraphNode.")
+        async for step in self._iterate(node.bfs(**kwargs)):
+            yield step
+
+    async def dfs(self, node, **kwargs):
+        """Asynchronously traverse the graph depth first, as GraphNode.dfs."""
+        if type(node) is not GraphNode:
+            raise RuntimeError("Node must be an instance of GraphNode.")
+        async for step in self._iterate(node.dfs(**kwargs)):
+            yield step
+
+    async def find_route_to(self, source, destination, skip=[]):
+        """Find a route between two nodes, as GraphNode.find_route_to."""
+        return await self.run(source.find_route_to, destination, skip)
+
+    async def find_routes_to(self, source, destination, effort=5):
+        """Find multiple routes between two nodes, as GraphNode.find_routes_to."""
+        return await self.run(source.find_routes_to, destination, effort)
+
+    async def find_neighbors(self, node, distance=1, distance_fn=lambda edge: 1):
+        """Find all neighbors of a node, as GraphNode.find_neighbors."""
+        return await self.run(node.find_neighbors, distance, distance_fn)
+
+    async def snapshot(self):
+        """Return a read-only snapshot of the database, see GraphDatabase.snapshot."""
+        return await self.run(self._db.snapshot)
+
+    def transaction(self):
+        """Return an asynchronous context manager holding the write lock,
+        see GraphDatabase.transaction. The lock is acquired without blocking
+        the loop, and operations within it are awaited through the
+        transaction."""
+        return AsyncGraphTransaction(self._db)
+
+    async def flush_events(self, timeout=None):
+        """Wait until queued events have been delivered to the asynchronous
+        callbacks, see GraphDatabase.flush_events."""
+        return await self.run(self._db.flush_events, timeout)
+
+    async def save(self):
+        """Save the database to the local filesystem."""
+        await self.run(self._db.save)
+
+    async def reload(self):
+        """Reload the database from the local filesystem."""
+        await self.run(self._db.reload)
+
+
+class AsyncGraphTransaction:
+    """Transaction of an AsyncGraphDatabase. The lock is owned by a thread,
+    so the transaction has its own thread in which it is acquired, used
+    and released."""
+
+    def __init__(self, db):
+        self._db = db
+        self._transaction = db.transaction()
+        self._executor = None
+
+    async def __aenter__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="edgeable-transaction"
+        )
+        try:
+            await self.run(self._transaction.__enter__)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.run(self._transaction.__exit__, exc_type, exc_val, exc_tb)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def run(self, fn, *args, **kwargs):
+        """Call a function within the transaction and return its result."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def put_node(self, id, properties={}):
+        """Create a node, or update it if it already exists. Returns the node."""
+        return await self.run(self._db.put_node, id, properties)
+
+    async def delete_node(self, node):
+        """Delete the node and all associated edges."""
+        return await self.run(node.delete)
+
+    async def attach(self, source, destination, properties={}, directed=False):
+        """Attach two nodes with an edge, as GraphNode.attach."""
+        return await self.run(source.attach, destination, properties, directed)
+
+    async def detach(self, source, destination=None, directed=False):
+        """Detach two nodes, as GraphNode.detach."""
+        return await self.run(source.detach, destination, directed)
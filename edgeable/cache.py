@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+
+class GraphCache:
+    """Least recently used cache of query results. Entries are expired as a
+    whole whenever the generation of the graph changes. A max_size of zero
+    disables the cache."""
+
+    def __init__(self, max_size=0):
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._generation = None
+        self._hits = 0
+        self._misses = 0
+
+    def fetch(self, key, generation, fn):
+        """Return the cached result for key, or call fn and cache its result."""
+        if not self._max_size:
+            return fn()
+
+        with self._lock:
+            if self._generation != generation:
+                self._entries.clear()
+                self._generation = generation
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+
+        value = fn()
+
+        with self._lock:
+            if self._generation == generation:
+                self._entries[key] = value
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get_stats(self):
+        """Return a dict of cache statistics."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
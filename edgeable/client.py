@@ -0,0 +1,433 @@
+import itertools
+import socket
+import threading
+from concurrent.futures import Future
+
+from edgeable.server import _frame, _read_frames
+
+
+class _Connection:
+    """Connection to a GraphServer. Requests are sent without waiting for
+    earlier responses, which a reader thread matches to their futures."""
+
+    def __init__(self, address):
+        if type(address) is str:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(address)
+        else:
+            self._socket = socket.create_connection(address)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._ids = itertools.count()
+        self._closed = False
+        self._reader = threading.Thread(
+            target=self._read, name="edgeable-client", daemon=True
+        )
+        self._reader.start()
+
+    def send(self, operations, atomic=False):
+        """Send a batch of operations, returning a future of their results."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection is closed.")
+            id = next(self._ids)
+            frame = _frame((id, atomic, operations))
+            self._pending[id] = future
+            self._socket.sendall(frame)
+        return future
+
+    def close(self):
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._reader.join()
+
+    def _read(self):
+        try:
+            with self._socket.makefile("rb") as stream:
+                for id, results in _read_frames(stream):
+                    with self._lock:
+                        future = self._pending.pop(id)
+                    future.set_result(results)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._closed = True
+                pending = list(self._pending.values())
+                self._pending = {}
+            for future in pending:
+                future.set_exception(RuntimeError("Connection is closed."))
+
+
+def _value(result):
+    ok, value = result
+    if not ok:
+        raise RuntimeError(value)
+    return value
+
+
+class GraphClient:
+    """Client of a GraphServer, mirroring the GraphDatabase interface. The
+    address is the path of a Unix socket or a (host, port) tuple.
+
+    Up to pool_size connections are opened as needed and shared by all
+    threads, with requests assigned to them in turn. Requests are pipelined:
+    a connection carries further requests while earlier ones are answered.
+    Filter functions cannot be sent, so get_nodes takes a dict of property
+    values to match instead."""
+
+    def __init__(self, address, pool_size=4):
+        if type(pool_size) is not int or pool_size < 1:
+            raise RuntimeError("Pool size must be a positive integer.")
+        self._address = address
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        self._connections = []
+        self._next = itertools.count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close all connections."""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for connection in connections:
+            connection.close()
+
+    def _connection(self):
+        with self._lock:
+            self._connections = [c for c in self._connections if not c._closed]
+            if len(self._connections) < self._pool_size:
+                self._connections.append(_Connection(self._address))
+                return self._connections[-1]
+            return self._connections[next(self._next) % len(self._connections)]
+
+    def _send(self, operations, atomic=False):
+        return self._connection().send(operations, atomic)
+
+    def submit(self, name, *args, **kwargs):
+        """Send an operation without waiting for it, returning a future of
+        its result."""
+        future = Future()
+
+        def done(results):
+            try:
+                future.set_result(_value(results.result()[0]))
+            except Exception as e:
+                future.set_exception(e)
+
+        self._send([(name, args, kwargs)]).add_done_callback(done)
+        return future
+
+    def call(self, name, *args, **kwargs):
+        """Perform an operation and return its result."""
+        return _value(self._send([(name, args, kwargs)]).result()[0])
+
+    def batch(self, atomic=False):
+        """Return a batch, which sends the operations added to it within a
+        with block as a single request. If atomic=True they are performed
+        in a transaction, and are all rolled back if any fails."""
+        return GraphClientBatch(self, atomic)
+
+    def _node(self, id):
+        return None if id is None else GraphRemoteNode(self, id)
+
+    def _nodes(self, ids):
+        return None if ids is None else [GraphRemoteNode(self, id) for id in ids]
+
+    def _edges(self, ids):
+        return [GraphRemoteEdge(self, s, d) for (s, d) in ids]
+
+    def put_node(self, id, properties={}):
+        """Create a node, or update it if it already exists. Returns the node."""
+        return self._node(self.call("put_node", id, properties))
+
+    def get_node(self, id):
+        """Get the node with the provided id, or None if it does not exist."""
+        return GraphRemoteNode(self, id) if self.has_node(id) else None
+
+    def has_node(self, id):
+        """Boolean indicating if the node is defined."""
+        return self.call("has_node", id)
+
+    def get_nodes(self, properties={}):
+        """Return all nodes, or nodes with all of the provided property values."""
+        return self._nodes(self.call("get_nodes", properties))
+
+    def get_edges(self):
+        """Return all edges."""
+        return self._edges(self.call("get_edges"))
+
+    def get_node_count(self):
+        """Return the number of nodes."""
+        return self.call("get_node_count")
+
+    def get_edge_count(self):
+        """Return the number of edges."""
+        return self.call("get_edge_count")
+
+    def get_property(self, key):
+        """Get the property value."""
+        return self.call("get_property", key)
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self.call("get_properties")
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self.call("has_property", key)
+
+    def set_property(self, key, value):
+        """Set a database property."""
+        return self.call("set_property", key, value)
+
+    def set_properties(self, properties):
+        """Set multiple properties from the provided dict."""
+        return self.call("set_properties", properties)
+
+    def delete_property(self, key):
+        """Delete a property if it is defined. Returns the previous value, or None."""
+        return self.call("delete_property", key)
+
+    def save(self):
+        """Save the database to the filesystem of the server."""
+        return self.call("save")
+
+
+class GraphClientBatch:
+    """Operations sent to a GraphServer as a single request. Each call
+    returns a future, which has its result once the with block exits."""
+
+    def __init__(self, client, atomic):
+        self._client = client
+        self._atomic = atomic
+        self._operations = []
+        self._futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.send().result()
+
+    def call(self, name, *args, **kwargs):
+        """Add an operation to the batch, returning a future of its result."""
+        future = Future()
+        self._operations.append((name, args, kwargs))
+        self._futures.append(future)
+        return future
+
+    def send(self):
+        """Send the operations, returning a future which is done when all of
+        their results have been received."""
+        futures = self._futures
+        operations = self._operations
+        self._operations = []
+        self._futures = []
+        done = Future()
+
+        def received(results):
+            try:
+                results = results.result()
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                done.set_exception(e)
+                return
+            for future, result in zip(futures, results):
+                try:
+                    future.set_result(_value(result))
+                except Exception as e:
+                    future.set_exception(e)
+            done.set_result(None)
+
+        if not operations:
+            done.set_result(None)
+            return done
+        self._client._send(operations, self._atomic).add_done_callback(received)
+        return done
+
+
+class GraphRemoteNode:
+    """Node of a database served by a GraphServer. Every method is a
+    request to the server, so properties are never stale."""
+
+    def __init__(self, client, id):
+        self._client = client
+        self._id = id
+
+    def __eq__(self, other):
+        if isinstance(other, GraphRemoteNode):
+            return self._id == other._id
+        return False
+
+    def __str__(self):
+        return str(self._id)
+
+    def __repr__(self):
+        return str(self._id)
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def get_id(self):
+        return self._id
+
+    def _call(self, name, *args):
+        return self._client.call("node_" + name, self._id, *args)
+
+    def _check(self, node):
+        if type(node) is not GraphRemoteNode:
+            raise RuntimeError("Node must be an instance of GraphRemoteNode.")
+        return node._id
+
+    def attach(self, destination, properties={}, directed=False):
+        """Attach this node to another node with an edge."""
+        return self._call("attach", self._check(destination), properties, directed)
+
+    def detach(self, destination=None, directed=False):
+        """Detach this node from another node, or all nodes."""
+        destination_id = None if destination is None else self._check(destination)
+        return self._call("detach", destination_id, directed)
+
+    def delete(self):
+        """Delete this node and all associated edges."""
+        return self._call("delete")
+
+    def get_property(self, key):
+        """Get the property value."""
+        return self._call("get_property", key)
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._call("get_properties")
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self._call("has_property", key)
+
+    def set_property(self, key, value):
+        """Set a node property."""
+        return self._call("set_property", key, value)
+
+    def set_properties(self, properties):
+        """Set multiple properties from the provided dict."""
+        return self._call("set_properties", properties)
+
+    def delete_property(self, key):
+        """Delete a property if it is defined. Returns the previous value, or None."""
+        return self._call("delete_property", key)
+
+    def get_edges(self):
+        """Return all edges of this node."""
+        return self._client._edges(self._call("get_edges"))
+
+    def get_edge(self, destination):
+        """Return the edge to the specified destination node, or None if one does not exist."""
+        if not self.has_edge(destination):
+            return None
+        return GraphRemoteEdge(self._client, self._id, destination._id)
+
+    def has_edge(self, destination):
+        """Boolean whether an edge exists to the specified destination node."""
+        return self._call("has_edge", self._check(destination))
+
+    def is_connected_to(self, other):
+        """Boolean whether the nodes are in the same connected component."""
+        return self._call("is_connected_to", self._check(other))
+
+    def can_reach(self, destination):
+        """Boolean whether a directed path leads to the destination node."""
+        return self._call("can_reach", self._check(destination))
+
+    def find_route_to(self, destination, skip=[]):
+        """Find a route to the destination node, as a list of nodes, or None."""
+        skip = [self._check(node) for node in skip]
+        return self._client._nodes(
+            self._call("find_route_to", self._check(destination), skip)
+        )
+
+    def find_routes_to(self, destination, effort=5):
+        """Find multiple routes to the destination node."""
+        routes = self._call("find_routes_to", self._check(destination), effort)
+        return [self._client._nodes(route) for route in routes]
+
+    def find_neighbors(self, distance=1):
+        """Find all neighbors the specified number of edges away."""
+        return self._client._nodes(self._call("find_neighbors", distance))
+
+
+class GraphRemoteEdge:
+    """Edge of a database served by a GraphServer."""
+
+    def __init__(self, client, source_id, destination_id):
+        self._client = client
+        self._source_id = source_id
+        self._destination_id = destination_id
+
+    def __eq__(self, other):
+        if isinstance(other, GraphRemoteEdge):
+            return (
+                self._source_id == other._source_id
+                and self._destination_id == other._destination_id
+            )
+        return False
+
+    def __str__(self):
+        return "%s->%s" % (self._source_id, self._destination_id)
+
+    def __repr__(self):
+        return "%s->%s" % (self._source_id, self._destination_id)
+
+    def _call(self, name, *args):
+        return self._client.call(
+            "edge_" + name, self._source_id, self._destination_id, *args
+        )
+
+    def get_source(self):
+        """Get the node which is the source of this edge."""
+        return GraphRemoteNode(self._client, self._source_id)
+
+    def get_destination(self):
+        """Get the node which is the destination of this edge."""
+        return GraphRemoteNode(self._client, self._destination_id)
+
+    def get_property(self, key):
+        """Get the property value."""
+        return self._call("get_property", key)
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._call("get_properties")
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self._call("has_property", key)
+
+    def set_property(self, key, value, directed=False):
+        """Set an edge property, mirrored to the reverse edge unless directed."""
+        return self._call("set_property", key, value, directed)
+
+    def set_properties(self, properties, directed=False):
+        """Set multiple properties, mirrored to the reverse edge unless directed."""
+        return self._call("set_properties", properties, directed)
+
+    def delete_property(self, key):
+        """Delete a property if it is defined. Returns the previous value, or None."""
+        return self._call("delete_property", key)
+
+    def delete(self, directed=False):
+        """Delete this edge, and the reverse edge unless directed."""
+        return self._call("delete", directed)
@@ -0,0 +1,95 @@
+import threading
+
+
+class GraphComponents:
+    """Union-find index of the connected components of a graph. Edges are
+    treated as undirected, so a directed edge also joins its two nodes into
+    one component. Removing an edge can split a component, which union-find
+    cannot express, so removals invalidate the index and it is rebuilt
+    lazily on the next query."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._parent = {}
+        self._members = {}
+        self._valid = False
+
+    def invalidate(self):
+        """Discard the index, it will be rebuilt on the next query."""
+        with self._lock:
+            self._valid = False
+            self._parent = {}
+            self._members = {}
+
+    def union(self, a, b):
+        """Record that the nodes with ids a and b are connected."""
+        with self._lock:
+            if self._valid:
+                self._link(a, b)
+
+    def connected(self, graph, a, b):
+        """Boolean indicating if the nodes with ids a and b share a component."""
+        with self._lock:
+            self._ensure(graph)
+            return self._find(a) == self._find(b)
+
+    def root(self, graph, id):
+        """Return the representative node id of the component containing id."""
+        with self._lock:
+            self._ensure(graph)
+            return self._find(id)
+
+    def members(self, graph, id):
+        """Return the ids of all nodes in the component containing id."""
+        with self._lock:
+            self._ensure(graph)
+            root = self._find(id)
+            return list(self._members.get(root, [root]))
+
+    def groups(self, graph):
+        """Return a list of components, each a list of node ids."""
+        with self._lock:
+            self._ensure(graph)
+            roots = {}
+            for id in graph:
+                root = self._find(id)
+                if root not in roots:
+                    roots[root] = list(self._members.get(root, [root]))
+            return list(roots.values())
+
+    def _ensure(self, graph):
+        if self._valid:
+            return
+        self._parent = {}
+        self._members = {}
+        for node in graph.values():
+            for destination_id in node._edges:
+                # directed edges to deleted nodes remain, but join nothing
+                if destination_id in graph:
+                    self._link(node._id, destination_id)
+        self._valid = True
+
+    def _find(self, id):
+        parent = self._parent
+        if id not in parent:
+            return id
+        while parent[id] != id:
+            parent[id] = parent[parent[id]]
+            id = parent[id]
+        return id
+
+    def _link(self, a, b):
+        for id in (a, b):
+            if id not in self._parent:
+                self._parent[id] = id
+                self._members[id] = [id]
+
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+
+        # union by size, merging the smaller member list into the larger
+        if len(self._members[a]) < len(self._members[b]):
+            a, b = b, a
+        self._parent[b] = a
+        self._members[a].extend(self._members.pop(b))
@@ -1,13 +1,41 @@
 import pickle
 import logging
 import gzip
-import types
 import os
 import tempfile
 import numbers
+import random
 import uuid
-
-from edgeable import GraphNode, GraphModifyLock, GraphReadLock
+import threading
+import time
+import weakref
+from types import MappingProxyType
+
+from edgeable import (
+    GraphNode,
+    GraphEdge,
+    GraphModifyLock,
+    GraphReadLock,
+    GraphLock,
+    GraphComponents,
+    GraphReachability,
+    GraphCache,
+    GraphSnapshot,
+    GraphView,
+    GraphTransaction,
+    GraphDispatcher,
+    GraphSubscriptions,
+    GraphProfiler,
+    GraphSlowLog,
+    GraphSlowLogged,
+    GraphPredicate,
+    GraphIndex,
+)
+from edgeable.snapshot import _capture, _replace
+from edgeable.parallel import evaluate, _check_parallel, _everything
+from edgeable.feed import GraphFeed, GraphFeedServer, write_changes
+from edgeable.server import GraphServer
+from edgeable.memory import memory_report
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("edgeable")
@@ -16,22 +44,62 @@ logger = logging.getLogger("edgeable")
 class GraphDatabase:
     """Class representing the graph database."""
 
-    def __init__(self, filename="graph.db", properties={}):
+    # attributes which are not persisted
+    _transient = (
+        "_graph_lock",
+        "_stripes",
+        "_components",
+        "_reachability",
+        "_cache",
+        "_snapshots",
+        "_snapshot_lock",
+        "_transaction",
+        "_dispatcher",
+        "_feed",
+        "_profiler",
+        "_slow_log",
+        "_indexes",
+        "_views",
+        "_view_lock",
+    )
+
+    def __init__(
+        self,
+        filename="graph.db",
+        properties={},
+        cache_size=0,
+        lock_stripes=0,
+        feed_size=0,
+    ):
         if type(filename) is not str:
             raise RuntimeError("Filename must be a string.")
         if type(properties) is not dict:
             raise RuntimeError("Properties be a dict.")
+        if type(cache_size) is not int or cache_size < 0:
+            raise RuntimeError("Cache size must be a non-negative integer.")
+        if type(lock_stripes) is not int or lock_stripes < 0:
+            raise RuntimeError("Lock stripes must be a non-negative integer.")
+        if type(feed_size) is not int or feed_size < 0:
+            raise RuntimeError("Feed size must be a non-negative integer.")
 
         # callbacks
-        self._on_create_node = {}
-        self._on_delete_node = {}
-        self._on_create_edge = {}
-        self._on_delete_edge = {}
+        self._on_create_node = GraphSubscriptions()
+        self._on_delete_node = GraphSubscriptions()
+        self._on_create_edge = GraphSubscriptions()
+        self._on_delete_edge = GraphSubscriptions()
 
         self._graph = {}
-        self._properties = properties
+        self._properties = properties.copy()
         self._filename = filename
 
+        # incremented on structural changes, and on property changes, which
+        # together expire the query cache
+        self._generation = 0
+        self._data_generation = 0
+        self._cache = GraphCache(cache_size)
+        self._stripes = tuple(GraphLock() for _ in range(lock_stripes))
+        self._feed = GraphFeed(feed_size) if feed_size else None
+
         if os.path.exists(filename):
             self.reload()
 
@@ -39,14 +107,49 @@ class GraphDatabase:
         self = super().__new__(cls)
 
         # callbacks, initialize for unpicked objects
-        self._on_create_node = {}
-        self._on_delete_node = {}
-        self._on_create_edge = {}
-        self._on_delete_edge = {}
+        self._on_create_node = GraphSubscriptions()
+        self._on_delete_node = GraphSubscriptions()
+        self._on_create_edge = GraphSubscriptions()
+        self._on_delete_edge = GraphSubscriptions()
+        self._dispatcher = GraphDispatcher()
+
+        # locks are per database, so unrelated databases do not contend
+        self._graph_lock = GraphLock()
+        self._stripes = ()
+
+        # derived indexes, rebuilt rather than persisted
+        self._components = GraphComponents()
+        self._reachability = GraphReachability()
+        self._cache = GraphCache()
+
+        # open snapshots, which are closed when no longer referenced
+        self._snapshots = weakref.WeakSet()
+        self._snapshot_lock = threading.Lock()
+
+        # the transaction in progress, if any
+        self._transaction = None
+
+        # change feed, if enabled
+        self._feed = None
+
+        # property indexes by key, which are not persisted
+        self._indexes = {}
+
+        # views memoizing their filters, which forget them as items change
+        self._views = weakref.WeakSet()
+        self._view_lock = threading.Lock()
+
+        # operation profiler and slow operation log, if enabled
+        self._profiler = None
+        self._slow_log = None
         return self
 
     def __getstate__(self):
-        return {k: v for (k, v) in self.__dict__.items() if "_on" not in k}
+        return {
+            k: v
+            for (k, v) in self.__dict__.items()
+            if "_on" not in k and k not in self._transient
+        }
 
     def __enter__(self):
         return self
@@ -54,30 +157,106 @@ class GraphDatabase:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.save()
 
+    @GraphSlowLogged
     @GraphReadLock
-    def get_nodes(self, filter_fn=lambda node: True):
-        """Return all nodes, or nodes which match the optional filter function."""
-        if type(filter_fn) is not types.FunctionType:
-            raise RuntimeError("Filter must be a function.")
-
-        return [node for node in self._graph.values() if filter_fn(node)]
-
+    def get_nodes(self, filter_fn=_everything, parallel=False, workers=None):
+        """Return all nodes, or nodes which match the optional filter, a
+        function or other callable, or a predicate built with P. A
+        predicate comparing an indexed property for equality only checks
+        the nodes found in the index, which are returned in index order.
+        With parallel, the filter is evaluated by workers, see evaluate."""
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        _check_parallel(parallel, workers)
+
+        found = self._lookup(filter_fn)
+        if found is not None:
+            key, ids = found
+            nodes = [self._graph[id] for id in ids]
+        elif parallel:
+            nodes = list(self._graph.values())
+        else:
+            self._traversed("get_nodes", len(self._graph))
+            return [node for node in self._graph.values() if filter_fn(node)]
+        self._traversed("get_nodes", len(nodes))
+        if not parallel:
+            return [node for node in nodes if filter_fn(node)]
+        matches = evaluate(self, filter_fn, nodes, parallel, workers)
+        return [node for (node, match) in zip(nodes, matches) if match]
+
+    def _lookup(self, *filters):
+        """Return the key of the index and the ids of the nodes which may
+        match all the filters, from the indexed equality condition of a
+        predicate with the fewest, or None if there is none."""
+        best = None
+        for predicate in filters:
+            if type(predicate) is not GraphPredicate:
+                continue
+            for key, values in predicate._equalities.items():
+                if key in self._indexes:
+                    index = self._indexes[key]
+                    count = sum(index.count(self._graph, value) for value in values)
+                    if best is None or count < best[0]:
+                        best = (count, key, values)
+        if best is None:
+            return None
+        count, key, values = best
+        index = self._indexes[key]
+        return key, [id for value in values for id in index.lookup(self._graph, value)]
+
+    @GraphSlowLogged
     @GraphReadLock
     def get_edges(
-        self, edge_filter_fn=lambda edge: True, node_filter_fn=lambda node: True
+        self,
+        edge_filter_fn=_everything,
+        node_filter_fn=_everything,
+        parallel=False,
+        workers=None,
     ):
-        """Return all edges, or edges which match the optional filter function."""
-        if type(edge_filter_fn) is not types.FunctionType:
-            raise RuntimeError("Filter must be a function.")
+        """Return all edges, or edges which match the optional filter
+        functions. With parallel, the filters are evaluated by workers."""
+        if not callable(edge_filter_fn):
+            raise RuntimeError("Filter must be callable.")
 
-        return [
+        edges = [
             edge
-            for edges in [
-                node.get_edges() for node in self.get_nodes() if node_filter_fn(node)
-            ]
-            for edge in edges
-            if edge_filter_fn(edge)
+            for node in self.get_nodes(node_filter_fn, parallel, workers)
+            for edge in node._edges.values()
         ]
+        if not parallel:
+            return [edge for edge in edges if edge_filter_fn(edge)]
+        matches = evaluate(self, edge_filter_fn, edges, parallel, workers)
+        return [edge for (edge, match) in zip(edges, matches) if match]
+
+    @GraphSlowLogged
+    @GraphModifyLock
+    def transform_nodes(
+        self,
+        transform_fn,
+        filter_fn=_everything,
+        parallel=False,
+        workers=None,
+    ):
+        """Set properties on all nodes, or nodes which match the optional
+        filter, from the dict returned by transform_fn(node), which may
+        return None to leave a node unchanged. The transforms are evaluated
+        first, by workers with parallel, then the properties are set in
+        node order. Returns the number of nodes changed."""
+        if not callable(transform_fn):
+            raise RuntimeError("Transform must be callable.")
+
+        nodes = self.get_nodes(filter_fn, parallel, workers)
+        changes = evaluate(self, transform_fn, nodes, parallel, workers)
+        for properties in changes:
+            if properties is not None and type(properties) is not dict:
+                raise RuntimeError("Transform must return a dict or None.")
+
+        changed = 0
+        for node, properties in zip(nodes, changes):
+            if properties is not None:
+                node.set_properties(properties)
+                changed += 1
+        return changed
 
     def get_node(self, id):
         """Get the node with the provided id, or None if it does not exist."""
@@ -99,51 +278,134 @@ class GraphDatabase:
             node._properties = properties.copy()
 
             # run create node event callbacks
-            cancel = False
-            for fn in self._on_create_node.values():
-                cancel = cancel or False == fn(node)
+            cancel = self._fire("create_node", node)
 
             if not cancel:
+                self._preserve(id)
                 self._graph[id] = node
+                self._generation += 1
+                self._log("node", id, node._properties)
             else:
                 return None
 
         else:
-            self._graph[id]._properties = {**self._graph[id]._properties, **properties}
+            self._preserve(id)
+            self._graph[id]._properties.update(properties)
+            self._data_generation += 1
+            self._log("node", id, self._graph[id]._properties)
 
         return self._graph[id]
 
-    def on_create_node(self, fn, id=None):
-        id = id if id else uuid.uuid1()
-        if id in self._on_create_node and fn is None:
-            del self._on_create_node[id]
+    def _has_synchronous_callbacks(self, *events):
+        """Boolean whether any synchronous callback is registered for the
+        events."""
+        return any(getattr(self, "_on_" + event).has_synchronous() for event in events)
+
+    def _fire(self, event, item):
+        """Run the callbacks for an event, returning a boolean indicating if
+        any of them cancelled it. Within a transaction the callbacks are
+        deferred until it is committed."""
+        if self._transaction is not None:
+            self._transaction._record(event, item)
+            return False
+
+        subscriptions = getattr(self, "_on_" + event)
+        if not subscriptions:
+            return False
+        if event.endswith("node"):
+            id = item._id
+            key = (self, id)
         else:
-            self._on_create_node[id] = fn
-        return id
+            id = item._source_id
+            key = (self, id, item._destination_id)
+        callbacks, listeners = subscriptions.match(id, item._properties)
+
+        cancel = False
+        if self._profiler is None:
+            for fn in callbacks:
+                cancel = cancel or False == fn(item)
+        elif callbacks:
+            start = time.perf_counter()
+            for fn in callbacks:
+                cancel = cancel or False == fn(item)
+            self._profiler.record_callbacks(event, time.perf_counter() - start)
+        if listeners and not cancel:
+            self._dispatcher.put(listeners, item, key)
+        return cancel
+
+    def _subscribe(
+        self, event, fn, id, asynchronous, properties, has_properties, prefix
+    ):
+        if type(properties) is not dict:
+            raise RuntimeError("Properties must be a dict.")
+        try:
+            hash(tuple(properties.items()))
+        except TypeError:
+            raise RuntimeError("Property values must be hashable.")
+        if isinstance(has_properties, str) or not all(
+            type(key) is str for key in has_properties
+        ):
+            raise RuntimeError("Has properties must be a list of strings.")
+        if prefix is not None and type(prefix) is not str:
+            raise RuntimeError("Prefix must be a string.")
 
-    def on_delete_node(self, fn, id=None):
         id = id if id else uuid.uuid1()
-        if id in self._on_delete_node and fn is None:
-            del self._on_delete_node[id]
-        else:
-            self._on_delete_node[id] = fn
+        getattr(self, "_on_" + event).subscribe(
+            id, fn, asynchronous, properties, has_properties, prefix
+        )
         return id
 
-    def on_create_edge(self, fn, id=None):
-        id = id if id else uuid.uuid1()
-        if id in self._on_create_edge and fn is None:
-            del self._on_create_edge[id]
-        else:
-            self._on_create_edge[id] = fn
-        return id
+    def on_create_node(
+        self,
+        fn,
+        id=None,
+        asynchronous=False,
+        properties={},
+        has_properties=(),
+        prefix=None,
+    ):
+        return self._subscribe(
+            "create_node", fn, id, asynchronous, properties, has_properties, prefix
+        )
 
-    def on_delete_edge(self, fn, id=None):
-        id = id if id else uuid.uuid1()
-        if id in self._on_delete_edge and fn is None:
-            del self._on_delete_edge[id]
-        else:
-            self._on_delete_edge[id] = fn
-        return id
+    def on_delete_node(
+        self,
+        fn,
+        id=None,
+        asynchronous=False,
+        properties={},
+        has_properties=(),
+        prefix=None,
+    ):
+        return self._subscribe(
+            "delete_node", fn, id, asynchronous, properties, has_properties, prefix
+        )
+
+    def on_create_edge(
+        self,
+        fn,
+        id=None,
+        asynchronous=False,
+        properties={},
+        has_properties=(),
+        prefix=None,
+    ):
+        return self._subscribe(
+            "create_edge", fn, id, asynchronous, properties, has_properties, prefix
+        )
+
+    def on_delete_edge(
+        self,
+        fn,
+        id=None,
+        asynchronous=False,
+        properties={},
+        has_properties=(),
+        prefix=None,
+    ):
+        return self._subscribe(
+            "delete_edge", fn, id, asynchronous, properties, has_properties, prefix
+        )
 
     @GraphModifyLock
     def set_property(self, key, value):
@@ -151,13 +413,15 @@ class GraphDatabase:
         if type(key) is not str and not int:
             raise RuntimeError("Key must be a string.")
         self._properties[key] = value
+        self._log("properties", self._properties)
 
     @GraphModifyLock
     def set_properties(self, properties):
         """Set multiple properties from the provided dict. Properties not in the dict are not removed."""
         if type(properties) is not dict:
             raise RuntimeError("Properties be a dict.")
-        self._properties = {**self._properties, **properties}
+        self._properties.update(properties)
+        self._log("properties", self._properties)
 
     def get_property(self, key):
         """Get the property value."""
@@ -169,6 +433,11 @@ class GraphDatabase:
         """Get a dict containing all properties and values."""
         return self._properties.copy()
 
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values, which is not
+        copied, and reflects later changes."""
+        return MappingProxyType(self._properties)
+
     def has_property(self, key):
         """Boolean value indicating if the property is defined."""
         if type(key) is not str:
@@ -183,8 +452,311 @@ class GraphDatabase:
         value = self.get_property(key)
         if self.has_property(key):
             del self._properties[key]
+            self._log("properties", self._properties)
         return value
 
+    @GraphReadLock
+    def component_of(self, node):
+        """Return all nodes in the same connected component as the provided node."""
+        if type(node) is not GraphNode:
+            raise RuntimeError("Node must be an instance of GraphNode.")
+        return [
+            self._graph[id]
+            for id in self._components.members(self._graph, node.get_id())
+            if id in self._graph
+        ]
+
+    @GraphReadLock
+    def components(self):
+        """Return the connected components of the graph, each a list of nodes."""
+        return [
+            [self._graph[id] for id in ids]
+            for ids in self._components.groups(self._graph)
+        ]
+
+    def get_lock_stats(self):
+        """Return a dict of operation name to lock wait and hold statistics."""
+        return self._graph_lock.get_stats()
+
+    def get_cache_stats(self):
+        """Return a dict with the hits, misses, size and max_size of the query cache."""
+        return self._cache.get_stats()
+
+    def set_dispatcher(self, dispatcher):
+        """Deliver asynchronous callbacks with the provided GraphDispatcher,
+        to configure the queue, batching, workers, coalescing or an asyncio
+        loop, or to share one dispatcher between databases."""
+        if type(dispatcher) is not GraphDispatcher:
+            raise RuntimeError("Dispatcher must be an instance of GraphDispatcher.")
+        self._dispatcher = dispatcher
+
+    def flush_events(self, timeout=None):
+        """Wait until queued events have been delivered to the asynchronous
+        callbacks. Returns False if the timeout in seconds expired first."""
+        return self._dispatcher.flush(timeout)
+
+    def get_dispatch_stats(self):
+        """Return a dict of statistics of the asynchronous callback queue."""
+        return self._dispatcher.get_stats()
+
+    def set_profiler(self, profiler):
+        """Record operation statistics with the provided GraphProfiler, or
+        stop recording them if None."""
+        if profiler is not None and type(profiler) is not GraphProfiler:
+            raise RuntimeError("Profiler must be an instance of GraphProfiler.")
+        self._profiler = profiler
+
+    def set_slow_log(self, slow_log):
+        """Record operations which take longer than its threshold in the
+        provided GraphSlowLog, or stop recording them if None."""
+        if slow_log is not None and type(slow_log) is not GraphSlowLog:
+            raise RuntimeError("Slow log must be an instance of GraphSlowLog.")
+        self._slow_log = slow_log
+
+    def _traversed(self, name, visits):
+        """Record the number of nodes visited by a traversal or scan."""
+        if self._profiler is not None:
+            self._profiler.record_traversal(name, visits)
+        if self._slow_log is not None:
+            self._slow_log.record_traversal(visits)
+
+    def stats(self):
+        """Return a dict of the statistics of the profiler, which are empty
+        unless one is set, with those of the lock, cache and dispatcher."""
+        if self._profiler is not None:
+            stats = self._profiler.get_stats()
+        else:
+            stats = {"calls": {}, "traversals": {}, "callbacks": {}}
+        stats["lock"] = self.get_lock_stats()
+        stats["cache"] = self.get_cache_stats()
+        stats["dispatch"] = self.get_dispatch_stats()
+        return stats
+
+    def clear_cache(self):
+        """Remove all entries from the query cache and reset its statistics."""
+        self._cache.clear()
+
+    @GraphReadLock
+    def snapshot(self):
+        """Return a consistent, read-only view of the database as it is now.
+        Reading from the snapshot does not block, and is not blocked by,
+        modifications of the database. Use with the with statement, or call
+        close() on it when finished."""
+        snapshot = GraphSnapshot(self)
+        with self._snapshot_lock:
+            self._snapshots.add(snapshot)
+        return snapshot
+
+    def view(self, node_filter=None, edge_filter=None, memoize=False):
+        """Return a read-only view of the nodes matching node_filter and the
+        edges between them matching edge_filter, without copying the graph.
+        The filters are evaluated as the view is read, and with memoize
+        their results are remembered until the node or edge changes."""
+        view = GraphView(self, node_filter, edge_filter, memoize)
+        if memoize:
+            with self._view_lock:
+                self._views.add(view)
+        return view
+
+    def transaction(self):
+        """Return a transaction, which holds the write lock for the duration
+        of a with block. Node and edge callbacks are deferred until the
+        block completes, and if it raises an exception all modifications
+        made within it are rolled back."""
+        return GraphTransaction(self)
+
+    def _preserve(self, *ids):
+        """Save the current state of the nodes with the provided ids into any
+        open snapshot which has not yet saved them, and into the transaction
+        in progress. Called before a node, its edges or their properties are
+        modified."""
+        if self._transaction is not None:
+            self._transaction._preserve(ids)
+        if not self._snapshots:
+            return
+        with self._snapshot_lock:
+            for id in ids:
+                state = None
+                captured = False
+                for snapshot in self._snapshots:
+                    if id not in snapshot._saved and not snapshot._complete:
+                        if not captured:
+                            state = _capture(self._graph.get(id))
+                            captured = True
+                        snapshot._saved[id] = state
+
+    def _log(self, op, *args):
+        """Append a change to the feed, or to the transaction in progress.
+        Property dicts are copied, as they may be modified in place later."""
+        if self._indexes:
+            self._index(op, args)
+        if self._views:
+            self._forget(op, args)
+        if self._feed is None:
+            return
+        change = (op,) + tuple(a.copy() if type(a) is dict else a for a in args)
+        if self._transaction is not None:
+            self._transaction._changes.append(change)
+        else:
+            self._feed.append([change])
+
+    def _index(self, op, args):
+        """Update the property indexes for a change."""
+        for index in self._indexes.values():
+            if op == "node":
+                index.update(args[0], args[1])
+            elif op == "delete_node":
+                index.remove(args[0])
+            elif op == "reset":
+                index.invalidate()
+
+    def _forget(self, op, args):
+        """Forget the memoized filter results of views for a change."""
+        with self._view_lock:
+            for view in self._views:
+                view._forget(op, args)
+
+    def _invalidate_lookups(self):
+        """Discard the property indexes and memoized filter results, after
+        the graph was changed without logging the changes."""
+        for index in self._indexes.values():
+            index.invalidate()
+        with self._view_lock:
+            for view in self._views:
+                view.clear()
+
+    @GraphModifyLock
+    def create_index(self, key):
+        """Index the nodes by the value of a property, so that predicates
+        comparing it for equality do not scan the graph. Indexes are kept
+        up to date as nodes change, and are not saved with the database."""
+        if type(key) is not str:
+            raise RuntimeError("Key must be a string.")
+        if key not in self._indexes:
+            self._indexes = {**self._indexes, key: GraphIndex(key)}
+
+    @GraphModifyLock
+    def drop_index(self, key):
+        """Remove the index of a property, if there is one."""
+        self._indexes = {k: v for (k, v) in self._indexes.items() if k != key}
+
+    def get_indexes(self):
+        """Return a list of the indexed property keys."""
+        return list(self._indexes)
+
+    def _checkpoint(self):
+        """Return changes which recreate the whole database."""
+        changes = [("reset",), ("properties", self._properties.copy())]
+        changes.extend(
+            ("node", id, node._properties.copy()) for (id, node) in self._graph.items()
+        )
+        changes.extend(
+            ("edge", id, destination_id, edge._properties.copy())
+            for (id, node) in self._graph.items()
+            for (destination_id, edge) in node._edges.items()
+        )
+        return changes
+
+    def _require_feed(self):
+        if self._feed is None:
+            raise RuntimeError("Change feed is not enabled.")
+
+    @GraphReadLock
+    def checkpoint(self):
+        """Return the sequence number of the latest change, and a list of
+        changes without sequence numbers which recreate the database as it
+        was after that change."""
+        self._require_feed()
+        return self._feed.get_sequence(), self._checkpoint()
+
+    def get_change_sequence(self):
+        """Return the sequence number of the latest change."""
+        self._require_feed()
+        return self._feed.get_sequence()
+
+    def changes(self, since=0, timeout=None):
+        """Yield the changes after the since sequence number, each a tuple of
+        the sequence number, the operation and its arguments. Waits up to
+        timeout seconds for each further change, or indefinitely if None."""
+        self._require_feed()
+        for batch in self._feed.read(since, timeout):
+            yield from batch
+
+    def write_changes(self, stream, since=None, timeout=None):
+        """Write the changes after the since sequence number to a binary
+        stream such as a pipe, for GraphReplica to read. If since is None a
+        checkpoint of the database is written first."""
+        self._require_feed()
+        if since is None:
+            since, changes = self.checkpoint()
+            write_changes(stream, [[(since,) + change for change in changes]])
+        write_changes(stream, self._feed.read(since, timeout))
+
+    def serve_changes(self, path):
+        """Serve the change feed on a Unix socket at the provided path, for
+        GraphReplica to connect to. Returns a server, which should be closed
+        when no longer needed."""
+        self._require_feed()
+        return GraphFeedServer(self, path)
+
+    def serve(self, address):
+        """Serve the database to GraphClient connections on a Unix socket at
+        the provided path, or a TCP socket at a (host, port) tuple. Returns
+        the server, which should be closed when no longer needed."""
+        return GraphServer(self, address)
+
+    @GraphModifyLock
+    def _apply_changes(self, changes):
+        """Apply changes read from the feed of another database."""
+        graph = self._graph
+        for change in changes:
+            op, args = change[1], change[2:]
+            if op == "node":
+                id, properties = args
+                self._preserve(id)
+                if id not in graph:
+                    graph[id] = GraphNode(self, id)
+                _replace(graph[id]._properties, properties)
+            elif op == "delete_node":
+                self._preserve(args[0])
+                graph.pop(args[0], None)
+            elif op == "edge":
+                source_id, destination_id, properties = args
+                if source_id in graph and destination_id in graph:
+                    source = graph[source_id]
+                    self._preserve(source_id)
+                    if destination_id not in source._edges:
+                        source._edges[destination_id] = GraphEdge(
+                            self, graph[destination_id], source, properties
+                        )
+                    else:
+                        _replace(source._edges[destination_id]._properties, properties)
+            elif op == "delete_edge":
+                source_id, destination_id = args
+                if source_id in graph:
+                    self._preserve(source_id)
+                    graph[source_id]._edges.pop(destination_id, None)
+            elif op == "properties":
+                _replace(self._properties, args[0])
+            elif op == "reset":
+                self._preserve(*graph)
+                graph.clear()
+            self._log(op, *args)
+
+        self._components.invalidate()
+        self._reachability.invalidate()
+        self._generation += 1
+
+    @GraphReadLock
+    def memory_report(self, sample_size=10000, seed=None):
+        """Return a dict estimating the bytes used by the graph, in total and
+        by node and edge objects, adjacency dicts and properties, broken
+        down by property key and by degree. Large graphs are estimated from
+        a random sample of sample_size nodes, chosen with the optional seed."""
+        if type(sample_size) is not int or sample_size < 1:
+            raise RuntimeError("Sample size must be a positive integer.")
+        return memory_report(self._graph, sample_size, random.Random(seed))
+
     def get_node_count(self):
         """Return the number of nodes."""
         return len(self._graph)
@@ -193,14 +765,36 @@ class GraphDatabase:
         """Return the number of edges."""
         return sum([len(self._graph[node]._edges) for node in self._graph])
 
+    @GraphSlowLogged
     def reload(self):
         """Reload the database from the local filesystem."""
 
         logger.debug("load from file '%s'", self._filename)
         with gzip.open(self._filename, "rb") as f:
-            self._graph = pickle.load(f)
-
-    @GraphReadLock
+            graph = pickle.load(f)
+
+        # open snapshots keep the graph as it was before reloading
+        with self._snapshot_lock:
+            for snapshot in self._snapshots:
+                for id, node in self._graph.items():
+                    if id not in snapshot._saved:
+                        snapshot._saved[id] = _capture(node)
+                snapshot._complete = True
+            self._graph = graph
+
+        self._invalidate_lookups()
+        # the unpickled nodes and edges reference a copy of the database
+        for node in self._graph.values():
+            node._db = self
+            for edge in node._edges.values():
+                edge._db = self
+        self._components.invalidate()
+        self._reachability.invalidate()
+        self._generation += 1
+        if self._feed is not None:
+            self._feed.append(self._checkpoint())
+
+    @GraphSlowLogged
     def save(self):
         """Save the database to the local filesystem."""
 
@@ -209,5 +803,12 @@ class GraphDatabase:
             prefix=self._filename, dir=os.path.dirname(self._filename), delete=False
         )
         with gzip.open(temp_file, "wb") as f:
-            pickle.dump(self._graph, f, protocol=4)
+            self._dump(f)
         os.replace(temp_file.name, self._filename)
+
+    @GraphReadLock
+    def _dump(self, f):
+        # each frame is compressed as it is pickled, so the whole pickle is
+        # never held in memory, and as GzipFile.write is Python other
+        # threads, such as an event loop, run between frames
+        pickle.Pickler(f, protocol=4).dump(self._graph)
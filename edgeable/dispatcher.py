@@ -0,0 +1,210 @@
+import asyncio
+import itertools
+import logging
+import numbers
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger("edgeable")
+
+
+class GraphDispatcher:
+    """Delivers events to asynchronous callbacks outside of the graph lock.
+
+    Events are appended to a bounded queue and delivered in batches of up to
+    batch_size, either by a pool of worker threads or, if an asyncio loop is
+    provided, on that loop. A callback returning a coroutine has it scheduled
+    on the loop. When the queue is full the thread firing the event delivers
+    the oldest batch itself, which slows writers to the pace of the callbacks
+    instead of blocking them while they hold the graph lock.
+
+    With coalesce=True only the latest queued event for each node or edge is
+    kept, so callbacks see the final state of an item which changed several
+    times before they ran. Worker threads stop after idle_timeout seconds
+    without events, and are started again when events are queued, so idle
+    databases do not keep threads. A dispatcher may be shared by several
+    databases."""
+
+    def __init__(
+        self,
+        max_queue=1024,
+        batch_size=64,
+        workers=1,
+        coalesce=False,
+        loop=None,
+        idle_timeout=5.0,
+    ):
+        if type(max_queue) is not int or max_queue < 1:
+            raise RuntimeError("Max queue must be a positive integer.")
+        if type(batch_size) is not int or batch_size < 1:
+            raise RuntimeError("Batch size must be a positive integer.")
+        if type(workers) is not int or workers < 1:
+            raise RuntimeError("Workers must be a positive integer.")
+        if loop is not None and not isinstance(loop, asyncio.AbstractEventLoop):
+            raise RuntimeError("Loop must be an asyncio event loop.")
+        if (
+            not isinstance(idle_timeout, numbers.Real)
+            or isinstance(idle_timeout, bool)
+            or idle_timeout <= 0
+        ):
+            raise RuntimeError("Idle timeout must be a positive number.")
+
+        self._lock = threading.Condition(threading.Lock())
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._workers = workers
+        self._coalesce = coalesce
+        self._loop = loop
+        self._idle_timeout = idle_timeout
+
+        # queued events by coalescing key, or by sequence number
+        self._queue = OrderedDict()
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._threads = []
+        self._scheduled = False
+        self._closed = False
+        self._stats = {
+            "queued": 0,
+            "delivered": 0,
+            "coalesced": 0,
+            "overflowed": 0,
+            "errors": 0,
+            "max_depth": 0,
+        }
+
+    def put(self, listeners, item, key=None):
+        """Queue an item for delivery to a list of listeners. Events with
+        equal keys are coalesced if enabled."""
+        overflow = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Dispatcher is closed.")
+            if not self._coalesce or key is None:
+                key = next(self._sequence)
+            elif key in self._queue:
+                del self._queue[key]
+                self._stats["coalesced"] += 1
+
+            if len(self._queue) >= self._max_queue:
+                overflow = self._take()
+                self._stats["overflowed"] += len(overflow)
+
+            self._queue[key] = (listeners, item)
+            self._stats["queued"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], len(self._queue))
+            self._wake()
+
+        if overflow:
+            self._run(overflow)
+
+    def flush(self, timeout=None):
+        """Wait until every queued event has been delivered. Returns False if
+        the timeout in seconds expired first. Must not be called from the
+        event loop the dispatcher delivers on."""
+        with self._lock:
+            return self._lock.wait_for(
+                lambda: not self._queue and not self._in_flight, timeout
+            )
+
+    def close(self, timeout=None):
+        """Deliver the queued events and stop the worker threads. No further
+        events may be queued."""
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+            threads = list(self._threads)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self.flush(timeout)
+
+    def get_stats(self):
+        """Return a dict with the number of events queued, delivered,
+        coalesced and delivered by writers because the queue was full, the
+        number of callbacks which raised an exception, and the current and
+        maximum queue depth."""
+        with self._lock:
+            return {**self._stats, "depth": len(self._queue)}
+
+    def _wake(self):
+        if self._loop is not None:
+            if not self._scheduled:
+                self._scheduled = True
+                self._loop.call_soon_threadsafe(self._drain)
+            return
+
+        if len(self._threads) < self._workers:
+            thread = threading.Thread(
+                target=self._work, name="edgeable-dispatch", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+        self._lock.notify()
+
+    def _take(self):
+        """Remove a batch of events from the queue, with the lock held."""
+        batch = [
+            self._queue.popitem(last=False)[1]
+            for _ in range(min(self._batch_size, len(self._queue)))
+        ]
+        self._in_flight += 1
+        return batch
+
+    def _run(self, batch):
+        try:
+            self._deliver(batch)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._stats["delivered"] += len(batch)
+                self._lock.notify_all()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                self._lock.wait_for(
+                    lambda: self._queue or self._closed, self._idle_timeout
+                )
+                if not self._queue:
+                    # idle or closed, a new worker is started by the next event
+                    self._threads.remove(threading.current_thread())
+                    return
+                batch = self._take()
+            self._run(batch)
+
+    def _drain(self):
+        with self._lock:
+            batch = self._take() if self._queue else None
+        if batch:
+            self._run(batch)
+        with self._lock:
+            if self._queue:
+                self._loop.call_soon(self._drain)
+            else:
+                self._scheduled = False
+
+    def _deliver(self, batch):
+        for listeners, item in batch:
+            for fn in listeners:
+                try:
+                    result = fn(item)
+                    if asyncio.iscoroutine(result):
+                        if self._loop is None:
+                            result.close()
+                            raise RuntimeError(
+                                "Coroutine callbacks require an event loop."
+                            )
+                        future = asyncio.run_coroutine_threadsafe(result, self._loop)
+                        future.add_done_callback(self._done)
+                except Exception as e:
+                    self._error(e)
+
+    def _done(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self._error(future.exception())
+
+    def _error(self, exception):
+        logger.error("event callback failed", exc_info=exception)
+        with self._lock:
+            self._stats["errors"] += 1
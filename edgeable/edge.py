@@ -1,4 +1,6 @@
-from edgeable import GraphModifyLock
+from types import MappingProxyType
+
+from edgeable import GraphLocalModifyLock
 
 
 class GraphEdge:
@@ -25,6 +27,12 @@ class GraphEdge:
     def __repr__(self):
         return self._source_id + "->" + self._destination_id
 
+    def _stripe_keys(self):
+        return (self._source_id, self._destination_id)
+
+    def _log(self):
+        self._db._log("edge", self._source_id, self._destination_id, self._properties)
+
     def get_destination(self):
         """Get the node which is the destination of this edge."""
         return self._db._graph[self._destination_id]
@@ -33,41 +41,45 @@ class GraphEdge:
         """Get the node which is the source of this edge."""
         return self._db._graph[self._source_id]
 
-    @GraphModifyLock
+    @GraphLocalModifyLock
     def set_property(self, key, value, directed=False):
         """Set an edge property. If directed=False the property is mirrored
         to an edge in the reverse direction."""
         if type(key) is not str:
             raise RuntimeError("Key must be a string")
+        self._db._preserve(self._source_id, self._destination_id)
         self._properties[key] = value
+        self._db._data_generation += 1
+        self._log()
 
         if not directed:
             if (
                 self._destination_id in self._db._graph
                 and self._source_id in self._db._graph[self._destination_id]._edges
             ):
-                self._db._graph[self._destination_id]._edges[
-                    self._source_id
-                ]._properties[key] = value
+                reverse = self._db._graph[self._destination_id]._edges[self._source_id]
+                reverse._properties[key] = value
+                reverse._log()
 
-    @GraphModifyLock
+    @GraphLocalModifyLock
     def set_properties(self, properties, directed=False):
         """Set multiple properties from the provided dict. Properties not in the dict
         are not removed. If directed=False the property is mirrored
         to an edge in the reverse direction."""
         if type(properties) is not dict:
             raise RuntimeError("Key properties be a dict.")
-        self._properties = {**self._properties, **properties}
+        self._db._preserve(self._source_id, self._destination_id)
+        self._properties.update(properties)
+        self._db._data_generation += 1
+        self._log()
         if not directed:
             if (
                 self._destination_id in self._db._graph
                 and self._source_id in self._db._graph[self._destination_id]._edges
             ):
-                destination = self._db._graph[self._destination_id]
-                destination._edges[self._source_id]._properties = {
-                    **destination._edges[self._source_id]._properties,
-                    **properties,
-                }
+                reverse = self._db._graph[self._destination_id]._edges[self._source_id]
+                reverse._properties.update(properties)
+                reverse._log()
 
     def get_property(self, key):
         """Get the property value."""
@@ -79,21 +91,29 @@ class GraphEdge:
         """Get a dict containing all properties and values."""
         return self._properties.copy()
 
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values, which is not
+        copied, and reflects later changes."""
+        return MappingProxyType(self._properties)
+
     def has_property(self, key):
         """Boolean value indicating if the property is defined."""
         return key in self._properties
 
-    @GraphModifyLock
+    @GraphLocalModifyLock
     def delete_property(self, key):
         """Delete a property if it is defined. Returns the previous value, or None."""
         if type(key) is not str:
             raise RuntimeError("Key must be a string.")
         value = self.get_property(key)
         if self.has_property(key):
+            self._db._preserve(self._source_id)
             del self._properties[key]
+            self._db._data_generation += 1
+            self._log()
         return value
 
-    @GraphModifyLock
+    @GraphLocalModifyLock(fires=("delete_edge",))
     def delete(self, directed=False):
         """Delete this edge between nodes. If directed=False than any edge in
         the reverse direction is also deleted."""
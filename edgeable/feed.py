@@ -0,0 +1,249 @@
+import itertools
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import deque
+
+
+class GraphFeed:
+    """Ordered log of the changes made to a database, numbered by sequence.
+
+    Each change is a tuple of its sequence number, an operation and its
+    arguments, describing the resulting state of one node, edge or the
+    database properties, so applying a change more than once is harmless:
+
+        (seq, "node", id, properties)
+        (seq, "delete_node", id)
+        (seq, "edge", source_id, destination_id, properties)
+        (seq, "delete_edge", source_id, destination_id)
+        (seq, "properties", properties)
+        (seq, "reset",)
+
+    The latest max_size changes are retained, so readers which fall further
+    behind must start again from a checkpoint of the database."""
+
+    def __init__(self, max_size):
+        self._lock = threading.Condition(threading.Lock())
+        self._changes = deque(maxlen=max_size)
+        self._sequence = 0
+        self._closed = False
+
+    def append(self, changes):
+        """Number and append a list of changes."""
+        with self._lock:
+            for change in changes:
+                self._sequence += 1
+                self._changes.append((self._sequence,) + change)
+            self._lock.notify_all()
+
+    def get_sequence(self):
+        """Return the sequence number of the latest change."""
+        with self._lock:
+            return self._sequence
+
+    def close(self):
+        """Stop all readers once they have read the retained changes."""
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+
+    def read(self, since=0, timeout=None):
+        """Yield lists of the changes after the since sequence number, waiting
+        up to timeout seconds for each further change, or indefinitely if it
+        is None."""
+        while True:
+            with self._lock:
+                if not self._lock.wait_for(
+                    lambda: self._sequence > since or self._closed, timeout
+                ):
+                    return
+                if self._sequence <= since:
+                    return
+                first = self._sequence - len(self._changes) + 1
+                if since + 1 < first:
+                    raise RuntimeError(
+                        "Changes after %d are no longer retained." % since
+                    )
+                batch = list(itertools.islice(self._changes, since + 1 - first, None))
+            yield batch
+            since = batch[-1][0]
+
+
+def write_changes(stream, batches):
+    """Write lists of changes to a binary stream, such as a pipe or socket
+    file, each as a length prefixed pickle."""
+    for batch in batches:
+        data = pickle.dumps(batch, protocol=4)
+        stream.write(struct.pack(">I", len(data)) + data)
+        stream.flush()
+
+
+def read_changes(stream):
+    """Yield the lists of changes written to a binary stream by
+    write_changes, until it is closed. Only read from trusted sources, as
+    changes are unpickled."""
+    while True:
+        header = stream.read(4)
+        if len(header) < 4:
+            return
+        (size,) = struct.unpack(">I", header)
+        data = stream.read(size)
+        if len(data) < size:
+            return
+        yield pickle.loads(data)
+
+
+class GraphFeedServer:
+    """Serves the change feed of a database on a Unix socket. A client sends
+    a line with the sequence number to resume after, or "checkpoint" to
+    receive the whole database first, then receives the changes as written
+    by write_changes."""
+
+    def __init__(self, db, path):
+        self._db = db
+        self._path = path
+        if os.path.exists(path):
+            os.unlink(path)
+
+        feed = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                cursor = self.rfile.readline().strip()
+                try:
+                    if cursor == b"checkpoint":
+                        since, changes = db.checkpoint()
+                        batches = itertools.chain(
+                            [[(since,) + change for change in changes]],
+                            feed._tail(since),
+                        )
+                    else:
+                        batches = feed._tail(int(cursor))
+                    write_changes(self.wfile, batches)
+                except (OSError, ValueError, RuntimeError):
+                    pass
+
+        self._server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        self._server.daemon_threads = True
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="edgeable-feed", daemon=True
+        )
+        self._thread.start()
+
+    def _tail(self, since):
+        # wake periodically so connections end when the server is closed
+        while not self._closed:
+            for batch in self._db._feed.read(since, timeout=0.1):
+                yield batch
+                since = batch[-1][0]
+                if self._closed:
+                    return
+
+    def close(self):
+        """Stop serving and remove the socket."""
+        self._closed = True
+        self._server.shutdown()
+        self._server.server_close()
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+
+class GraphReplica:
+    """Keeps a database up to date with the change feed of another, either a
+    GraphDatabase in the same process, the path of a Unix socket served by
+    GraphDatabase.serve_changes, or a binary stream such as a pipe. Starts
+    from a checkpoint of the source unless the sequence number to resume
+    after is provided. Changes are applied in the background, and the
+    replica should not otherwise be modified."""
+
+    def __init__(self, db, source, since=None):
+        self._db = db
+        self._source = source
+        self._lock = threading.Condition(threading.Lock())
+        self._cursor = since
+        self._closed = False
+        self._socket = None
+        self._thread = threading.Thread(
+            target=self._run, name="edgeable-replica", daemon=True
+        )
+        self._thread.start()
+
+    def get_cursor(self):
+        """Return the sequence number of the latest change applied, or None
+        before the first checkpoint has been applied."""
+        with self._lock:
+            return self._cursor
+
+    def wait_for(self, sequence, timeout=None):
+        """Wait until the change with the provided sequence number has been
+        applied. Returns False if the timeout in seconds expired first."""
+        with self._lock:
+            return self._lock.wait_for(
+                lambda: self._cursor is not None and self._cursor >= sequence,
+                timeout,
+            )
+
+    def close(self):
+        """Stop applying changes."""
+        self._closed = True
+        sock = self._socket
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._thread.join()
+
+    def _apply(self, batch):
+        self._db._apply_changes(batch)
+        with self._lock:
+            self._cursor = batch[-1][0]
+            self._lock.notify_all()
+
+    def _run(self):
+        source = self._source
+        if type(source) is str:
+            # reconnect from the cursor until closed
+            while not self._closed:
+                try:
+                    self._read_socket(source)
+                except OSError:
+                    pass
+                if not self._closed:
+                    time.sleep(0.1)
+        elif hasattr(source, "read"):
+            for batch in read_changes(source):
+                if self._closed:
+                    return
+                self._apply(batch)
+        else:
+            self._read_database(source)
+
+    def _read_socket(self, path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            self._socket = sock
+            try:
+                cursor = self.get_cursor()
+                request = "checkpoint" if cursor is None else str(cursor)
+                sock.sendall(request.encode() + b"\n")
+                with sock.makefile("rb") as stream:
+                    for batch in read_changes(stream):
+                        self._apply(batch)
+            finally:
+                self._socket = None
+
+    def _read_database(self, source):
+        if self._cursor is None:
+            since, changes = source.checkpoint()
+            self._apply([(since,) + change for change in changes])
+        while not self._closed:
+            for batch in source._feed.read(self._cursor, timeout=0.1):
+                self._apply(batch)
+                if self._closed:
+                    return
@@ -0,0 +1,289 @@
+import bisect
+import gc
+import itertools
+import math
+import random
+
+from edgeable import GraphEdge, GraphModifyLock, GraphNode
+
+
+def _pairs(total, probability, rng):
+    """Yield indexes of range(total), each included with the provided
+    probability, skipping ahead geometrically rather than drawing a number
+    for every index, so sparse graphs take time in proportion to their
+    edges rather than to the pairs of nodes."""
+    if probability <= 0:
+        return
+    if probability >= 1:
+        yield from range(total)
+        return
+    log_q = math.log(1 - probability)
+    index = -1
+    while True:
+        index += 1 + int(math.log(1 - rng.random()) / log_q)
+        if index >= total:
+            return
+        yield index
+
+
+def _isqrt(n):
+    """Return the integer square root of n, as math.isqrt which needs
+    Python 3.8. The float estimate is corrected as it may be off by one
+    for large n."""
+    root = int(math.sqrt(n))
+    while root * root > n:
+        root -= 1
+    while (root + 1) * (root + 1) <= n:
+        root += 1
+    return root
+
+
+def _pair(index):
+    """Return the (lower, higher) pair of node offsets numbered index when
+    pairs are ordered by the higher offset, then the lower."""
+    higher = (1 + _isqrt(1 + 8 * index)) // 2
+    return index - higher * (higher - 1) // 2, higher
+
+
+def _check_nodes(nodes):
+    if type(nodes) is not int or nodes < 0:
+        raise RuntimeError("Nodes must be a non-negative integer.")
+
+
+def _check_probability(probability):
+    if type(probability) not in (int, float) or not 0 <= probability <= 1:
+        raise RuntimeError("Probability must be a number from 0 to 1.")
+
+
+class GraphGenerator:
+    """Populates a database with synthetic graphs for load testing and
+    benchmarking. Nodes and edges are added directly under a single write
+    lock, without the per edge overhead of attach, and without running
+    callbacks.
+
+    Each generator adds nodes with consecutive integer ids from start, or
+    following those of the previous graph generated, and returns the range
+    of ids. Properties are set by the optional node_properties(id, rng) and
+    edge_properties(source_id, destination_id, rng) functions, which should
+    draw any random values from rng so that the seed reproduces them."""
+
+    def __init__(self, db, seed=None):
+        self._db = db
+        self._rng = random.Random(seed)
+        self._next = 0
+
+    def erdos_renyi(
+        self,
+        nodes,
+        probability,
+        directed=False,
+        start=None,
+        node_properties=None,
+        edge_properties=None,
+    ):
+        """Add a random graph in which each pair of nodes is joined with the
+        provided probability, in both directions independently if
+        directed."""
+        _check_nodes(nodes)
+        _check_probability(probability)
+        rng = self._rng
+        if directed:
+            # pairs ordered by source, skipping the node itself
+            edges = (
+                (index // (nodes - 1), index % (nodes - 1))
+                for index in _pairs(nodes * (nodes - 1), probability, rng)
+            )
+            edges = ((s, d + (d >= s)) for (s, d) in edges)
+        else:
+            edges = (
+                _pair(index)
+                for index in _pairs(nodes * (nodes - 1) // 2, probability, rng)
+            )
+        return self._populate(
+            nodes, edges, directed, start, node_properties, edge_properties
+        )
+
+    def barabasi_albert(
+        self, nodes, m, start=None, node_properties=None, edge_properties=None
+    ):
+        """Add a scale free graph grown by preferential attachment, each
+        node being attached to m earlier nodes chosen in proportion to
+        their degree."""
+        _check_nodes(nodes)
+        if type(m) is not int or m < 1 or m >= max(nodes, 2):
+            raise RuntimeError("M must be a positive integer less than nodes.")
+        rng = self._rng
+
+        def edges():
+            # every node appears once per edge, so a uniform choice is
+            # proportional to degree
+            endpoints = []
+            targets = list(range(m))
+            for source in range(m, nodes):
+                for destination in targets:
+                    yield source, destination
+                endpoints.extend(targets)
+                endpoints.extend([source] * m)
+                targets = set()
+                while len(targets) < m:
+                    targets.add(rng.choice(endpoints))
+
+        return self._populate(
+            nodes, edges(), False, start, node_properties, edge_properties
+        )
+
+    def grid(
+        self,
+        rows,
+        columns,
+        periodic=False,
+        start=None,
+        node_properties=None,
+        edge_properties=None,
+    ):
+        """Add a lattice in which each node is attached to its neighbors
+        in the same row and column, wrapping around the edges if periodic.
+        Nodes have row and column properties."""
+        if type(rows) is not int or rows < 1:
+            raise RuntimeError("Rows must be a positive integer.")
+        if type(columns) is not int or columns < 1:
+            raise RuntimeError("Columns must be a positive integer.")
+
+        def edges():
+            for row, column in itertools.product(range(rows), range(columns)):
+                offset = row * columns + column
+                if column + 1 < columns or (periodic and columns > 2):
+                    yield offset, row * columns + (column + 1) % columns
+                if row + 1 < rows or (periodic and rows > 2):
+                    yield offset, (row + 1) % rows * columns + column
+
+        def properties(id, rng):
+            offset = id - first
+            values = {"row": offset // columns, "column": offset % columns}
+            if node_properties is not None:
+                values.update(node_properties(id, rng))
+            return values
+
+        first = self._next if start is None else start
+        return self._populate(
+            rows * columns, edges(), False, start, properties, edge_properties
+        )
+
+    def power_law(
+        self,
+        nodes,
+        exponent=2.5,
+        average_degree=4,
+        start=None,
+        node_properties=None,
+        edge_properties=None,
+    ):
+        """Add a graph whose degrees follow a power law with the provided
+        exponent. Each node has a weight, and edges join nodes drawn in
+        proportion to their weights, so the expected degree of a node is
+        proportional to its weight. Repeated pairs are only joined once, so
+        hubs have slightly fewer edges than their weight would suggest."""
+        _check_nodes(nodes)
+        if type(exponent) not in (int, float) or exponent <= 2:
+            raise RuntimeError("Exponent must be a number greater than 2.")
+        if type(average_degree) not in (int, float) or average_degree < 0:
+            raise RuntimeError("Average degree must be a non-negative number.")
+        rng = self._rng
+        weights = itertools.accumulate(
+            (i + 1) ** (-1 / (exponent - 1)) for i in range(nodes)
+        )
+        cumulative = list(weights)
+
+        def edges():
+            if not cumulative:
+                return
+            total = cumulative[-1]
+            for _ in range(int(nodes * average_degree / 2)):
+                yield (
+                    bisect.bisect(cumulative, rng.random() * total),
+                    bisect.bisect(cumulative, rng.random() * total),
+                )
+
+        return self._populate(
+            nodes, edges(), False, start, node_properties, edge_properties
+        )
+
+    def random_dag(
+        self,
+        nodes,
+        probability,
+        start=None,
+        node_properties=None,
+        edge_properties=None,
+    ):
+        """Add a random directed acyclic graph, in which each node has an
+        edge to each node with a higher id with the provided probability.
+        The ids are therefore in topological order."""
+        _check_nodes(nodes)
+        _check_probability(probability)
+        rng = self._rng
+        edges = (
+            _pair(index) for index in _pairs(nodes * (nodes - 1) // 2, probability, rng)
+        )
+        return self._populate(
+            nodes, edges, True, start, node_properties, edge_properties
+        )
+
+    @GraphModifyLock
+    def _populate(
+        self, nodes, edges, directed, start, node_properties, edge_properties
+    ):
+        if start is not None and type(start) is not int:
+            raise RuntimeError("Start must be an integer.")
+        db = self._db
+        rng = self._rng
+        graph = db._graph
+        first = self._next if start is None else start
+        ids = range(first, first + nodes)
+        for id in ids:
+            if id in graph:
+                raise RuntimeError("Node %d already exists." % id)
+
+        db._preserve(*ids)
+
+        # the collector is triggered by allocations, and would repeatedly
+        # scan the nodes and edges added, none of which can be garbage
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for id in ids:
+                node = GraphNode(db, id)
+                if node_properties is not None:
+                    # copied, as the function may return the same dict
+                    node._properties = dict(node_properties(id, rng))
+                graph[id] = node
+                db._log("node", id, node._properties)
+
+            empty = {}
+            for source, destination in edges:
+                source = graph[first + source]
+                destination = graph[first + destination]
+                if source is destination or destination._id in source._edges:
+                    continue
+                properties = (
+                    edge_properties(source._id, destination._id, rng)
+                    if edge_properties is not None
+                    else empty
+                )
+                source._edges[destination._id] = GraphEdge(
+                    db, destination, source, properties
+                )
+                db._log("edge", source._id, destination._id, properties)
+                if not directed:
+                    destination._edges[source._id] = GraphEdge(
+                        db, source, destination, properties
+                    )
+                    db._log("edge", destination._id, source._id, properties)
+        finally:
+            if collecting:
+                gc.enable()
+            db._components.invalidate()
+            db._reachability.invalidate()
+            db._generation += 1
+        self._next = max(self._next, first + nodes)
+        return ids
@@ -0,0 +1,74 @@
+import threading
+
+
+class GraphIndex:
+    """Index of node ids by the value of a property. It is kept up to date
+    as nodes change, and rebuilt lazily on the next lookup after being
+    invalidated. Values which cannot be hashed are not indexed; they can
+    never equal a value which can be looked up."""
+
+    def __init__(self, key):
+        self._lock = threading.Lock()
+        self._key = key
+        self._ids = {}
+        self._values = {}
+        self._valid = False
+
+    def invalidate(self):
+        """Discard the index, it will be rebuilt on the next lookup."""
+        with self._lock:
+            self._valid = False
+            self._ids = {}
+            self._values = {}
+
+    def update(self, id, properties):
+        """Record the current properties of the node with the provided id."""
+        with self._lock:
+            if self._valid:
+                self._remove(id)
+                self._add(id, properties)
+
+    def remove(self, id):
+        """Record that the node with the provided id was deleted."""
+        with self._lock:
+            if self._valid:
+                self._remove(id)
+
+    def lookup(self, graph, value):
+        """Return a list of the ids of the nodes whose property has the
+        provided value."""
+        with self._lock:
+            self._ensure(graph)
+            return list(self._ids.get(value, ()))
+
+    def count(self, graph, value):
+        """Return the number of nodes whose property has the provided value."""
+        with self._lock:
+            self._ensure(graph)
+            return len(self._ids.get(value, ()))
+
+    def _add(self, id, properties):
+        if self._key not in properties:
+            return
+        value = properties[self._key]
+        try:
+            # dicts keep the ids in the order they were indexed
+            self._ids.setdefault(value, {})[id] = None
+        except TypeError:
+            return
+        self._values[id] = value
+
+    def _remove(self, id):
+        if id in self._values:
+            value = self._values.pop(id)
+            ids = self._ids[value]
+            del ids[id]
+            if not ids:
+                del self._ids[value]
+
+    def _ensure(self, graph):
+        if self._valid:
+            return
+        for id, node in graph.items():
+            self._add(id, node._properties)
+        self._valid = True
@@ -0,0 +1,123 @@
+import sys
+
+
+def _sizeof(value, seen):
+    """Bytes used by a value, including the contents of containers. Objects
+    in seen, such as interned strings shared by many values, have already
+    been counted and are skipped."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if type(value) is dict:
+        for key, item in value.items():
+            size += _sizeof(key, seen) + _sizeof(item, seen)
+    elif type(value) in (list, tuple, set, frozenset):
+        for item in value:
+            size += _sizeof(item, seen)
+    return size
+
+
+def _object(item):
+    """Bytes used by an object and its attribute dict."""
+    return sys.getsizeof(item) + sys.getsizeof(item.__dict__)
+
+
+def _bucket(degree):
+    """Upper bound of the power of two bucket holding a degree."""
+    return 1 << degree.bit_length()
+
+
+def memory_report(graph, sample_size, rng):
+    """Estimate the bytes used by the nodes of a graph, measuring a random
+    sample of sample_size nodes and their edges and scaling the result to
+    the whole graph. Graphs with no more nodes than sample_size are
+    measured exactly."""
+    ids = list(graph)
+    sample = ids if len(ids) <= sample_size else rng.sample(ids, sample_size)
+    scale = len(ids) / len(sample) if sample else 0
+
+    totals = {
+        "node_objects": 0,
+        "node_properties": 0,
+        "adjacency": 0,
+        "edge_objects": 0,
+        "edge_properties": 0,
+        "duplicated_edge_properties": 0,
+    }
+    seen = set()
+    node_keys = {}
+    edge_keys = {}
+    degrees = {}
+    for id in sample:
+        node = graph[id]
+        node_bytes = _object(node) + _sizeof(id, seen)
+        properties = sys.getsizeof(node._properties)
+        for key, value in node._properties.items():
+            size = _sizeof(key, seen) + _sizeof(value, seen)
+            node_keys[key] = node_keys.get(key, 0) + size
+            properties += size
+        adjacency = sys.getsizeof(node._edges)
+
+        edge_bytes = 0
+        edge_properties = 0
+        duplicated = 0
+        for destination_id, edge in node._edges.items():
+            edge_bytes += _object(edge)
+            size = sys.getsizeof(edge._properties)
+            for key, value in edge._properties.items():
+                item = _sizeof(key, seen) + _sizeof(value, seen)
+                edge_keys[key] = edge_keys.get(key, 0) + item
+                size += item
+            edge_properties += size
+
+            # an undirected edge holds the same properties as its reverse,
+            # half of which could be shared
+            destination = graph.get(destination_id)
+            if destination is not None:
+                reverse = destination._edges.get(id)
+                if reverse is not None and reverse._properties == edge._properties:
+                    duplicated += size / 2
+
+        totals["node_objects"] += node_bytes
+        totals["node_properties"] += properties
+        totals["adjacency"] += adjacency
+        totals["edge_objects"] += edge_bytes
+        totals["edge_properties"] += edge_properties
+        totals["duplicated_edge_properties"] += duplicated
+
+        bucket = degrees.setdefault(_bucket(len(node._edges)), {"nodes": 0, "bytes": 0})
+        bucket["nodes"] += 1
+        bucket["bytes"] += (
+            node_bytes + properties + adjacency + edge_bytes + edge_properties
+        )
+
+    def scaled(value):
+        return int(value * scale)
+
+    report = {name: scaled(value) for (name, value) in totals.items()}
+    report["index"] = sys.getsizeof(graph)
+    report["total"] = sum(
+        report[name]
+        for name in (
+            "index",
+            "node_objects",
+            "node_properties",
+            "adjacency",
+            "edge_objects",
+            "edge_properties",
+        )
+    )
+    report["nodes"] = len(ids)
+    report["sampled"] = len(sample)
+    report["node_property_keys"] = {
+        key: scaled(value) for (key, value) in node_keys.items()
+    }
+    report["edge_property_keys"] = {
+        key: scaled(value) for (key, value) in edge_keys.items()
+    }
+    report["degrees"] = {
+        degree: {"nodes": scaled(bucket["nodes"]), "bytes": scaled(bucket["bytes"])}
+        for (degree, bucket) in sorted(degrees.items())
+    }
+    return report
@@ -1,7 +1,13 @@
-from edgeable import GraphEdge, GraphModifyLock, GraphReadLock
+from edgeable import (
+    GraphEdge,
+    GraphModifyLock,
+    GraphLocalModifyLock,
+    GraphReadLock,
+    GraphSlowLogged,
+)
 from collections import deque
+from types import MappingProxyType
 import logging
-import types
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("edgeable")
@@ -33,7 +39,13 @@ class GraphNode:
     def get_id(self):
         return self._id
 
-    @GraphModifyLock
+    def _stripe_keys(self):
+        return (self._id,)
+
+    def _traversed(self, name, visits):
+        self._db._traversed(name, visits)
+
+    @GraphLocalModifyLock(fires=("create_edge",))
     def attach(self, destination, properties={}, directed=False):
         """Attach this node to another node with an edge. Returns a boolean
         indicating if a new edge was created. Optionally provided properties
@@ -59,25 +71,28 @@ class GraphNode:
             )
 
             # run create edge callbacks
-            cancel = False
-            for fn in self._db._on_create_edge.values():
-                cancel = cancel or (False == fn(edge))
+            cancel = self._db._fire("create_edge", edge)
 
             if not cancel:
+                self._db._preserve(self._id)
                 self._edges[destination.get_id()] = edge
+                self._db._components.union(self._id, destination.get_id())
+                self._db._reachability.add_edge(self._id, destination.get_id())
+                self._db._generation += 1
+                self._db._log("edge", self._id, destination.get_id(), edge._properties)
 
                 if not directed:
                     destination.attach(self, properties, directed=False)
 
         else:
-            self._edges[destination.get_id()]._properties = {
-                **self._edges[destination.get_id()]._properties,
-                **properties,
-            }
+            self._db._preserve(self._id)
+            edge = self._edges[destination.get_id()]
+            edge._properties.update(properties)
+            self._db._data_generation += 1
+            self._db._log("edge", self._id, destination.get_id(), edge._properties)
 
         return not is_connected
 
-    @GraphModifyLock
     def detach(self, destination=None, directed=False):
         """Detach this node from another node. Returns a boolean
         indicating if an edge was removed. If no destination is provided
@@ -89,30 +104,41 @@ class GraphNode:
         if self._id not in self._db._graph:
             raise RuntimeError("Node does not existing in graph")
         if destination:
-            was_connected = destination.get_id() in self._edges
-            if was_connected:
-                logger.debug("detach '%s' from '%s'", self._id, destination.get_id())
-                edge = self._edges[destination.get_id()]
+            return self._detach_from(destination, directed)
+        return self._detach_all(directed)
 
-                # run delete node callbacks
-                cancel = False
-                for fn in self._db._on_delete_edge.values():
-                    cancel = cancel or (False == fn(edge))
+    @GraphLocalModifyLock(fires=("delete_edge",))
+    def _detach_from(self, destination, directed):
+        was_connected = destination.get_id() in self._edges
+        if was_connected:
+            logger.debug("detach '%s' from '%s'", self._id, destination.get_id())
+            edge = self._edges[destination.get_id()]
 
-                if not cancel:
-                    del self._edges[destination.get_id()]
+            # run delete node callbacks
+            cancel = self._db._fire("delete_edge", edge)
 
-                    if not directed:
-                        if self._id in self._db._graph[destination.get_id()]._edges:
-                            self._db._graph[destination.get_id()].detach(self)
+            if not cancel:
+                self._db._preserve(self._id)
+                del self._edges[destination.get_id()]
+                self._db._components.invalidate()
+                self._db._reachability.invalidate()
+                self._db._generation += 1
+                self._db._log("delete_edge", self._id, destination.get_id())
 
-            return was_connected
-        else:
-            was_connected = False
-            for edge in self.get_edges():
-                was_connected = was_connected or self.detach(
-                    edge.get_destination(), directed=directed
-                )
+                if not directed:
+                    if self._id in self._db._graph[destination.get_id()]._edges:
+                        self._db._graph[destination.get_id()].detach(self)
+
+        return was_connected
+
+    # Detaching from every neighbor locks nodes which are not known in
+    # advance, so this always takes the graph-wide lock.
+    @GraphModifyLock
+    def _detach_all(self, directed):
+        was_connected = False
+        for edge in self.get_edges():
+            if self._detach_from(edge.get_destination(), directed):
+                was_connected = True
         return was_connected
 
     @GraphModifyLock
@@ -122,27 +148,36 @@ class GraphNode:
             raise RuntimeError("Node does not existing in graph")
 
         # run delete node callbacks
-        cancel = False
-        for fn in self._db._on_delete_node.values():
-            cancel = cancel or (False == fn(self))
+        cancel = self._db._fire("delete_node", self)
 
         if not cancel:
             self.detach()
+            self._db._preserve(self._id)
             del self._db._graph[self._id]
+            self._db._components.invalidate()
+            self._db._reachability.invalidate()
+            self._db._generation += 1
+            self._db._log("delete_node", self._id)
 
-    @GraphModifyLock
+    @GraphLocalModifyLock
     def set_property(self, key, value):
         """Set a node property."""
         if type(key) is not str:
             raise RuntimeError("Key must be a string.")
+        self._db._preserve(self._id)
         self._properties[key] = value
+        self._db._data_generation += 1
+        self._db._log("node", self._id, self._properties)
 
-    @GraphModifyLock
+    @GraphLocalModifyLock
     def set_properties(self, properties):
         """Set multiple properties from the provided dict. Properties not in the dict are not removed."""
         if type(properties) is not dict:
             raise RuntimeError("Key properties be a dict.")
-        self._properties = {**self._properties, **properties}
+        self._db._preserve(self._id)
+        self._properties.update(properties)
+        self._db._data_generation += 1
+        self._db._log("node", self._id, self._properties)
 
     def get_property(self, key):
         """Get the property value."""
@@ -154,25 +189,33 @@ class GraphNode:
         """Get a dict containing all properties and values."""
         return self._properties.copy()
 
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values, which is not
+        copied, and reflects later changes."""
+        return MappingProxyType(self._properties)
+
     def has_property(self, key):
         """Boolean value indicating if the property is defined."""
         return key in self._properties
 
-    @GraphModifyLock
+    @GraphLocalModifyLock
     def delete_property(self, key):
         """Delete a property if it is defined. Returns the previous value, or None."""
         if type(key) is not str:
             raise RuntimeError("Key must be a string.")
         value = self.get_property(key)
         if self.has_property(key):
+            self._db._preserve(self._id)
             del self._properties[key]
+            self._db._data_generation += 1
+            self._db._log("node", self._id, self._properties)
         return value
 
     # Returns a list of edges
     def get_edges(self, filter_fn=lambda edge: True):
         """Return all edges, or edges which match the optional filter function."""
-        if type(filter_fn) is not types.FunctionType:
-            raise RuntimeError("Filter must be a function.")
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
         if self._id not in self._db._graph:
             raise RuntimeError("Node does not existing in graph")
         return [edge for edge in self._edges.values() if filter_fn(edge)]
@@ -202,18 +245,45 @@ class GraphNode:
             for edge in self.get_edges()
         )
 
+    @GraphReadLock
+    def is_connected_to(self, other):
+        """Boolean whether a path exists between this node and the other node,
+        ignoring edge direction."""
+        if type(other) is not GraphNode:
+            raise RuntimeError("Other must be an instance of GraphNode.")
+        return self._db._components.connected(self._db._graph, self._id, other.get_id())
+
+    @GraphReadLock
+    def can_reach(self, destination):
+        """Boolean whether a route exists from this node to the destination
+        node, following edge direction."""
+        if type(destination) is not GraphNode:
+            raise RuntimeError("Destination must be an instance of GraphNode.")
+        return self._db._reachability.reaches(
+            self._db._graph, self._id, destination.get_id()
+        )
+
     # Returns a collection of less-optimal routes. The number of
     # these returned depends on the effort to find them, provided
     # as a numeric parameter.
+    @GraphSlowLogged
     @GraphReadLock
     def find_routes_to(self, destination, effort=5):
         if type(destination) is not GraphNode:
             raise RuntimeError("Destination must be an instance of GraphNode.")
+        routes = self._db._cache.fetch(
+            ("find_routes_to", self._id, destination.get_id(), effort),
+            (self._db._generation, self._db._data_generation),
+            lambda: self._find_routes_to(destination, effort),
+        )
+        return [list(route) for route in routes]
+
+    def _find_routes_to(self, destination, effort):
         q = deque([[]])
         routes = []
         while len(q):
             skip = q.popleft()
-            route = self.find_route_to(destination, skip)
+            route = self._find_route_to(destination, skip)
             if route and len(skip) <= effort:
                 for step in route[1:-1]:
                     if (
@@ -230,6 +300,7 @@ class GraphNode:
 
     # Based on code by Eryk Kopczyński
     # https://www.python.org/doc/essays/graphs/
+    @GraphSlowLogged
     @GraphReadLock
     def find_route_to(self, destination, skip=[]):
         """Find a route across the graph from the current node to the
@@ -238,6 +309,14 @@ class GraphNode:
 
         if type(destination) is not GraphNode:
             raise RuntimeError("Destination must be an instance of GraphNode.")
+        route = self._db._cache.fetch(
+            ("find_route_to", self._id, destination.get_id(), tuple(skip)),
+            (self._db._generation, self._db._data_generation),
+            lambda: self._find_route_to(destination, skip),
+        )
+        return list(route) if route is not None else None
+
+    def _find_route_to(self, destination, skip):
         dist = {self: [self]}
         q = deque([self])
         while len(q):
@@ -255,15 +334,25 @@ class GraphNode:
                     ]
                     q.append(next_node)
 
+        self._traversed("find_route_to", len(dist))
+
         def flatten(route):
             return route if len(route) == 1 else flatten(route[0]) + [route[1]]
 
         return flatten(dist[destination]) if destination in dist else None
 
+    @GraphSlowLogged
     @GraphReadLock
     def find_neighbors(self, distance=1, distance_fn=lambda edge: 1):
         """Find all neighbors the specified distance away."""
+        neighbors = self._db._cache.fetch(
+            ("find_neighbors", self._id, distance, distance_fn),
+            (self._db._generation, self._db._data_generation),
+            lambda: self._find_neighbors(distance, distance_fn),
+        )
+        return list(neighbors)
 
+    def _find_neighbors(self, distance, distance_fn):
         dist = {self: 0}
         q = deque([self])
         while len(q):
@@ -276,4 +365,171 @@ class GraphNode:
                         dist[next_node] = dist[node] + edge_distance
                         q.append(next_node)
 
+        self._traversed("find_neighbors", len(dist))
         return list(dist.keys())[1:]
+
+    def bfs(
+        self,
+        edge_filter_fn=lambda edge: True,
+        node_filter_fn=lambda node: True,
+        max_depth=None,
+        max_visits=None,
+        chunk_size=256,
+    ):
+        """Lazily traverse the graph breadth first from this node, yielding
+        (node, depth, via_edge) tuples. Edges and nodes not matching the
+        optional filter functions are not followed. The read lock is held
+        while expanding up to chunk_size nodes at a time, and released
+        while the results are yielded."""
+        return self._traverse(
+            False, edge_filter_fn, node_filter_fn, max_depth, max_visits, chunk_size
+        )
+
+    def dfs(
+        self,
+        edge_filter_fn=lambda edge: True,
+        node_filter_fn=lambda node: True,
+        max_depth=None,
+        max_visits=None,
+        chunk_size=256,
+    ):
+        """Lazily traverse the graph depth first from this node, yielding
+        (node, depth, via_edge) tuples. Edges and nodes not matching the
+        optional filter functions are not followed. The read lock is held
+        while expanding up to chunk_size nodes at a time, and released
+        while the results are yielded."""
+        return self._traverse(
+            True, edge_filter_fn, node_filter_fn, max_depth, max_visits, chunk_size
+        )
+
+    def walk_levels(
+        self,
+        edge_filter_fn=lambda edge: True,
+        node_filter_fn=lambda node: True,
+        max_depth=None,
+        max_visits=None,
+        chunk_size=256,
+    ):
+        """Lazily traverse the graph breadth first from this node, yielding
+        a list of (node, depth, via_edge) tuples for each depth."""
+        level = []
+        for step in self.bfs(
+            edge_filter_fn, node_filter_fn, max_depth, max_visits, chunk_size
+        ):
+            if level and level[0][1] != step[1]:
+                yield level
+                level = []
+            level.append(step)
+        if level:
+            yield level
+
+    def _traverse(
+        self,
+        depth_first,
+        edge_filter_fn,
+        node_filter_fn,
+        max_depth,
+        max_visits,
+        chunk_size,
+    ):
+        if not callable(edge_filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        if not callable(node_filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        if self._id not in self._db._graph:
+            raise RuntimeError("Node does not existing in graph")
+        return self._traverse_steps(
+            depth_first,
+            edge_filter_fn,
+            node_filter_fn,
+            max_depth,
+            max_visits,
+            chunk_size,
+        )
+
+    def _traverse_steps(
+        self,
+        depth_first,
+        edge_filter_fn,
+        node_filter_fn,
+        max_depth,
+        max_visits,
+        chunk_size,
+    ):
+        pending = deque([(self._id, 0, None)])
+        visited = set() if depth_first else {self._id}
+        visits = 0
+        try:
+            while pending:
+                limit = (
+                    chunk_size
+                    if max_visits is None
+                    else min(chunk_size, max_visits - visits)
+                )
+                if limit <= 0:
+                    return
+                for step in self._traverse_chunk(
+                    depth_first,
+                    pending,
+                    visited,
+                    edge_filter_fn,
+                    node_filter_fn,
+                    max_depth,
+                    limit,
+                ):
+                    visits += 1
+                    yield step
+        finally:
+            # also recorded when the traversal is abandoned early
+            self._traversed("dfs" if depth_first else "bfs", visits)
+
+    @GraphReadLock
+    def _traverse_chunk(
+        self,
+        depth_first,
+        pending,
+        visited,
+        edge_filter_fn,
+        node_filter_fn,
+        max_depth,
+        limit,
+    ):
+        """Expand up to limit pending nodes. Breadth first traversals mark
+        nodes visited when queued, depth first traversals when expanded, so
+        that the edge a node is reached through is the one last followed."""
+        graph = self._db._graph
+        steps = []
+        while pending and len(steps) < limit:
+            id, depth, via_edge = pending.pop() if depth_first else pending.popleft()
+
+            # the graph may have been modified between chunks
+            if id not in graph:
+                continue
+            if depth_first:
+                if id in visited:
+                    continue
+                visited.add(id)
+
+            node = graph[id]
+            steps.append((node, depth, via_edge))
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            children = []
+            for edge in node._edges.values():
+                next_id = edge._destination_id
+                if (
+                    next_id in visited
+                    or next_id not in graph
+                    or not edge_filter_fn(edge)
+                    or not node_filter_fn(graph[next_id])
+                ):
+                    continue
+                if not depth_first:
+                    visited.add(next_id)
+                children.append((next_id, depth + 1, edge))
+
+            # reversed so that depth first visits children in edge order
+            pending.extend(reversed(children) if depth_first else children)
+
+        return steps
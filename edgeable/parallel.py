@@ -0,0 +1,90 @@
+import contextlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# the items and function evaluated by forked worker processes, which
+# inherit them rather than receiving them pickled
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def _check_parallel(parallel, workers):
+    if parallel not in (False, True, "threads", "processes"):
+        raise RuntimeError('Parallel must be a boolean, "threads" or "processes".')
+    if workers is not None and (type(workers) is not int or workers < 1):
+        raise RuntimeError("Workers must be a positive integer.")
+
+
+def _everything(item):
+    """Default filter, matching every node or edge. Filtering with it is
+    never parallelized."""
+    return True
+
+
+def _chunks(count, workers):
+    """Split range(count) into contiguous ranges, several per worker so that
+    a slow chunk does not leave the other workers idle."""
+    size = max(1, -(-count // (workers * 4)))
+    return [range(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def _evaluate_chunk(chunk):
+    items, fn = _shared
+    return [fn(items[i]) for i in chunk]
+
+
+def evaluate(db, fn, items, parallel=False, workers=None):
+    """Return a list of fn(item) for each of the items, in order, which the
+    caller must hold the lock of the database while evaluating.
+
+    With parallel=True or "threads", the items are split into chunks
+    evaluated by a pool of threads, which only run concurrently where fn
+    releases the GIL, as in I/O or many native libraries. With "processes",
+    chunks are evaluated by worker processes forked from this one, sharing
+    the graph as it was when they were forked without copying or pickling
+    it, so pure Python functions run concurrently. Only the results are
+    pickled, and changes made by fn in a worker process are lost. Workers
+    default to the number of CPUs."""
+    _check_parallel(parallel, workers)
+    if fn is _everything:
+        return [True] * len(items)
+    if not parallel or len(items) < 2:
+        return [fn(item) for item in items]
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(len(items), workers)
+
+    if parallel == "processes":
+        return _evaluate_processes(fn, items, chunks, workers)
+
+    # the workers share the stripes held by the caller, as well as the lock
+    locks = [db._graph_lock] + [stripe for stripe in db._stripes if stripe.is_held()]
+
+    def evaluate_chunk(chunk):
+        with contextlib.ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock.share())
+            return [fn(items[i]) for i in chunk]
+
+    with ThreadPoolExecutor(min(workers, len(chunks))) as executor:
+        results = list(executor.map(evaluate_chunk, chunks))
+    return [result for chunk in results for result in chunk]
+
+
+def _evaluate_processes(fn, items, chunks, workers):
+    global _shared
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("Process parallelism requires the fork start method.")
+    context = multiprocessing.get_context("fork")
+
+    # processes are forked from the thread holding the lock, so their
+    # copy of it is held too
+    with _shared_lock:
+        _shared = (items, fn)
+        try:
+            with context.Pool(min(workers, len(chunks))) as pool:
+                results = pool.map(_evaluate_chunk, chunks, chunksize=1)
+        finally:
+            _shared = None
+    return [result for chunk in results for result in chunk]
@@ -0,0 +1,207 @@
+import operator
+
+# distinct from any property value, including None
+_missing = object()
+
+
+def _compare(key, op, value):
+    def compare(properties):
+        current = properties.get(key, _missing)
+        if current is _missing:
+            return False
+        try:
+            return op(current, value)
+        except TypeError:
+            return False
+
+    return compare
+
+
+class GraphPredicate:
+    """Condition on the properties of a node or edge, built from P and
+    combined with &, | and ~. A predicate is called like a filter function,
+    and is compiled once into a closure reading the properties directly.
+    Unlike a function, its equality conditions can be answered from a
+    property index, see GraphDatabase.create_index."""
+
+    def __init__(self, compile_fn, equalities, description):
+        self._compile = compile_fn
+        self._equalities = equalities
+        self._description = description
+        self._fn = None
+
+    def __call__(self, item):
+        if self._fn is None:
+            self._fn = self._compile()
+        return self._fn(item._properties)
+
+    def __and__(self, other):
+        other = _predicate(other)
+        equalities = dict(self._equalities)
+        for key, values in other._equalities.items():
+            equalities[key] = equalities[key] & values if key in equalities else values
+
+        def compile_fn():
+            a, b = self._compile(), other._compile()
+            return lambda properties: a(properties) and b(properties)
+
+        return GraphPredicate(
+            compile_fn,
+            equalities,
+            "(%s & %s)" % (self._description, other._description),
+        )
+
+    def __or__(self, other):
+        other = _predicate(other)
+
+        # a key constrained on both sides is constrained to either
+        equalities = {
+            key: self._equalities[key] | other._equalities[key]
+            for key in self._equalities
+            if key in other._equalities
+        }
+
+        def compile_fn():
+            a, b = self._compile(), other._compile()
+            return lambda properties: a(properties) or b(properties)
+
+        return GraphPredicate(
+            compile_fn,
+            equalities,
+            "(%s | %s)" % (self._description, other._description),
+        )
+
+    def __invert__(self):
+        def compile_fn():
+            a = self._compile()
+            return lambda properties: not a(properties)
+
+        return GraphPredicate(compile_fn, {}, "~%s" % self._description)
+
+    def __repr__(self):
+        return self._description
+
+    def get_equalities(self):
+        """Return a dict of property key to the set of values one of which
+        the property must equal for the predicate to hold."""
+        return {key: set(values) for (key, values) in self._equalities.items()}
+
+
+def _predicate(value):
+    if type(value) is not GraphPredicate:
+        raise RuntimeError("Predicates can only be combined with predicates.")
+    return value
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+class P:
+    """Reference to a property, which comparisons turn into predicates:
+
+        (P("age") > 30) & (P("type") == "user")
+
+    The parentheses are required, as & and | bind more tightly than
+    comparisons. Comparisons are False when the property is not defined, or its value
+    cannot be compared, except != which is then True."""
+
+    def __init__(self, key):
+        if type(key) is not str:
+            raise RuntimeError("Key must be a string.")
+        self._key = key
+
+    def _compare(self, op, symbol, value):
+        key = self._key
+        return GraphPredicate(
+            lambda: _compare(key, op, value),
+            {},
+            "P(%r) %s %r" % (key, symbol, value),
+        )
+
+    def __eq__(self, value):
+        key = self._key
+
+        def compile_fn():
+            return lambda properties: properties.get(key, _missing) == value
+
+        equalities = {key: frozenset([value])} if _hashable(value) else {}
+        return GraphPredicate(compile_fn, equalities, "P(%r) == %r" % (key, value))
+
+    def __ne__(self, value):
+        key = self._key
+
+        def compile_fn():
+            return lambda properties: properties.get(key, _missing) != value
+
+        return GraphPredicate(compile_fn, {}, "P(%r) != %r" % (key, value))
+
+    def __lt__(self, value):
+        return self._compare(operator.lt, "<", value)
+
+    def __le__(self, value):
+        return self._compare(operator.le, "<=", value)
+
+    def __gt__(self, value):
+        return self._compare(operator.gt, ">", value)
+
+    def __ge__(self, value):
+        return self._compare(operator.ge, ">=", value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        """Predicate that the property equals one of the values."""
+        key = self._key
+        values = list(values)
+        hashable = all(_hashable(value) for value in values)
+        lookup = frozenset(values) if hashable else values
+
+        def compile_fn():
+            def isin(properties):
+                current = properties.get(key, _missing)
+                if current is _missing:
+                    return False
+                try:
+                    return current in lookup
+                except TypeError:
+                    return False
+
+            return isin
+
+        return GraphPredicate(
+            compile_fn,
+            {key: lookup} if hashable else {},
+            "P(%r).isin(%r)" % (key, values),
+        )
+
+    def exists(self):
+        """Predicate that the property is defined."""
+        key = self._key
+        return GraphPredicate(
+            lambda: lambda properties: key in properties,
+            {},
+            "P(%r).exists()" % key,
+        )
+
+    def contains(self, value):
+        """Predicate that the property, a string or collection, contains the
+        value."""
+        return self._compare(operator.contains, "contains", value)
+
+    def startswith(self, prefix):
+        """Predicate that the property is a string starting with prefix."""
+        key = self._key
+
+        def compile_fn():
+            def startswith(properties):
+                current = properties.get(key)
+                return type(current) is str and current.startswith(prefix)
+
+            return startswith
+
+        return GraphPredicate(compile_fn, {}, "P(%r).startswith(%r)" % (key, prefix))
@@ -0,0 +1,141 @@
+import logging
+import threading
+
+logger = logging.getLogger("edgeable")
+
+
+def _bucket(value):
+    """Upper bound of the power of two histogram bucket holding value."""
+    return 1 << int(value).bit_length()
+
+
+class _Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+
+    def add(self, value, bucket):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def get_stats(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "histogram": dict(sorted(self.buckets.items())),
+        }
+
+
+class GraphProfiler:
+    """Records the number and latency of locked operations, the time spent
+    waiting for the lock, the nodes visited by traversals and the time spent
+    in synchronous callbacks by event type. A database only records these
+    while a profiler is set, see GraphDatabase.set_profiler, and otherwise
+    pays a single attribute lookup per operation.
+
+    Latency histograms have power of two buckets in microseconds, and
+    traversal histograms in nodes, keyed by the upper bound of the bucket.
+    If an exporter function is provided it is called with the statistics
+    by export(), and every interval seconds if an interval is provided."""
+
+    def __init__(self, exporter=None, interval=None):
+        if exporter is not None and not callable(exporter):
+            raise RuntimeError("Exporter must be a function.")
+        if interval is not None and (
+            type(interval) not in (int, float) or interval <= 0
+        ):
+            raise RuntimeError("Interval must be a positive number.")
+        if interval is not None and exporter is None:
+            raise RuntimeError("Interval requires an exporter.")
+
+        self._lock = threading.Lock()
+        self._exporter = exporter
+        self._calls = {}
+        self._waits = {}
+        self._traversals = {}
+        self._callbacks = {}
+        self._closed = threading.Event()
+        self._thread = None
+        if interval is not None:
+            self._thread = threading.Thread(
+                target=self._export_every,
+                args=(interval,),
+                name="edgeable-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _add(self, histograms, name, value, bucket):
+        if name not in histograms:
+            histograms[name] = _Histogram()
+        histograms[name].add(value, bucket)
+
+    def record_call(self, name, wait, elapsed):
+        """Record an operation which waited for the lock and then ran for
+        the provided number of seconds."""
+        with self._lock:
+            self._add(self._calls, name, elapsed, _bucket(elapsed * 1e6))
+            self._add(self._waits, name, wait, _bucket(wait * 1e6))
+
+    def record_traversal(self, name, visits):
+        """Record a traversal which visited the provided number of nodes."""
+        with self._lock:
+            self._add(self._traversals, name, visits, _bucket(visits))
+
+    def record_callbacks(self, event, elapsed):
+        """Record the seconds spent running the callbacks of an event."""
+        with self._lock:
+            self._add(self._callbacks, event, elapsed, _bucket(elapsed * 1e6))
+
+    def get_stats(self):
+        """Return a dict with calls, traversals and callbacks, each a dict of
+        operation name or event to its count, total, max and histogram. The
+        calls also have the wait for the lock, in the same form."""
+        with self._lock:
+            calls = {}
+            for name, histogram in self._calls.items():
+                calls[name] = histogram.get_stats()
+                calls[name]["wait"] = self._waits[name].get_stats()
+            return {
+                "calls": calls,
+                "traversals": {
+                    name: histogram.get_stats()
+                    for (name, histogram) in self._traversals.items()
+                },
+                "callbacks": {
+                    event: histogram.get_stats()
+                    for (event, histogram) in self._callbacks.items()
+                },
+            }
+
+    def reset(self):
+        """Discard the recorded statistics."""
+        with self._lock:
+            self._calls = {}
+            self._waits = {}
+            self._traversals = {}
+            self._callbacks = {}
+
+    def export(self):
+        """Call the exporter with the current statistics."""
+        if self._exporter is not None:
+            self._exporter(self.get_stats())
+
+    def _export_every(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                self.export()
+            except Exception:
+                logger.exception("profiler exporter failed")
+
+    def close(self):
+        """Stop exporting periodically."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
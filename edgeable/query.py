@@ -0,0 +1,459 @@
+import itertools
+
+from edgeable import GraphReadLock
+
+
+def _check_name(name):
+    if type(name) is not str:
+        raise RuntimeError("Name must be a string.")
+
+
+def _check_filter(filter_fn):
+    if filter_fn is not None and not callable(filter_fn):
+        raise RuntimeError("Filter must be callable.")
+
+
+class GraphQuery:
+    """Pattern matching query over a graph database. A pattern is built from
+    named node variables, each with optional filters, and edges between
+    them, each with an optional filter and a range of hops:
+
+        query = (
+            GraphQuery(db)
+            .node("a", P("type") == "user")
+            .edge("a", "b", P("label") == "follows")
+            .edge("b", "g", P("label") == "member")
+            .node("g", P("type") == "group")
+        )
+        for match in query:
+            print(match["a"], match["g"])
+
+    Each match is a dict of variable name to node, and to edge for named
+    edges. Different variables may match the same node.
+
+    Before running, a planner chooses the order in which variables are
+    bound, estimating the cost of each order from the number of nodes, the
+    average degree, and the fraction of a sample of nodes and edges
+    matching each filter. Variables are bound by scanning the graph, or an
+    index when one of their predicates compares an indexed property for
+    equality, or by following the edges of a bound variable. As nodes only
+    know their outgoing edges, binding the source of an edge from its
+    destination scans the candidate sources, which the planner avoids when
+    it can."""
+
+    def __init__(self, db, sample_size=1000):
+        if type(sample_size) is not int or sample_size < 1:
+            raise RuntimeError("Sample size must be a positive integer.")
+        self._db = db
+        self._sample_size = sample_size
+        self._nodes = {}
+        self._edges = []
+
+    def node(self, name, filter_fn=None):
+        """Add a node variable to the pattern, or a filter to an existing
+        one. Returns the query, so that calls can be chained."""
+        _check_name(name)
+        _check_filter(filter_fn)
+        if any(edge["name"] == name for edge in self._edges):
+            raise RuntimeError("Name %s is already in the pattern." % name)
+        filters = self._nodes.setdefault(name, [])
+        if filter_fn is not None:
+            filters.append(filter_fn)
+        return self
+
+    def edge(
+        self, source, destination, filter_fn=None, name=None, min_hops=1, max_hops=1
+    ):
+        """Add an edge from the source variable to the destination variable,
+        adding either if not already in the pattern. With a range of hops,
+        the destination matches each node reached from the source by a
+        path of min_hops to max_hops edges, or any number of edges at least
+        min_hops if max_hops is None, every edge of which matches the
+        filter. Only single edges can be named. Returns the query."""
+        _check_name(source)
+        _check_name(destination)
+        _check_filter(filter_fn)
+        if type(min_hops) is not int or min_hops < 0:
+            raise RuntimeError("Min hops must be a non-negative integer.")
+        if max_hops is not None and (type(max_hops) is not int or max_hops < min_hops):
+            raise RuntimeError("Max hops must be an integer of at least min hops.")
+        if name is not None:
+            _check_name(name)
+            if min_hops != 1 or max_hops != 1:
+                raise RuntimeError("Only single edges can be named.")
+            if name in self._nodes or any(e["name"] == name for e in self._edges):
+                raise RuntimeError("Name %s is already in the pattern." % name)
+            if name in (source, destination):
+                raise RuntimeError("Name %s is already in the pattern." % name)
+        self.node(source)
+        self.node(destination)
+        self._edges.append(
+            {
+                "source": source,
+                "destination": destination,
+                "filter": filter_fn,
+                "name": name,
+                "min_hops": min_hops,
+                "max_hops": max_hops,
+            }
+        )
+        return self
+
+    def explain(self):
+        """Return the plan as a list of steps, each a dict with the kind of
+        step, the variable it binds, the position of the edge in the
+        pattern it follows or checks, the key of the index scanned, and the
+        estimated partial matches after the step and cost of the step."""
+        return [step.copy() for step in self._plan()]
+
+    def run(self, chunk_size=256):
+        """Lazily return the matches of the pattern. The read lock is held
+        while examining up to chunk_size candidates at a time, and released
+        while the matches are yielded."""
+        if not self._nodes:
+            raise RuntimeError("Pattern must have at least one node.")
+        if type(chunk_size) is not int or chunk_size < 1:
+            raise RuntimeError("Chunk size must be a positive integer.")
+        return self._matches(chunk_size)
+
+    def __iter__(self):
+        return self.run()
+
+    def _matches(self, chunk_size):
+        plan = self._plan()
+        stack = [[0, {}, None, 0]]
+        visits = 0
+        try:
+            while stack:
+                matches, examined = self._match_chunk(plan, stack, chunk_size)
+                visits += examined
+                yield from matches
+        finally:
+            # also recorded when the query is abandoned early
+            self._db._traversed("match", visits)
+
+    @GraphReadLock
+    def _match_chunk(self, plan, stack, limit):
+        """Continue the depth first search for matches. Each frame of the
+        stack holds the step, the variables bound so far, the candidates
+        for the step and the position of the next candidate."""
+        steps = [self._compile(step) for step in plan]
+        last = len(steps) - 1
+        matches = []
+        examined = 0
+        while stack and examined < limit:
+            frame = stack[-1]
+            index, binding, candidates, position = frame
+            candidates_fn, extend_fn = steps[index]
+            if candidates is None:
+                candidates = frame[2] = candidates_fn(binding)
+            if position == len(candidates):
+                stack.pop()
+                continue
+            frame[3] += 1
+            examined += 1
+            extended = extend_fn(binding, candidates[position])
+            if extended is None:
+                continue
+            if index == last:
+                matches.append(extended)
+            else:
+                stack.append([index + 1, extended, None, 0])
+        return matches, examined
+
+    def _accepts(self, name):
+        """Return a function checking the filters of a variable, or None."""
+        filters = self._nodes[name]
+        if not filters:
+            return None
+        if len(filters) == 1:
+            return filters[0]
+        return lambda node: all(filter_fn(node) for filter_fn in filters)
+
+    def _scan(self, name):
+        """Return the ids of the candidates for a variable, from an index or
+        the whole graph."""
+        found = self._db._lookup(*self._nodes[name])
+        return list(self._db._graph) if found is None else found[1]
+
+    def _reached(self, id, edge):
+        """Return the ids of the nodes reached from a node through the hops
+        of an edge, in the order they are first reached."""
+        graph = self._db._graph
+        filter_fn = edge["filter"]
+        max_hops = edge["max_hops"]
+
+        def follow(frontier, found):
+            ids = {}
+            for id in frontier:
+                for next_edge in graph[id]._edges.values():
+                    next_id = next_edge._destination_id
+                    if (
+                        next_id in graph
+                        and next_id not in found
+                        and (filter_fn is None or filter_fn(next_edge))
+                    ):
+                        ids[next_id] = None
+            return ids
+
+        frontier = {id: None} if id in graph else {}
+        depth = 0
+        while depth < edge["min_hops"] and frontier:
+            frontier = follow(frontier, ())
+            depth += 1
+
+        # after min_hops, a node found again is not followed again
+        found = dict(frontier)
+        while frontier and (max_hops is None or depth < max_hops):
+            frontier = follow(frontier, found)
+            found.update(frontier)
+            depth += 1
+        return list(found)
+
+    def _compile(self, step):
+        """Return functions returning the candidates of a step for a partial
+        match, and extending the match with a candidate, or returning None
+        if it does not match."""
+        graph = self._db._graph
+        if step["step"] == "scan":
+            name = step["variable"]
+            accepts = self._accepts(name)
+
+            def extend_scan(binding, id):
+                node = graph.get(id)
+                if node is None or (accepts is not None and not accepts(node)):
+                    return None
+                return {**binding, name: node}
+
+            return lambda binding: self._scan(name), extend_scan
+
+        edge = self._edges[step["edge"]]
+        source_name = edge["source"]
+        destination_name = edge["destination"]
+        filter_fn = edge["filter"]
+        edge_name = edge["name"]
+        single = _single(edge)
+
+        if step["step"] == "expand":
+            accepts = self._accepts(destination_name)
+
+            def expand(binding):
+                source = binding[source_name]
+                if source._id not in graph:
+                    return []
+                if single:
+                    return list(source._edges.values())
+                return self._reached(source._id, edge)
+
+            def extend_expand(binding, candidate):
+                if single:
+                    if filter_fn is not None and not filter_fn(candidate):
+                        return None
+                    node = graph.get(candidate._destination_id)
+                else:
+                    node = graph.get(candidate)
+                if node is None or (accepts is not None and not accepts(node)):
+                    return None
+                extended = {**binding, destination_name: node}
+                if edge_name is not None:
+                    extended[edge_name] = candidate
+                return extended
+
+            return expand, extend_expand
+
+        def connect(extended, source, destination_id):
+            if single:
+                found = source._edges.get(destination_id)
+                if found is None or (filter_fn is not None and not filter_fn(found)):
+                    return None
+                if edge_name is not None:
+                    extended[edge_name] = found
+            elif destination_id not in self._reached(source._id, edge):
+                return None
+            return extended
+
+        if step["step"] == "expand_reverse":
+            accepts = self._accepts(source_name)
+
+            def extend_reverse(binding, id):
+                source = graph.get(id)
+                if source is None or (accepts is not None and not accepts(source)):
+                    return None
+                extended = {**binding, source_name: source}
+                return connect(extended, source, binding[destination_name]._id)
+
+            return lambda binding: self._scan(source_name), extend_reverse
+
+        def extend_check(binding, candidate):
+            source = binding[source_name]
+            if source._id not in graph:
+                return None
+            return connect(dict(binding), source, binding[destination_name]._id)
+
+        return lambda binding: [None], extend_check
+
+    @GraphReadLock
+    def _plan(self):
+        """Choose the order of the steps, trying each variable to start
+        from and greedily adding the cheapest step which binds another,
+        checking edges between bound variables as soon as possible."""
+        statistics = self._statistics()
+        best = None
+        for start in self._nodes:
+            plan = self._plan_from(start, statistics)
+            cost = sum(step["cost"] for step in plan)
+            if best is None or cost < best[0]:
+                best = (cost, plan)
+        return best[1]
+
+    def _statistics(self):
+        """Estimate the average degree, the candidates of each variable, and
+        the fraction of nodes and edges matching each filter, from a sample
+        of the first nodes and their edges."""
+        graph = self._db._graph
+        nodes = list(itertools.islice(graph.values(), self._sample_size))
+        edges = list(
+            itertools.islice(
+                (edge for node in nodes for edge in node._edges.values()),
+                self._sample_size,
+            )
+        )
+
+        def selectivity(filters, items):
+            if not filters or not items:
+                return 1.0
+            matched = sum(all(f(item) for f in filters) for item in items)
+            # never zero, as the sample may have missed the matches
+            return max(matched, 0.5) / len(items)
+
+        scans = {}
+        for name, filters in self._nodes.items():
+            found = self._db._lookup(*filters)
+            scans[name] = (
+                (None, len(graph)) if found is None else (found[0], len(found[1]))
+            )
+        return {
+            "nodes": max(len(graph), 1),
+            "degree": sum(len(node._edges) for node in nodes) / max(len(nodes), 1),
+            "scans": scans,
+            "node_selectivity": {
+                name: selectivity(filters, nodes)
+                for (name, filters) in self._nodes.items()
+            },
+            "edge_selectivity": [
+                selectivity([e["filter"]] if e["filter"] else [], edges)
+                for e in self._edges
+            ],
+        }
+
+    def _fanout(self, i, statistics):
+        """Estimate the nodes reached through the hops of edge i from one
+        node, and the edges followed to reach them."""
+        edge = self._edges[i]
+        count = statistics["nodes"]
+        degree = statistics["degree"]
+        matching = degree * statistics["edge_selectivity"][i]
+        min_hops = edge["min_hops"]
+        max_hops = edge["max_hops"]
+        if max_hops is None:
+            max_hops = count
+        reached = 1.0 if min_hops == 0 else 0.0
+        followed = 0.0
+        level = 1.0
+        # beyond a few dozen hops the estimate is no longer meaningful
+        for hops in range(1, min(max_hops, max(min_hops, 64)) + 1):
+            followed += level * degree
+            level *= matching
+            if hops >= min_hops:
+                reached += level
+            if level < 1.0e-9 or reached >= count:
+                break
+        return min(reached, count), max(min(followed, count * degree), 1.0)
+
+    def _plan_from(self, start, statistics):
+        count = statistics["nodes"]
+        scans = statistics["scans"]
+        node_selectivity = statistics["node_selectivity"]
+
+        def scan(name, rows):
+            key, candidates = scans[name]
+            return {
+                "step": "scan",
+                "variable": name,
+                "edge": None,
+                "index": key,
+                "rows": rows * count * node_selectivity[name],
+                "cost": rows * candidates,
+            }
+
+        plan = []
+        bound = set()
+        remaining = list(range(len(self._edges)))
+        step = scan(start, 1.0)
+        while step is not None:
+            plan.append(step)
+            bound.add(step["variable"])
+            if step["edge"] is not None:
+                remaining.remove(step["edge"])
+            rows = step["rows"]
+
+            # edges between bound variables only remove partial matches
+            for i in list(remaining):
+                edge = self._edges[i]
+                if edge["source"] in bound and edge["destination"] in bound:
+                    reached, followed = self._fanout(i, statistics)
+                    cost = rows * (1.0 if _single(edge) else followed)
+                    rows *= reached / count
+                    plan.append(
+                        {
+                            "step": "check",
+                            "variable": None,
+                            "edge": i,
+                            "index": None,
+                            "rows": rows,
+                            "cost": cost,
+                        }
+                    )
+                    remaining.remove(i)
+
+            options = []
+            for i in remaining:
+                edge = self._edges[i]
+                reached, followed = self._fanout(i, statistics)
+                if edge["source"] in bound:
+                    name = edge["destination"]
+                    kind = "expand"
+                    cost = rows * followed
+                elif edge["destination"] in bound:
+                    name = edge["source"]
+                    kind = "expand_reverse"
+                    cost = rows * scans[name][1] * (1.0 if _single(edge) else followed)
+                else:
+                    continue
+                options.append(
+                    {
+                        "step": kind,
+                        "variable": name,
+                        "edge": i,
+                        "index": scans[name][0] if kind == "expand_reverse" else None,
+                        "rows": rows * reached * node_selectivity[name],
+                        "cost": cost,
+                    }
+                )
+
+            unbound = [name for name in self._nodes if name not in bound]
+            if options:
+                step = min(options, key=lambda option: option["cost"])
+            elif unbound:
+                # a separate part of the pattern, every match of which is
+                # combined with every partial match so far
+                step = min(
+                    (scan(name, rows) for name in unbound), key=lambda s: s["cost"]
+                )
+            else:
+                step = None
+        return plan
+
+
+def _single(edge):
+    return edge["min_hops"] == 1 and edge["max_hops"] == 1
@@ -0,0 +1,176 @@
+import bisect
+import threading
+
+
+class GraphReachability:
+    """Index answering whether one node can reach another along directed
+    edges. Strongly connected components are condensed into a DAG, and each
+    component is labeled with the post-order intervals of a spanning forest
+    of that DAG, merged with the intervals of everything it reaches. A
+    query is a binary search over the intervals of the source component.
+
+    The index is built in bulk on the first query. Adding an edge that does
+    not change reachability leaves it intact, other changes invalidate it
+    and it is rebuilt on the next query."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._valid = False
+        self._component = {}
+        self._post = []
+        self._starts = []
+        self._ends = []
+
+    def invalidate(self):
+        """Discard the index, it will be rebuilt on the next query."""
+        with self._lock:
+            self._valid = False
+            self._component = {}
+            self._post = []
+            self._starts = []
+            self._ends = []
+
+    def add_edge(self, source, destination):
+        """Record a new edge between the nodes with the provided ids."""
+        with self._lock:
+            if self._valid and not self._reaches(source, destination):
+                self._valid = False
+
+    def reaches(self, graph, source, destination):
+        """Boolean indicating if the node with id source can reach the node
+        with id destination."""
+        with self._lock:
+            if not self._valid:
+                self._build(graph)
+            return self._reaches(source, destination)
+
+    def _reaches(self, source, destination):
+        if source == destination:
+            return True
+
+        # nodes added since the index was built have no edges
+        if source not in self._component or destination not in self._component:
+            return False
+
+        a = self._component[source]
+        b = self._component[destination]
+        if a == b:
+            return True
+        post = self._post[b]
+        i = bisect.bisect_right(self._starts[a], post) - 1
+        return i >= 0 and self._ends[a][i] >= post
+
+    def _build(self, graph):
+        component = self._condense(graph)
+        count = max(component.values()) + 1 if component else 0
+
+        children = [set() for _ in range(count)]
+        for id, node in graph.items():
+            for destination_id in node._edges:
+                if destination_id in component:
+                    c = component[destination_id]
+                    if c != component[id]:
+                        children[component[id]].add(c)
+
+        # Components are numbered in reverse topological order, so a
+        # depth first search from the highest numbers covers the DAG
+        # starting from its sources.
+        low = [0] * count
+        post = [0] * count
+        visited = [False] * count
+        counter = 0
+        for root in range(count - 1, -1, -1):
+            if visited[root]:
+                continue
+            visited[root] = True
+            low[root] = counter
+            work = [(root, iter(children[root]))]
+            while work:
+                c, pending = work[-1]
+                for child in pending:
+                    if not visited[child]:
+                        visited[child] = True
+                        low[child] = counter
+                        work.append((child, iter(children[child])))
+                        break
+                else:
+                    work.pop()
+                    post[c] = counter
+                    counter += 1
+
+        # children always have lower numbers, so are labeled first
+        starts = [None] * count
+        ends = [None] * count
+        for c in range(count):
+            intervals = [(low[c], post[c])]
+            for child in children[c]:
+                intervals.extend(zip(starts[child], ends[child]))
+            intervals.sort()
+
+            merged_starts = []
+            merged_ends = []
+            for start, end in intervals:
+                if merged_ends and start <= merged_ends[-1] + 1:
+                    merged_ends[-1] = max(merged_ends[-1], end)
+                else:
+                    merged_starts.append(start)
+                    merged_ends.append(end)
+            starts[c] = merged_starts
+            ends[c] = merged_ends
+
+        self._component = component
+        self._post = post
+        self._starts = starts
+        self._ends = ends
+        self._valid = True
+
+    def _condense(self, graph):
+        """Tarjan's strongly connected components algorithm, iterative to
+        avoid the recursion limit. Returns a dict of node id to component
+        number, numbered in reverse topological order."""
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        component = {}
+        counter = 0
+        count = 0
+
+        for start in graph:
+            if start in index:
+                continue
+            index[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(graph[start]._edges))]
+
+            while work:
+                id, pending = work[-1]
+                for child in pending:
+                    if child not in graph:
+                        continue
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(graph[child]._edges)))
+                        break
+                    if child in on_stack:
+                        lowlink[id] = min(lowlink[id], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[id])
+                    if lowlink[id] == index[id]:
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component[member] = count
+                            if member == id:
+                                break
+                        count += 1
+
+        return component
@@ -0,0 +1,370 @@
+import io
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickles only basic types, so no code can be run by a peer."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError("Only basic types can be sent.")
+
+
+# types pickled without referencing a class, which _Unpickler accepts
+_BASIC = (type(None), bool, int, float, str, bytes, list, tuple, dict, set, frozenset)
+
+
+def _unsendable(obj):
+    return pickle.PicklingError(
+        "Only basic types can be sent, not %s." % type(obj).__name__
+    )
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles only basic types, which _Unpickler accepts."""
+
+    def reducer_override(self, obj):
+        raise _unsendable(obj)
+
+
+def _check_basic(message):
+    """Raise PicklingError unless the message is made of basic types only.
+    Before Python 3.8 reducer_override is never called, so the message is
+    checked before it is pickled."""
+    pending = [message]
+    while pending:
+        obj = pending.pop()
+        if type(obj) not in _BASIC:
+            raise _unsendable(obj)
+        if type(obj) is dict:
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif type(obj) in (list, tuple, set, frozenset):
+            pending.extend(obj)
+
+
+_checked = not hasattr(pickle.Pickler, "reducer_override")
+
+
+def _frame(message):
+    if _checked:
+        _check_basic(message)
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=4).dump(message)
+    data = buffer.getvalue()
+    return struct.pack(">I", len(data)) + data
+
+
+def _read_frames(stream):
+    """Yield the messages read from a binary stream until it is closed."""
+    while True:
+        header = stream.read(4)
+        if len(header) < 4:
+            return
+        (size,) = struct.unpack(">I", header)
+        data = stream.read(size)
+        if len(data) < size:
+            return
+        yield _Unpickler(io.BytesIO(data)).load()
+
+
+def _request(message):
+    """Return the id, atomic flag and operations of a request. Raises
+    ValueError if it is malformed, with the id if it has one."""
+    if type(message) is not tuple or len(message) != 3:
+        raise ValueError(None)
+    id, atomic, operations = message
+    if type(atomic) is not bool or type(operations) not in (list, tuple):
+        raise ValueError(id)
+    return id, atomic, operations
+
+
+def _operation(operation):
+    """Return the name, args and kwargs of an operation, or raise
+    RuntimeError if it is malformed."""
+    if (
+        type(operation) not in (list, tuple)
+        or len(operation) != 3
+        or type(operation[1]) not in (list, tuple)
+        or type(operation[2]) is not dict
+        or not all(type(key) is str for key in operation[2])
+    ):
+        raise RuntimeError("Malformed operation.")
+    return operation
+
+
+def _ids(nodes):
+    return None if nodes is None else [node.get_id() for node in nodes]
+
+
+def _edge_ids(edges):
+    return [(edge._source_id, edge._destination_id) for edge in edges]
+
+
+class _Operations:
+    """Operations which can be requested, named by the method, or by node_
+    or edge_ followed by the method of a node or edge. Nodes are identified
+    by id and edges by the ids of their source and destination nodes."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def _node(self, id):
+        node = self._db.get_node(id)
+        if node is None:
+            raise RuntimeError("Node does not exist.")
+        return node
+
+    def _edge(self, source_id, destination_id):
+        edge = self._node(source_id).get_edge(self._node(destination_id))
+        if edge is None:
+            raise RuntimeError("Edge does not exist.")
+        return edge
+
+    def put_node(self, id, properties={}):
+        node = self._db.put_node(id, properties)
+        return None if node is None else node.get_id()
+
+    def has_node(self, id):
+        return self._db.has_node(id)
+
+    def get_nodes(self, properties={}):
+        if type(properties) is not dict:
+            raise RuntimeError("Properties must be a dict.")
+        items = properties.items()
+        return _ids(
+            self._db.get_nodes(
+                lambda node: all(
+                    key in node._properties and node._properties[key] == value
+                    for (key, value) in items
+                )
+            )
+        )
+
+    def get_edges(self):
+        return _edge_ids(self._db.get_edges())
+
+    def get_node_count(self):
+        return self._db.get_node_count()
+
+    def get_edge_count(self):
+        return self._db.get_edge_count()
+
+    def get_property(self, key):
+        return self._db.get_property(key)
+
+    def get_properties(self):
+        return self._db.get_properties()
+
+    def has_property(self, key):
+        return self._db.has_property(key)
+
+    def set_property(self, key, value):
+        return self._db.set_property(key, value)
+
+    def set_properties(self, properties):
+        return self._db.set_properties(properties)
+
+    def delete_property(self, key):
+        return self._db.delete_property(key)
+
+    def save(self):
+        return self._db.save()
+
+    def node_attach(self, id, destination_id, properties={}, directed=False):
+        return self._node(id).attach(self._node(destination_id), properties, directed)
+
+    def node_detach(self, id, destination_id=None, directed=False):
+        destination = None if destination_id is None else self._node(destination_id)
+        return self._node(id).detach(destination, directed)
+
+    def node_delete(self, id):
+        return self._node(id).delete()
+
+    def node_get_property(self, id, key):
+        return self._node(id).get_property(key)
+
+    def node_get_properties(self, id):
+        return self._node(id).get_properties()
+
+    def node_has_property(self, id, key):
+        return self._node(id).has_property(key)
+
+    def node_set_property(self, id, key, value):
+        return self._node(id).set_property(key, value)
+
+    def node_set_properties(self, id, properties):
+        return self._node(id).set_properties(properties)
+
+    def node_delete_property(self, id, key):
+        return self._node(id).delete_property(key)
+
+    def node_get_edges(self, id):
+        return _edge_ids(self._node(id).get_edges())
+
+    def node_has_edge(self, id, destination_id):
+        return self._node(id).has_edge(self._node(destination_id))
+
+    def node_is_connected_to(self, id, other_id):
+        return self._node(id).is_connected_to(self._node(other_id))
+
+    def node_can_reach(self, id, destination_id):
+        return self._node(id).can_reach(self._node(destination_id))
+
+    def node_find_route_to(self, id, destination_id, skip=[]):
+        skip = [self._node(s) for s in skip]
+        return _ids(self._node(id).find_route_to(self._node(destination_id), skip))
+
+    def node_find_routes_to(self, id, destination_id, effort=5):
+        routes = self._node(id).find_routes_to(self._node(destination_id), effort)
+        return [_ids(route) for route in routes]
+
+    def node_find_neighbors(self, id, distance=1):
+        return _ids(self._node(id).find_neighbors(distance))
+
+    def edge_get_property(self, source_id, destination_id, key):
+        return self._edge(source_id, destination_id).get_property(key)
+
+    def edge_get_properties(self, source_id, destination_id):
+        return self._edge(source_id, destination_id).get_properties()
+
+    def edge_has_property(self, source_id, destination_id, key):
+        return self._edge(source_id, destination_id).has_property(key)
+
+    def edge_set_property(self, source_id, destination_id, key, value, directed=False):
+        return self._edge(source_id, destination_id).set_property(key, value, directed)
+
+    def edge_set_properties(
+        self, source_id, destination_id, properties, directed=False
+    ):
+        edge = self._edge(source_id, destination_id)
+        return edge.set_properties(properties, directed)
+
+    def edge_delete_property(self, source_id, destination_id, key):
+        return self._edge(source_id, destination_id).delete_property(key)
+
+    def edge_delete(self, source_id, destination_id, directed=False):
+        return self._edge(source_id, destination_id).delete(directed)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+class GraphServer:
+    """Serves a database to GraphClient connections on a Unix socket, if the
+    address is a path, or a TCP socket, if it is a (host, port) tuple.
+
+    Each request is a batch of operations, answered in order, so clients
+    may send further requests before reading the responses. Requests and
+    responses are length prefixed pickles restricted to basic types, so
+    property values must be basic types. Connections are served by a
+    thread each, and reading operations run concurrently."""
+
+    def __init__(self, db, address):
+        self._db = db
+        self._operations = _Operations(db)
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def setup(self):
+                super().setup()
+                if self.connection.family != socket.AF_UNIX:
+                    self.connection.setsockopt(
+                        socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                    )
+
+            def handle(self):
+                try:
+                    for message in _read_frames(self.rfile):
+                        try:
+                            id, atomic, operations = _request(message)
+                        except ValueError as e:
+                            frame = _frame((e.args[0], [(False, "Malformed request.")]))
+                            self.wfile.write(frame)
+                            continue
+                        results = server._execute(operations, atomic)
+                        try:
+                            frame = _frame((id, results))
+                        except pickle.PicklingError:
+                            frame = _frame((id, [_sendable(r) for r in results]))
+                        self.wfile.write(frame)
+                except (OSError, ValueError, pickle.UnpicklingError):
+                    pass
+
+        if type(address) is str:
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = socketserver.ThreadingUnixStreamServer(address, Handler)
+        else:
+            self._server = _TCPServer(address, Handler)
+        self._server.daemon_threads = True
+        self._address = self._server.server_address
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            args=(0.05,),
+            name="edgeable-server",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def get_address(self):
+        """Return the address served, including the port chosen for port 0."""
+        return self._address
+
+    def close(self):
+        """Stop serving, and remove the socket file of a Unix socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if type(self._address) is str and os.path.exists(self._address):
+            os.unlink(self._address)
+
+    def _call(self, name, args, kwargs):
+        fn = None
+        if type(name) is str and not name.startswith("_"):
+            fn = getattr(self._operations, name, None)
+        if fn is None:
+            raise RuntimeError("Unknown operation '%s'." % name)
+        return fn(*args, **kwargs)
+
+    def _execute(self, operations, atomic):
+        """Return a result for each operation, either (True, value) or
+        (False, error message). An atomic batch runs in a transaction, and
+        if any operation fails all are rolled back and fail."""
+        if atomic:
+            try:
+                operations = [_operation(operation) for operation in operations]
+                with self._db.transaction():
+                    return [
+                        (True, self._call(name, args, kwargs))
+                        for (name, args, kwargs) in operations
+                    ]
+            except Exception as e:
+                return [(False, _message(e))] * len(operations)
+
+        results = []
+        for operation in operations:
+            try:
+                name, args, kwargs = _operation(operation)
+                results.append((True, self._call(name, args, kwargs)))
+            except Exception as e:
+                results.append((False, _message(e)))
+        return results
+
+
+def _message(exception):
+    if type(exception) is RuntimeError:
+        return str(exception)
+    return "%s: %s" % (type(exception).__name__, exception)
+
+
+def _sendable(result):
+    try:
+        _frame(result)
+        return result
+    except pickle.PicklingError as e:
+        return (False, str(e))
@@ -0,0 +1,121 @@
+import functools
+import logging
+import reprlib
+import threading
+import time
+import types
+from collections import deque
+
+logger = logging.getLogger("edgeable")
+
+_repr = reprlib.Repr()
+_repr.maxstring = 80
+_repr.maxother = 80
+
+
+def _describe(value):
+    """Short description of an argument, naming nodes by id and functions
+    by their source location, since lambdas are otherwise
+    indistinguishable."""
+    if hasattr(value, "get_id"):
+        return _repr.repr(value.get_id())
+    if type(value) is types.FunctionType:
+        code = value.__code__
+        return "%s (%s:%d)" % (
+            value.__qualname__,
+            code.co_filename,
+            code.co_firstlineno,
+        )
+    return _repr.repr(value)
+
+
+def _waited(db):
+    """Seconds the current thread has waited for the locks of a database."""
+    return sum(
+        getattr(lock._local, "waited", 0.0) for lock in (db._graph_lock, *db._stripes)
+    )
+
+
+class GraphSlowLog:
+    """Records operations which take at least threshold seconds, keeping
+    the latest max_entries. Each entry has the operation, its arguments,
+    the wall time and the time spent waiting for locks in seconds, and the
+    nodes visited. With log=True entries are also logged as warnings to
+    the edgeable logger. A log may be shared by several databases."""
+
+    def __init__(self, threshold=0.1, max_entries=1000, log=False):
+        if type(threshold) not in (int, float) or threshold < 0:
+            raise RuntimeError("Threshold must be a non-negative number.")
+        if type(max_entries) is not int or max_entries < 1:
+            raise RuntimeError("Max entries must be a positive integer.")
+        self._threshold = threshold
+        self._log = log
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=max_entries)
+        self._local = threading.local()
+
+    def record_traversal(self, visits):
+        """Add nodes visited to the operation running in this thread."""
+        entry = getattr(self._local, "entry", None)
+        if entry is not None:
+            entry["visits"] += visits
+
+    def _call(self, db, name, func, args, kwargs):
+        entry = {"visits": 0}
+        self._local.entry = entry
+        waited = _waited(db)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.entry = None
+            if elapsed >= self._threshold:
+                entry["operation"] = name
+                # the database itself is not worth describing, a node is
+                entry["arguments"] = [
+                    _describe(arg) for arg in (args[1:] if args[0] is db else args)
+                ]
+                entry["keywords"] = {k: _describe(v) for (k, v) in kwargs.items()}
+                entry["seconds"] = elapsed
+                entry["wait"] = _waited(db) - waited
+                entry["time"] = time.time() - elapsed
+                with self._lock:
+                    self._entries.append(entry)
+                if self._log:
+                    logger.warning(
+                        "slow %s took %.3fs, waited %.3fs, visited %d nodes: %s %s",
+                        name,
+                        elapsed,
+                        entry["wait"],
+                        entry["visits"],
+                        entry["arguments"],
+                        entry["keywords"],
+                    )
+
+    def get_entries(self):
+        """Return a list of the recorded entries, oldest first."""
+        with self._lock:
+            return [entry.copy() for entry in self._entries]
+
+    def clear(self):
+        """Discard the recorded entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+def GraphSlowLogged(func):
+    """Record calls of the decorated method in the slow log of its
+    database, if one is set. Calls made within another recorded operation
+    are part of it."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        db = getattr(args[0], "_db", args[0])
+        slow_log = db._slow_log
+        if slow_log is None or getattr(slow_log._local, "entry", None) is not None:
+            return func(*args, **kwargs)
+        return slow_log._call(db, name, func, args, kwargs)
+
+    return inner
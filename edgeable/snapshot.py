@@ -0,0 +1,334 @@
+from types import MappingProxyType
+
+from edgeable import GraphNode
+
+# returned when a node did not exist, distinct from any value read
+_missing = object()
+
+
+def _capture(node):
+    """Copy the state of a node, or None if it does not exist."""
+    if node is None:
+        return None
+    return (
+        node._properties.copy(),
+        {id: edge._properties.copy() for (id, edge) in node._edges.items()},
+    )
+
+
+def _replace(target, source):
+    """Replace the contents of a properties dict in place, so that views of
+    it reflect the change."""
+    if target is not source:
+        target.clear()
+        target.update(source)
+
+
+class GraphSnapshot:
+    """Consistent, read-only view of a database at the moment it was
+    created. Creating a snapshot copies nothing. Before a node is modified
+    or deleted its previous state is saved into every open snapshot which
+    has not yet saved it, so reading a snapshot never blocks writers.
+    Nodes which have not been saved are read from the database directly.
+    Saved states are released when the snapshot is closed."""
+
+    def __init__(self, db):
+        self._db = db
+        self._saved = {}
+        self._complete = False
+        self._properties = db._properties.copy()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the snapshot, releasing any saved node states."""
+        with self._db._snapshot_lock:
+            self._db._snapshots.discard(self)
+            self._saved = {}
+            self._complete = True
+
+    def _read(self, id, fn):
+        """Return fn(properties, edges, live) for the node with the provided
+        id as it was when the snapshot was taken, or _missing if it did not
+        exist. Saved edges map destination ids to properties, and live ones
+        to edges. A node is saved before a writer modifies it, so a node
+        still not saved after it was read live was read unmodified;
+        otherwise it is read again from its saved state."""
+        while True:
+            saved = self._saved.get(id, _missing)
+            if saved is not _missing:
+                return _missing if saved is None else fn(*saved, False)
+            if self._complete:
+                return _missing
+            node = self._db._graph.get(id)
+            try:
+                result = (
+                    _missing
+                    if node is None
+                    else fn(node._properties, node._edges, True)
+                )
+            except RuntimeError:
+                # the edges changed while iterated, after the node was saved
+                if id not in self._saved and not self._complete:
+                    raise
+                continue
+            if id not in self._saved and not self._complete:
+                return result
+
+    def _ids(self):
+        with self._db._snapshot_lock:
+            ids = [] if self._complete else list(self._db._graph)
+            live = set(ids)
+            ids = [id for id in ids if self._saved.get(id, True) is not None]
+            ids.extend(
+                id
+                for (id, state) in self._saved.items()
+                if state is not None and id not in live
+            )
+            return ids
+
+    def get_node(self, id):
+        """Get the node with the provided id, or None if it did not exist."""
+        return GraphSnapshotNode(self, id) if self.has_node(id) else None
+
+    def has_node(self, id):
+        """Boolean indicating if the node was defined."""
+        return self._read(id, _exists) is not _missing
+
+    def get_nodes(self, filter_fn=lambda node: True):
+        """Return all nodes, or nodes which match the optional filter function."""
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        nodes = (self.get_node(id) for id in self._ids())
+        return [node for node in nodes if node is not None and filter_fn(node)]
+
+    def get_edges(
+        self, edge_filter_fn=lambda edge: True, node_filter_fn=lambda node: True
+    ):
+        """Return all edges, or edges which match the optional filter function."""
+        if not callable(edge_filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        return [
+            edge
+            for node in self.get_nodes(node_filter_fn)
+            for edge in node.get_edges(edge_filter_fn)
+        ]
+
+    def get_node_count(self):
+        """Return the number of nodes."""
+        return len(self._ids())
+
+    def get_edge_count(self):
+        """Return the number of edges."""
+        return sum(node._read(_degree) for node in self.get_nodes())
+
+    def get_property(self, key):
+        """Get the property value."""
+        if type(key) is not str:
+            raise RuntimeError("Key must be a string.")
+        return self._properties[key] if self.has_property(key) else None
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._properties.copy()
+
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values as they were
+        when the snapshot was taken, without copying them again."""
+        return MappingProxyType(self._properties)
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        if type(key) is not str:
+            raise RuntimeError("Key must be a string.")
+        return key in self._properties
+
+
+def _exists(properties, edges, live):
+    return True
+
+
+def _degree(properties, edges, live):
+    return len(edges)
+
+
+def _frozen(properties, live):
+    """Return properties which will not change, copying live ones."""
+    return MappingProxyType(properties.copy() if live else properties)
+
+
+class GraphSnapshotNode:
+    """Read-only node within a snapshot."""
+
+    # the route searches only use the read interface shared with GraphNode
+    _find_route_to = GraphNode._find_route_to
+    _find_routes_to = GraphNode._find_routes_to
+    _find_neighbors = GraphNode._find_neighbors
+
+    def _traversed(self, name, visits):
+        # searches of snapshots are not profiled
+        pass
+
+    def __init__(self, snapshot, id):
+        self._snapshot = snapshot
+        self._id = id
+
+    def _read(self, fn):
+        result = self._snapshot._read(self._id, fn)
+        if result is _missing:
+            raise RuntimeError("Snapshot is closed.")
+        return result
+
+    @property
+    def _properties(self):
+        # read by predicates built with P
+        return self._read(lambda properties, edges, live: _frozen(properties, live))
+
+    def __eq__(self, other):
+        if isinstance(other, GraphSnapshotNode):
+            return self._id == other._id
+        return False
+
+    def __str__(self):
+        return self.get_id()
+
+    def __repr__(self):
+        return self.get_id()
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def get_id(self):
+        return self._id
+
+    def get_property(self, key):
+        """Get the property value."""
+        if type(key) is not str:
+            raise RuntimeError("Key must be a string.")
+        return self._read(lambda properties, edges, live: properties.get(key))
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._read(lambda properties, edges, live: properties.copy())
+
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values as they were
+        when the snapshot was taken. They are copied if the node has not
+        been saved into the snapshot, as they may still change."""
+        return self._properties
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self._read(lambda properties, edges, live: key in properties)
+
+    def get_edges(self, filter_fn=lambda edge: True):
+        """Return all edges, or edges which match the optional filter function."""
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        ids = self._read(lambda properties, edges, live: list(edges))
+        edges = (GraphSnapshotEdge(self._snapshot, self._id, id) for id in ids)
+        return [edge for edge in edges if filter_fn(edge)]
+
+    def get_edge(self, destination):
+        """Return the edge to the specified destination node, or None if one does not exist."""
+        if not self.has_edge(destination):
+            return None
+        return GraphSnapshotEdge(self._snapshot, self._id, destination.get_id())
+
+    def has_edge(self, destination):
+        """Boolean whether an edge exists to the specified destination node."""
+        if type(destination) is not GraphSnapshotNode:
+            raise RuntimeError("Destination must be an instance of GraphSnapshotNode.")
+        id = destination.get_id()
+        return self._read(lambda properties, edges, live: id in edges)
+
+    def find_routes_to(self, destination, effort=5):
+        """Find multiple routes to the destination node, as find_route_to.
+        The number returned depends on the effort to find them."""
+        if type(destination) is not GraphSnapshotNode:
+            raise RuntimeError("Destination must be an instance of GraphSnapshotNode.")
+        return self._find_routes_to(destination, effort)
+
+    def find_route_to(self, destination, skip=[]):
+        """Find a route across the graph from the current node to the
+        destination node, returned as an array of nodes. If no route
+        exists, returns None."""
+        if type(destination) is not GraphSnapshotNode:
+            raise RuntimeError("Destination must be an instance of GraphSnapshotNode.")
+        return self._find_route_to(destination, skip)
+
+    def find_neighbors(self, distance=1, distance_fn=lambda edge: 1):
+        """Find all neighbors the specified distance away."""
+        return self._find_neighbors(distance, distance_fn)
+
+
+class GraphSnapshotEdge:
+    """Read-only edge within a snapshot."""
+
+    def __init__(self, snapshot, source_id, destination_id):
+        self._snapshot = snapshot
+        self._source_id = source_id
+        self._destination_id = destination_id
+
+    def _read(self, fn):
+        destination_id = self._destination_id
+
+        def read(properties, edges, live):
+            edge = edges[destination_id]
+            return fn(edge._properties if live else edge, live)
+
+        result = self._snapshot._read(self._source_id, read)
+        if result is _missing:
+            raise RuntimeError("Snapshot is closed.")
+        return result
+
+    @property
+    def _properties(self):
+        # read by predicates built with P
+        return self._read(_frozen)
+
+    def __eq__(self, other):
+        if isinstance(other, GraphSnapshotEdge):
+            return (
+                self._source_id == other._source_id
+                and self._destination_id == other._destination_id
+            )
+        return False
+
+    def __str__(self):
+        return self._source_id + "->" + self._destination_id
+
+    def __repr__(self):
+        return self._source_id + "->" + self._destination_id
+
+    def get_destination(self):
+        """Get the node which is the destination of this edge."""
+        return self._snapshot.get_node(self._destination_id)
+
+    def get_source(self):
+        """Get the node which is the source of this edge."""
+        return self._snapshot.get_node(self._source_id)
+
+    def get_property(self, key):
+        """Get the property value."""
+        if type(key) is not str:
+            raise RuntimeError("Key must be a string")
+        return self._read(lambda properties, live: properties.get(key))
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._read(lambda properties, live: properties.copy())
+
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values as they were
+        when the snapshot was taken. They are copied if the source node has
+        not been saved into the snapshot, as they may still change."""
+        return self._properties
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self._read(lambda properties, live: key in properties)
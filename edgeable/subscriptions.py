@@ -0,0 +1,141 @@
+import threading
+
+
+class GraphSubscriptions:
+    """Callbacks for one type of event, indexed by their filters so that an
+    event is only offered to callbacks which could match it.
+
+    A callback may require property values, the presence of property keys,
+    and a prefix of the node id, or of the source node id for edges. It is
+    indexed on one of its conditions, and the others are checked only for
+    callbacks found through the index. Callbacks are returned in the order
+    they were registered. The index is rebuilt when callbacks change, which
+    is expected to be rare compared to events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = {}
+        self._sequence = 0
+        self._synchronous = 0
+        self._index = _Index(())
+
+    def __bool__(self):
+        return bool(self._callbacks)
+
+    def has_synchronous(self):
+        """Boolean whether any callback is synchronous."""
+        return self._synchronous > 0
+
+    def subscribe(
+        self, id, fn, asynchronous=False, properties={}, has_properties=(), prefix=None
+    ):
+        """Set the callback with the provided id, or remove it if fn is None."""
+        with self._lock:
+            previous = self._callbacks.pop(id, None)
+            if fn is not None:
+                # a changed callback keeps its position
+                self._sequence += 1
+                self._callbacks[id] = _Subscription(
+                    previous.sequence if previous else self._sequence,
+                    fn,
+                    asynchronous,
+                    properties.copy(),
+                    tuple(has_properties),
+                    prefix,
+                )
+            self._synchronous = sum(
+                1 for s in self._callbacks.values() if not s.asynchronous
+            )
+            self._index = _Index(self._callbacks.values())
+
+    def match(self, id, properties):
+        """Return the synchronous and asynchronous callbacks matching an item
+        with the provided id and properties, each as a list."""
+        return self._index.match(id, properties)
+
+
+class _Subscription:
+    __slots__ = (
+        "sequence",
+        "fn",
+        "asynchronous",
+        "properties",
+        "has_properties",
+        "prefix",
+    )
+
+    def __init__(self, sequence, fn, asynchronous, properties, has_properties, prefix):
+        self.sequence = sequence
+        self.fn = fn
+        self.asynchronous = asynchronous
+        self.properties = properties
+        self.has_properties = has_properties
+        self.prefix = prefix
+
+    def matches(self, id, properties):
+        if self.prefix is not None and not (
+            type(id) is str and id.startswith(self.prefix)
+        ):
+            return False
+        for key in self.has_properties:
+            if key not in properties:
+                return False
+        for key, value in self.properties.items():
+            if key not in properties or properties[key] != value:
+                return False
+        return True
+
+
+class _Index:
+    """Immutable lookup tables over a set of subscriptions."""
+
+    def __init__(self, subscriptions):
+        self.unfiltered = []
+        self.by_value = {}
+        self.by_key = {}
+        self.by_prefix = {}
+
+        for subscription in subscriptions:
+            if subscription.properties:
+                key, value = next(iter(subscription.properties.items()))
+                self.by_value.setdefault((key, value), []).append(subscription)
+            elif subscription.has_properties:
+                key = subscription.has_properties[0]
+                self.by_key.setdefault(key, []).append(subscription)
+            elif subscription.prefix is not None:
+                self.by_prefix.setdefault(subscription.prefix, []).append(subscription)
+            else:
+                self.unfiltered.append(subscription)
+
+        self.value_keys = {key for (key, value) in self.by_value}
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.by_prefix})
+        self.filtered = bool(self.by_value or self.by_key or self.by_prefix)
+        self.all = self._split(self.unfiltered)
+
+    @staticmethod
+    def _split(subscriptions):
+        callbacks = [s.fn for s in subscriptions if not s.asynchronous]
+        listeners = [s.fn for s in subscriptions if s.asynchronous]
+        return callbacks, listeners
+
+    def match(self, id, properties):
+        if not self.filtered:
+            return self.all
+
+        candidates = list(self.unfiltered)
+        for key in self.value_keys & properties.keys():
+            try:
+                candidates.extend(self.by_value.get((key, properties[key]), ()))
+            except TypeError:
+                # unhashable values cannot equal a subscribed value
+                pass
+        for key in self.by_key.keys() & properties.keys():
+            candidates.extend(self.by_key[key])
+        if type(id) is str:
+            for length in self.prefix_lengths:
+                if length > len(id):
+                    break
+                candidates.extend(self.by_prefix.get(id[:length], ()))
+
+        candidates.sort(key=lambda s: s.sequence)
+        return self._split([s for s in candidates if s.matches(id, properties)])
@@ -1,73 +1,366 @@
+import contextlib
+import functools
 import threading
+import time
+from collections import deque
 
 
-_lock = threading.Condition(threading.Lock())
-_readers = 0
-_writers = 0
+class GraphLock:
+    """Reentrant reader-writer lock. Each database owns one, so that
+    operations on unrelated databases do not block each other.
 
+    Writers exclude all other readers and writers. Requests are served in
+    arrival order, except that consecutive readers share the lock, so a
+    steady stream of readers cannot starve a waiting writer. A thread that
+    already holds the lock re-enters without waiting, and a thread holding
+    the write lock may also read.
 
-def GraphModifyLock(func):
-    """Lock for modification, reading operations will block."""
+    Wait time, hold time and the queue depth seen on arrival are recorded
+    per operation name, and the total wait of each thread is kept in its
+    thread local state."""
 
-    def inner(*args, **kwargs):
-        global _lock
-        global _readers
-        global _writers
+    def __init__(self):
+        self._lock = threading.Condition(threading.Lock())
+        self._local = threading.local()
+        self._readers = 0
+        self._writer = None
+        self._tickets = 0
+        self._waiting_readers = set()
+        self._waiting_writers = deque()
+        self._stats = {}
+
+    def acquire_read(self, name=None, blocking=True):
+        """Acquire the lock for reading, blocking until no writer holds or is
+        waiting ahead of this request. If blocking=False and the lock is not
+        immediately available, returns False without acquiring it."""
+        local = self._local
+        if getattr(local, "depth", 0):
+            local.depth += 1
+            return True
+
+        start = time.perf_counter()
+        with self._lock:
+            queued = len(self._waiting_readers) + len(self._waiting_writers)
+            if not blocking:
+                # checked without waiting, as for writers
+                if self._writer is not None or self._waiting_writers:
+                    return False
+            else:
+                ticket = self._tickets
+                self._tickets += 1
+                self._waiting_readers.add(ticket)
+                self._lock.wait_for(
+                    lambda: self._writer is None
+                    and not (
+                        self._waiting_writers and self._waiting_writers[0] < ticket
+                    )
+                )
+                self._waiting_readers.discard(ticket)
+            self._readers += 1
+            local.acquired = time.perf_counter()
+            local.waited = getattr(local, "waited", 0.0) + local.acquired - start
+            self._record(name, local.acquired - start, None, queued)
+
+        local.depth = 1
+        local.writing = False
+        local.name = name
+        return True
 
-        _lock.acquire()
-        _lock.wait_for(lambda: _readers == 0)
-        _writers += 1
-        _lock.release()
+    def acquire_write(self, name=None, blocking=True):
+        """Acquire the lock for writing, blocking until all readers and
+        writers ahead of this request have released it. If blocking=False
+        and the lock is not immediately available, returns False without
+        acquiring it."""
+        local = self._local
+        if getattr(local, "depth", 0):
+            if not local.writing:
+                raise RuntimeError("Cannot modify the graph while reading it.")
+            local.depth += 1
+            return True
 
-        value = None
-        exception = None
+        start = time.perf_counter()
+        with self._lock:
+            queued = len(self._waiting_readers) + len(self._waiting_writers)
+            if not blocking:
+                # checked without waiting, which would release the mutex
+                # and let other requests queue ahead meanwhile
+                if (
+                    self._writer is not None
+                    or self._readers
+                    or self._waiting_writers
+                    or self._waiting_readers
+                ):
+                    return False
+            else:
+                ticket = self._tickets
+                self._tickets += 1
+                self._waiting_writers.append(ticket)
+                self._lock.wait_for(
+                    lambda: self._writer is None
+                    and self._readers == 0
+                    and self._waiting_writers[0] == ticket
+                    and not any(t < ticket for t in self._waiting_readers)
+                )
+                self._waiting_writers.remove(ticket)
+            self._writer = threading.get_ident()
+            local.acquired = time.perf_counter()
+            local.waited = getattr(local, "waited", 0.0) + local.acquired - start
+            self._record(name, local.acquired - start, None, queued)
+
+        local.depth = 1
+        local.writing = True
+        local.name = name
+        return True
+
+    def is_held(self):
+        """Boolean whether the current thread holds the lock."""
+        return getattr(self._local, "depth", 0) > 0
+
+    def is_writing(self):
+        """Boolean whether the current thread holds the lock for writing."""
+        return getattr(self._local, "depth", 0) > 0 and self._local.writing
+
+    @contextlib.contextmanager
+    def share(self):
+        """Let the current thread read as if it held the lock, which another
+        thread must hold until the context exits. Used by the workers of
+        that thread, which could otherwise wait for the lock behind a
+        writer which is itself waiting for that thread."""
+        local = self._local
+        local.depth = 1
+        local.writing = False
+        local.name = None
+        local.acquired = time.perf_counter()
         try:
-            value = func(*args, **kwargs)
-        except Exception as e:
-            exception = e
+            yield
         finally:
-            _lock.acquire()
-            _writers -= 1
-            if not _writers:
-                _lock.notify_all()
-            _lock.release()
+            local.depth = 0
+
+    def release(self):
+        """Release one level of the lock held by the current thread."""
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return
+
+        held = time.perf_counter() - local.acquired
+        with self._lock:
+            if local.writing:
+                self._writer = None
+            else:
+                self._readers -= 1
+            self._lock.notify_all()
+            self._record(local.name, None, held, None)
+
+    def _record(self, name, wait, hold, queued):
+        if name not in self._stats:
+            self._stats[name] = {
+                "count": 0,
+                "wait": 0.0,
+                "max_wait": 0.0,
+                "hold": 0.0,
+                "max_hold": 0.0,
+                "max_queue": 0,
+            }
+        stats = self._stats[name]
+        if wait is not None:
+            stats["count"] += 1
+            stats["wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+            stats["max_queue"] = max(stats["max_queue"], queued)
+        if hold is not None:
+            stats["hold"] += hold
+            stats["max_hold"] = max(stats["max_hold"], hold)
+
+    def get_stats(self):
+        """Return a dict of operation name to a dict with the number of
+        outermost acquisitions, total and maximum wait and hold times in
+        seconds, and the maximum queue depth seen on arrival."""
+        with self._lock:
+            return {name: stats.copy() for (name, stats) in self._stats.items()}
+
+    def reset_stats(self):
+        """Discard the recorded statistics."""
+        with self._lock:
+            self._stats = {}
+
+
+# used by decorated functions not bound to a database
+_lock = GraphLock()
+
+
+def _get_lock(args):
+    """Find the lock of the database the decorated method is bound to,
+    either the database itself or a node or edge referencing it."""
+    if args:
+        owner = getattr(args[0], "_db", args[0])
+        lock = getattr(owner, "_graph_lock", None)
+        if lock is not None:
+            return lock
+    return _lock
+
+
+def _get_profiler(args, lock):
+    """Find the profiler of the database the decorated method is bound to,
+    None unless profiling is enabled. Operations called by another holding
+    the lock are part of it, so are not recorded separately."""
+    if args:
+        owner = getattr(args[0], "_db", args[0])
+        profiler = getattr(owner, "_profiler", None)
+        if profiler is not None and not lock.is_held():
+            return profiler
+    return None
+
+
+def _get_stripes(args):
+    """Find the stripe locks of the database the decorated method is bound
+    to, empty unless the database was created with lock striping."""
+    if args:
+        owner = getattr(args[0], "_db", args[0])
+        return getattr(owner, "_stripes", ())
+    return ()
+
 
-            if exception:
-                raise exception
-            return value
+def _has_callbacks(args, events):
+    """Boolean whether the database the decorated method is bound to has
+    synchronous callbacks for any of the events. They may modify any node,
+    so cannot run while only the stripes of the nodes involved are held."""
+    if args and events:
+        owner = getattr(args[0], "_db", args[0])
+        has_callbacks = getattr(owner, "_has_synchronous_callbacks", None)
+        if has_callbacks is not None:
+            return has_callbacks(*events)
+    return False
+
+
+def _acquire_stripes(stripes, indexes, write):
+    """Acquire the stripes with the provided indexes in ascending order.
+    Waiting for a stripe while holding one with a higher index could
+    deadlock, so in that case the stripe is only taken if it is immediately
+    available. Returns the acquired stripes."""
+    highest = max((i for (i, s) in enumerate(stripes) if s.is_held()), default=-1)
+    acquired = []
+    try:
+        for i in indexes:
+            acquire = stripes[i].acquire_write if write else stripes[i].acquire_read
+            if not acquire(blocking=i > highest):
+                raise RuntimeError("Cannot lock graph partitions out of order.")
+            acquired.append(stripes[i])
+    except Exception:
+        for stripe in reversed(acquired):
+            stripe.release()
+        raise
+    return acquired
+
+
+def _profiled(profiler, name, start, func, args, kwargs):
+    """Call the decorated function once its locks are acquired, recording
+    the wait since start and the time it ran."""
+    acquired = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.record_call(name, acquired - start, time.perf_counter() - acquired)
+
+
+def GraphModifyLock(func):
+    """Lock for modification, reading operations will block."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        lock = _get_lock(args)
+        profiler = _get_profiler(args, lock)
+        if profiler is not None:
+            start = time.perf_counter()
+        lock.acquire_write(name)
+        try:
+            if profiler is None:
+                return func(*args, **kwargs)
+            return _profiled(profiler, name, start, func, args, kwargs)
+        finally:
+            lock.release()
 
     return inner
 
 
-def GraphReadLock(func):
-    """Lock for reading, modification operations will block."""
+def GraphLocalModifyLock(func=None, fires=()):
+    """Lock for modifying the node or edge the decorated method is bound to,
+    and any nodes passed to it. If the database uses lock striping only the
+    stripes of those nodes are locked, so modifications of unrelated nodes
+    run concurrently. Otherwise, or while synchronous callbacks are
+    registered for the events the method fires, this is the same as
+    GraphModifyLock."""
+    if func is None:
+        return functools.partial(GraphLocalModifyLock, fires=fires)
+    name = func.__qualname__
 
+    @functools.wraps(func)
     def inner(*args, **kwargs):
-        global _lock
-        global _readers
-        global _writers
+        lock = _get_lock(args)
+        stripes = _get_stripes(args)
+        profiler = _get_profiler(args, lock)
+        if profiler is not None:
+            start = time.perf_counter()
+
+        # holding the graph-wide write lock already excludes every stripe
+        if not stripes or lock.is_writing() or _has_callbacks(args, fires):
+            lock.acquire_write(name)
+            try:
+                if profiler is None:
+                    return func(*args, **kwargs)
+                return _profiled(profiler, name, start, func, args, kwargs)
+            finally:
+                lock.release()
 
-        _lock.acquire()
-        _lock.wait_for(lambda: _writers == 0)
-        _readers += 1
-        _lock.release()
+        keys = list(args[0]._stripe_keys())
+        for arg in args[1:] + tuple(kwargs.values()):
+            if hasattr(arg, "_stripe_keys"):
+                keys.extend(arg._stripe_keys())
+        indexes = sorted({hash(key) % len(stripes) for key in keys})
 
-        value = None
-        exception = None
+        lock.acquire_read(name)
         try:
-            value = func(*args, **kwargs)
-        except Exception as e:
-            exception = e
+            acquired = _acquire_stripes(stripes, indexes, write=True)
+            try:
+                if profiler is None:
+                    return func(*args, **kwargs)
+                return _profiled(profiler, name, start, func, args, kwargs)
+            finally:
+                for stripe in reversed(acquired):
+                    stripe.release()
         finally:
+            lock.release()
+
+    return inner
 
-            _lock.acquire()
-            _readers -= 1
-            if not _readers:
-                _lock.notify_all()
-            _lock.release()
 
-            if exception:
-                raise exception
-            return value
+def GraphReadLock(func):
+    """Lock for reading, modification operations will block."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        lock = _get_lock(args)
+        stripes = _get_stripes(args)
+        profiler = _get_profiler(args, lock)
+        if profiler is not None:
+            start = time.perf_counter()
+        lock.acquire_read(name)
+        try:
+            acquired = (
+                _acquire_stripes(stripes, range(len(stripes)), write=False)
+                if stripes
+                else ()
+            )
+            try:
+                if profiler is None:
+                    return func(*args, **kwargs)
+                return _profiled(profiler, name, start, func, args, kwargs)
+            finally:
+                for stripe in reversed(acquired):
+                    stripe.release()
+        finally:
+            lock.release()
 
     return inner
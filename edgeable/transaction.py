@@ -0,0 +1,178 @@
+from edgeable.snapshot import _replace
+
+
+class GraphTransaction:
+    """Batch of modifications made while holding the write lock once.
+
+    The create and delete callbacks of nodes and edges are deferred until
+    the transaction is committed, then run in the order the modifications
+    were made. A callback returning False still cancels its event, which
+    reverts that one modification: a created node or edge is removed, a
+    deleted edge is restored, and a deleted node is restored with the edges
+    it had when it was deleted. The delete edge callbacks for the edges of
+    a deleted node cannot cancel, as the node is gone.
+
+    If the block raises an exception, every modification is rolled back
+    and no callbacks are run."""
+
+    def __init__(self, db):
+        self._db = db
+        self._saved = {}
+        self._properties = None
+        self._events = []
+        self._changes = []
+
+    def __enter__(self):
+        self._db._graph_lock.acquire_write("GraphDatabase.transaction")
+        if self._db._transaction is not None:
+            self._db._graph_lock.release()
+            raise RuntimeError("A transaction is already in progress.")
+        self._properties = self._db._properties.copy()
+        self._db._transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._db._transaction = None
+        try:
+            if exc_type is None:
+                if self._db._feed is not None:
+                    self._db._feed.append(self._changes)
+                self._commit()
+            else:
+                self._rollback()
+        finally:
+            self._db._graph_lock.release()
+
+    def _preserve(self, ids):
+        """Save the state of nodes before they are first modified."""
+        graph = self._db._graph
+        for id in ids:
+            if id not in self._saved:
+                node = graph.get(id)
+                self._saved[id] = (
+                    None
+                    if node is None
+                    else (
+                        node,
+                        node._properties.copy(),
+                        dict(node._edges),
+                        {
+                            d: edge._properties.copy()
+                            for (d, edge) in node._edges.items()
+                        },
+                    )
+                )
+
+    def _record(self, event, item):
+        """Record an event for its callbacks to be run on commit."""
+        if event == "delete_node":
+            graph = self._db._graph
+            incoming = {
+                id: graph[id]._edges[item._id]
+                for id in item._edges
+                if id in graph and item._id in graph[id]._edges
+            }
+            item = (item, dict(item._edges), incoming)
+        self._events.append((event, item))
+
+    def _commit(self):
+        db = self._db
+        graph = db._graph
+        restored = set()
+        reverted = False
+
+        for event, item in self._events:
+            if event == "delete_node":
+                node, outgoing, incoming = item
+                cancel = db._fire(event, node)
+                if cancel and node._id not in graph:
+                    db._preserve(node._id, *incoming)
+                    graph[node._id] = node
+                    node._edges = {d: e for (d, e) in outgoing.items() if d in graph}
+                    for source_id, edge in incoming.items():
+                        if source_id in graph:
+                            graph[source_id]._edges[node._id] = edge
+                    restored.update(map(id, outgoing.values()))
+                    restored.update(map(id, incoming.values()))
+                    db._log("node", node._id, node._properties)
+                    for edge in node._edges.values():
+                        edge._log()
+                    for source_id, edge in incoming.items():
+                        if source_id in graph:
+                            edge._log()
+                    reverted = True
+
+            elif event == "delete_edge":
+                if id(item) in restored:
+                    continue
+                cancel = db._fire(event, item)
+                source = graph.get(item._source_id)
+                if (
+                    cancel
+                    and source is not None
+                    and item._destination_id in graph
+                    and item._destination_id not in source._edges
+                ):
+                    db._preserve(item._source_id)
+                    source._edges[item._destination_id] = item
+                    item._log()
+                    reverted = True
+
+            elif event == "create_edge":
+                cancel = db._fire(event, item)
+                source = graph.get(item._source_id)
+                if cancel and source is not None:
+                    if source._edges.get(item._destination_id) is item:
+                        db._preserve(item._source_id)
+                        del source._edges[item._destination_id]
+                        db._log("delete_edge", item._source_id, item._destination_id)
+                        reverted = True
+
+            elif event == "create_node":
+                cancel = db._fire(event, item)
+                if cancel and graph.get(item._id) is item:
+                    self._remove(item)
+                    reverted = True
+
+        if reverted:
+            self._invalidate()
+
+    def _remove(self, node):
+        """Remove a node created in this transaction, with any edges to it.
+        Edges to it can only come from nodes modified in this transaction."""
+        db = self._db
+        graph = db._graph
+        sources = [
+            id
+            for id in self._saved
+            if id in graph and node._id in graph[id]._edges and id != node._id
+        ]
+        db._preserve(node._id, *sources)
+        for id in sources:
+            del graph[id]._edges[node._id]
+            db._log("delete_edge", id, node._id)
+        del graph[node._id]
+        db._log("delete_node", node._id)
+
+    def _rollback(self):
+        db = self._db
+        graph = db._graph
+        db._preserve(*self._saved)
+        for id, state in self._saved.items():
+            if state is None:
+                graph.pop(id, None)
+                continue
+            node, properties, edges, edge_properties = state
+            _replace(node._properties, properties)
+            node._edges = edges
+            for destination_id, edge in edges.items():
+                _replace(edge._properties, edge_properties[destination_id])
+            graph[id] = node
+        _replace(db._properties, self._properties)
+        db._invalidate_lookups()
+        self._invalidate()
+
+    def _invalidate(self):
+        self._db._components.invalidate()
+        self._db._reachability.invalidate()
+        self._db._generation += 1
@@ -0,0 +1,371 @@
+from types import MappingProxyType
+
+from edgeable import GraphNode, GraphReadLock, GraphSlowLogged
+
+
+class GraphView:
+    """Read-only view of the nodes of a database matching node_filter, and
+    the edges between them matching edge_filter. Nothing is copied: the
+    filters, called with the nodes and edges of the database, are evaluated
+    as the view is read, so it reflects later changes. With memoize their
+    results are remembered, and forgotten when the node or edge changes,
+    so filters should only depend on the node or edge they are passed."""
+
+    def __init__(self, db, node_filter=None, edge_filter=None, memoize=False):
+        if node_filter is not None and not callable(node_filter):
+            raise RuntimeError("Filter must be callable.")
+        if edge_filter is not None and not callable(edge_filter):
+            raise RuntimeError("Filter must be callable.")
+        self._db = db
+        self._node_filter = node_filter
+        self._edge_filter = edge_filter
+        self._memoize = memoize
+        self._node_memo = {}
+        self._edge_memo = {}
+
+    def _accepts_node(self, node):
+        if self._node_filter is None:
+            return True
+        if not self._memoize:
+            return bool(self._node_filter(node))
+        accepted = self._node_memo.get(node._id)
+        if accepted is None:
+            accepted = self._node_memo[node._id] = bool(self._node_filter(node))
+        return accepted
+
+    def _accepts_edge(self, edge):
+        """Boolean whether the edge matches the edge filter, regardless of
+        whether its nodes are in the view."""
+        if self._edge_filter is None:
+            return True
+        if not self._memoize:
+            return bool(self._edge_filter(edge))
+        key = (edge._source_id, edge._destination_id)
+        accepted = self._edge_memo.get(key)
+        if accepted is None:
+            accepted = self._edge_memo[key] = bool(self._edge_filter(edge))
+        return accepted
+
+    def _contains_edge(self, edge):
+        """Boolean whether the edge, from a node in the view, is in the view."""
+        destination = self._db._graph.get(edge._destination_id)
+        return (
+            destination is not None
+            and self._accepts_node(destination)
+            and self._accepts_edge(edge)
+        )
+
+    def _forget(self, op, args):
+        """Forget the memoized filter results for a change."""
+        if op == "node" or op == "delete_node":
+            self._node_memo.pop(args[0], None)
+        elif op == "edge" or op == "delete_edge":
+            self._edge_memo.pop((args[0], args[1]), None)
+        elif op == "reset":
+            self.clear()
+
+    def clear(self):
+        """Forget all memoized filter results."""
+        self._node_memo = {}
+        self._edge_memo = {}
+
+    def _nodes(self, *filters):
+        """Return the nodes of the database which may be in the view, only
+        those found in a property index if a filter allows it."""
+        found = self._db._lookup(self._node_filter, *filters)
+        if found is None:
+            return self._db._graph.values()
+        graph = self._db._graph
+        return [graph[id] for id in found[1]]
+
+    def get_node(self, id):
+        """Get the node with the provided id, or None if it is not in the view."""
+        node = self._db._graph.get(id)
+        if node is None or not self._accepts_node(node):
+            return None
+        return GraphViewNode(self, node)
+
+    def has_node(self, id):
+        """Boolean indicating if the node is in the view."""
+        node = self._db._graph.get(id)
+        return node is not None and self._accepts_node(node)
+
+    @GraphSlowLogged
+    @GraphReadLock
+    def get_nodes(self, filter_fn=lambda node: True):
+        """Return all nodes, or nodes which match the optional filter function."""
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        candidates = self._nodes(filter_fn)
+        self._db._traversed("get_nodes", len(candidates))
+        nodes = (
+            GraphViewNode(self, node) for node in candidates if self._accepts_node(node)
+        )
+        return [node for node in nodes if filter_fn(node)]
+
+    @GraphSlowLogged
+    @GraphReadLock
+    def get_edges(
+        self, edge_filter_fn=lambda edge: True, node_filter_fn=lambda node: True
+    ):
+        """Return all edges, or edges which match the optional filter function."""
+        if not callable(edge_filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        return [
+            edge
+            for node in self.get_nodes(node_filter_fn)
+            for edge in node.get_edges(edge_filter_fn)
+        ]
+
+    @GraphReadLock
+    def get_node_count(self):
+        """Return the number of nodes."""
+        return sum(1 for node in self._nodes() if self._accepts_node(node))
+
+    @GraphReadLock
+    def get_edge_count(self):
+        """Return the number of edges."""
+        return sum(
+            1
+            for node in self._nodes()
+            if self._accepts_node(node)
+            for edge in node._edges.values()
+            if self._contains_edge(edge)
+        )
+
+    def get_property(self, key):
+        """Get the property value of the database."""
+        return self._db.get_property(key)
+
+    def get_properties(self):
+        """Get a dict containing all properties and values of the database."""
+        return self._db.get_properties()
+
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values of the database,
+        which is not copied, and reflects later changes."""
+        return self._db.get_properties_view()
+
+    def has_property(self, key):
+        """Boolean value indicating if the property of the database is defined."""
+        return self._db.has_property(key)
+
+
+class GraphViewNode:
+    """Read-only node within a view, whose edges are those in the view."""
+
+    # the route searches only use the read interface shared with GraphNode
+    _find_route_to = GraphNode._find_route_to
+    _find_routes_to = GraphNode._find_routes_to
+    _find_neighbors = GraphNode._find_neighbors
+    walk_levels = GraphNode.walk_levels
+
+    def __init__(self, view, node):
+        self._view = view
+        self._db = view._db
+        self._node = node
+        self._id = node._id
+        self._properties = node._properties
+
+    def _traversed(self, name, visits):
+        self._db._traversed(name, visits)
+
+    def __eq__(self, other):
+        if isinstance(other, GraphViewNode):
+            return self._id == other._id
+        return False
+
+    def __str__(self):
+        return self.get_id()
+
+    def __repr__(self):
+        return self.get_id()
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def get_id(self):
+        return self._id
+
+    def get_property(self, key):
+        """Get the property value."""
+        return self._node.get_property(key)
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._node.get_properties()
+
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values, which is not
+        copied, and reflects later changes."""
+        return MappingProxyType(self._properties)
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self._node.has_property(key)
+
+    def get_edges(self, filter_fn=lambda edge: True):
+        """Return all edges, or edges which match the optional filter function."""
+        if not callable(filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        if self._id not in self._db._graph:
+            raise RuntimeError("Node does not existing in graph")
+        edges = (
+            GraphViewEdge(self._view, edge)
+            for edge in self._node._edges.values()
+            if self._view._contains_edge(edge)
+        )
+        return [edge for edge in edges if filter_fn(edge)]
+
+    def get_edge(self, destination):
+        """Return the edge to the specified destination node, or None if one
+        does not exist in the view."""
+        if type(destination) is not GraphViewNode:
+            raise RuntimeError("Destination must be an instance of GraphViewNode.")
+        edge = self._node._edges.get(destination.get_id())
+        if edge is None or not self._view._contains_edge(edge):
+            return None
+        return GraphViewEdge(self._view, edge)
+
+    def has_edge(self, destination):
+        """Boolean whether an edge exists in the view to the specified
+        destination node."""
+        return self.get_edge(destination) is not None
+
+    @GraphSlowLogged
+    @GraphReadLock
+    def find_routes_to(self, destination, effort=5):
+        """Find multiple routes to the destination node, as find_route_to.
+        The number returned depends on the effort to find them."""
+        if type(destination) is not GraphViewNode:
+            raise RuntimeError("Destination must be an instance of GraphViewNode.")
+        return self._find_routes_to(destination, effort)
+
+    @GraphSlowLogged
+    @GraphReadLock
+    def find_route_to(self, destination, skip=[]):
+        """Find a route across the view from the current node to the
+        destination node, returned as an array of nodes. If no route
+        exists, returns None."""
+        if type(destination) is not GraphViewNode:
+            raise RuntimeError("Destination must be an instance of GraphViewNode.")
+        return self._find_route_to(destination, skip)
+
+    @GraphSlowLogged
+    @GraphReadLock
+    def find_neighbors(self, distance=1, distance_fn=lambda edge: 1):
+        """Find all neighbors the specified distance away."""
+        return self._find_neighbors(distance, distance_fn)
+
+    def bfs(
+        self,
+        edge_filter_fn=lambda edge: True,
+        node_filter_fn=lambda node: True,
+        max_depth=None,
+        max_visits=None,
+        chunk_size=256,
+    ):
+        """Lazily traverse the view breadth first from this node, as
+        GraphNode.bfs, yielding (node, depth, via_edge) tuples."""
+        return self._traverse(
+            False, edge_filter_fn, node_filter_fn, max_depth, max_visits, chunk_size
+        )
+
+    def dfs(
+        self,
+        edge_filter_fn=lambda edge: True,
+        node_filter_fn=lambda node: True,
+        max_depth=None,
+        max_visits=None,
+        chunk_size=256,
+    ):
+        """Lazily traverse the view depth first from this node, as
+        GraphNode.dfs, yielding (node, depth, via_edge) tuples."""
+        return self._traverse(
+            True, edge_filter_fn, node_filter_fn, max_depth, max_visits, chunk_size
+        )
+
+    def _traverse(
+        self,
+        depth_first,
+        edge_filter_fn,
+        node_filter_fn,
+        max_depth,
+        max_visits,
+        chunk_size,
+    ):
+        if not callable(edge_filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        if not callable(node_filter_fn):
+            raise RuntimeError("Filter must be callable.")
+        view = self._view
+
+        # the traversal of the database follows the edges of the view
+        steps = self._node._traverse(
+            depth_first,
+            lambda edge: view._accepts_edge(edge)
+            and edge_filter_fn(GraphViewEdge(view, edge)),
+            lambda node: view._accepts_node(node)
+            and node_filter_fn(GraphViewNode(view, node)),
+            max_depth,
+            max_visits,
+            chunk_size,
+        )
+        return (
+            (
+                GraphViewNode(view, node),
+                depth,
+                GraphViewEdge(view, edge) if edge is not None else None,
+            )
+            for (node, depth, edge) in steps
+        )
+
+
+class GraphViewEdge:
+    """Read-only edge within a view."""
+
+    def __init__(self, view, edge):
+        self._view = view
+        self._edge = edge
+        self._source_id = edge._source_id
+        self._destination_id = edge._destination_id
+        self._properties = edge._properties
+
+    def __eq__(self, other):
+        if isinstance(other, GraphViewEdge):
+            return (
+                self._source_id == other._source_id
+                and self._destination_id == other._destination_id
+            )
+        return False
+
+    def __str__(self):
+        return self._source_id + "->" + self._destination_id
+
+    def __repr__(self):
+        return self._source_id + "->" + self._destination_id
+
+    def get_destination(self):
+        """Get the node which is the destination of this edge."""
+        return self._view.get_node(self._destination_id)
+
+    def get_source(self):
+        """Get the node which is the source of this edge."""
+        return self._view.get_node(self._source_id)
+
+    def get_property(self, key):
+        """Get the property value."""
+        return self._edge.get_property(key)
+
+    def get_properties(self):
+        """Get a dict containing all properties and values."""
+        return self._edge.get_properties()
+
+    def get_properties_view(self):
+        """Get a read-only view of all properties and values, which is not
+        copied, and reflects later changes."""
+        return MappingProxyType(self._properties)
+
+    def has_property(self, key):
+        """Boolean value indicating if the property is defined."""
+        return self._edge.has_property(key)
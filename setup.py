@@ -28,4 +28,5 @@ setup(
     packages=["edgeable"],
     include_package_data=True,
     install_requires=["pytest"],
+    extras_require={"analytics": ["numpy"]},
 )
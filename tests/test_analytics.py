@@ -0,0 +1,113 @@
+import unittest
+from edgeable import GraphDatabase
+
+try:
+    from edgeable import GraphAnalytics
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.analytics = GraphAnalytics(self.db)
+
+    def star(self):
+        center = self.db.put_node("center")
+        for id in ["A", "B", "C", "D"]:
+            center.attach(self.db.put_node(id))
+        return center
+
+    def test_empty(self):
+        self.assertEqual(self.analytics.pagerank(), {})
+        self.assertEqual(self.analytics.eigenvector_centrality(), {})
+        self.assertEqual(self.analytics.betweenness_centrality(), {})
+
+    def test_degree_centrality(self):
+        self.star()
+        scores = self.analytics.degree_centrality()
+        self.assertAlmostEqual(scores["center"], 1.0)
+        self.assertAlmostEqual(scores["A"], 0.25)
+
+    def test_pagerank(self):
+        self.star()
+        scores = self.analytics.pagerank()
+        self.assertAlmostEqual(sum(scores.values()), 1.0)
+        self.assertGreater(scores["center"], scores["A"])
+        self.assertAlmostEqual(scores["A"], scores["D"])
+
+    def test_pagerank_dangling(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B, directed=True)
+        scores = self.analytics.pagerank()
+        self.assertAlmostEqual(sum(scores.values()), 1.0)
+        self.assertGreater(scores["B"], scores["A"])
+
+    def test_deleted_destination(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B, directed=True)
+        B.delete()
+
+        self.assertEqual(self.analytics.pagerank(), {"A": 1.0})
+        self.assertEqual(self.analytics.degree_centrality(), {"A": 0.0})
+
+    def test_eigenvector_centrality(self):
+        self.star()
+        scores = self.analytics.eigenvector_centrality()
+        self.assertGreater(scores["center"], scores["A"])
+
+    def test_betweenness_centrality(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B)
+        B.attach(C)
+        scores = self.analytics.betweenness_centrality(normalized=False)
+        self.assertEqual(scores, {"A": 0.0, "B": 2.0, "C": 0.0})
+
+    def test_betweenness_centrality_multiple_paths(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        D = self.db.put_node("D")
+        A.attach(B)
+        A.attach(C)
+        D.attach(B)
+        D.attach(C)
+        scores = self.analytics.betweenness_centrality(normalized=False)
+        self.assertAlmostEqual(scores["B"], 1.0)
+        self.assertAlmostEqual(scores["C"], 1.0)
+        self.assertAlmostEqual(scores["A"], 1.0)
+
+    def test_betweenness_centrality_sampled(self):
+        self.star()
+        scores = self.analytics.betweenness_centrality(samples=2, seed=1)
+        self.assertGreater(scores["center"], 0.0)
+        self.assertEqual(scores["A"], 0.0)
+
+    def test_property_key(self):
+        self.star()
+        self.analytics.degree_centrality(property_key="degree")
+        self.assertAlmostEqual(self.db.get_node("center").get_property("degree"), 1.0)
+
+    def test_cache_kept_on_property_changes(self):
+        center = self.star()
+        self.analytics.degree_centrality(property_key="degree")
+        sources = self.analytics._sources
+
+        center.set_property("key", "value")
+        center.get_edges()[0].set_property("weight", 2)
+        self.analytics.degree_centrality(property_key="degree")
+        self.assertIs(self.analytics._sources, sources)
+
+    def test_cache_expires(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        self.assertEqual(self.analytics.degree_centrality()["A"], 0.0)
+
+        A.attach(B)
+        self.assertEqual(self.analytics.degree_centrality()["A"], 1.0)
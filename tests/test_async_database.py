@@ -0,0 +1,171 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from edgeable import AsyncGraphDatabase, GraphDatabase
+
+
+def run(coroutine):
+    # asyncio.run needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.adb = AsyncGraphDatabase(self.db, chunk_size=2)
+
+    def test_put_and_get(self):
+        async def main():
+            A = await self.adb.put_node("A", {"key": "value"})
+            B = await self.adb.put_node("B")
+            await self.adb.attach(A, B)
+            self.assertEqual(await self.adb.get_node("A"), A)
+            self.assertTrue(await self.adb.has_node("B"))
+            self.assertEqual(await self.adb.find_route_to(A, B), [A, B])
+            self.assertEqual(await self.adb.find_neighbors(A), [B])
+            self.assertEqual(len(await self.adb.get_edges()), 2)
+            await self.adb.detach(A, B)
+            await self.adb.delete_node(B)
+            self.assertEqual(await self.adb.get_nodes(), [A])
+
+        run(main())
+
+    def test_iter_nodes(self):
+        for i in range(5):
+            self.db.put_node(i, {"even": i % 2 == 0})
+
+        async def main():
+            return [
+                node.get_id()
+                async for node in self.adb.iter_nodes(
+                    lambda node: node.get_property("even")
+                )
+            ]
+
+        self.assertEqual(run(main()), [0, 2, 4])
+
+    def test_iter_nodes_yields_to_writers(self):
+        for i in range(6):
+            self.db.put_node(i)
+
+        async def main():
+            ids = []
+            async for node in self.adb.iter_nodes():
+                ids.append(node.get_id())
+                if node.get_id() == 1:
+                    await self.adb.put_node(6)
+                    self.db.get_node(4).delete()
+            return ids
+
+        self.assertEqual(run(main()), [0, 1, 2, 3, 5])
+
+    def test_traversal(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B)
+        B.attach(C)
+
+        async def main():
+            bfs = [step[0] async for step in self.adb.bfs(A)]
+            dfs = [step[0] async for step in self.adb.dfs(A, max_depth=1)]
+            return bfs, dfs
+
+        self.assertEqual(run(main()), ([A, B, C], [A, B]))
+
+    def test_loop_not_blocked_by_lock(self):
+        ticks = []
+
+        async def tick():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            acquired = threading.Event()
+
+            def hold():
+                self.db._graph_lock.acquire_write()
+                acquired.set()
+                time.sleep(0.1)
+                self.db._graph_lock.release()
+
+            threading.Thread(target=hold).start()
+            acquired.wait()
+            await asyncio.gather(self.adb.put_node("A"), tick())
+
+        run(main())
+        self.assertTrue(self.db.has_node("A"))
+        self.assertLess(ticks[-1] - ticks[0], 0.09)
+
+    def test_transaction(self):
+        async def main():
+            async with self.adb.transaction() as tx:
+                A = await tx.put_node("A")
+                B = await tx.put_node("B")
+                await tx.attach(A, B)
+                await tx.run(A.set_property, "key", "value")
+
+            with self.assertRaises(ValueError):
+                async with self.adb.transaction() as tx:
+                    await tx.put_node("C")
+                    raise ValueError()
+
+        run(main())
+        self.assertEqual(sorted(self.db._graph), ["A", "B"])
+        self.assertEqual(self.db.get_node("A").get_property("key"), "value")
+        self.assertFalse(self.db._graph_lock.is_held())
+
+    def test_transaction_excludes_writers(self):
+        order = []
+
+        async def main():
+            async with self.adb.transaction() as tx:
+                writer = asyncio.ensure_future(self.adb.put_node("B"))
+                await asyncio.sleep(0.05)
+                self.assertFalse(self.db.has_node("B"))
+                await tx.put_node("A")
+                order.append("transaction")
+            await writer
+            order.append("writer")
+
+        run(main())
+        self.assertEqual(order, ["transaction", "writer"])
+        self.assertEqual(list(self.db._graph), ["A", "B"])
+
+    def test_save_and_open(self):
+        filename = os.path.join(tempfile.mkdtemp(), "graph.db")
+
+        async def main():
+            async with await AsyncGraphDatabase.open(filename) as adb:
+                await adb.put_node("A")
+            adb = await AsyncGraphDatabase.open(filename)
+            await adb.put_node("B")
+            await adb.reload()
+            return adb
+
+        adb = run(main())
+        self.assertEqual(list(adb.db._graph), ["A"])
+
+    def test_snapshot(self):
+        self.db.put_node("A")
+
+        async def main():
+            with await self.adb.snapshot() as snapshot:
+                await self.adb.put_node("B")
+                return snapshot.get_node_count()
+
+        self.assertEqual(run(main()), 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            AsyncGraphDatabase({})
+        with self.assertRaises(RuntimeError):
+            AsyncGraphDatabase(chunk_size=0)
@@ -0,0 +1,114 @@
+import unittest
+from edgeable import GraphDatabase
+
+
+class TestDatabaseCache(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase(cache_size=16)
+
+        self.A = self.db.put_node("A")
+        self.B = self.db.put_node("B")
+        self.C = self.db.put_node("C")
+        self.A.attach(self.B)
+        self.B.attach(self.C)
+
+    def test_disabled_by_default(self):
+        db = GraphDatabase()
+        A = db.put_node("A")
+        A.find_neighbors()
+
+        self.assertEqual(
+            db.get_cache_stats(), {"hits": 0, "misses": 0, "size": 0, "max_size": 0}
+        )
+
+    def test_invalid_cache_size(self):
+        with self.assertRaises(RuntimeError):
+            GraphDatabase(cache_size=-1)
+
+    def test_route_hit(self):
+        self.assertEqual(self.A.find_route_to(self.C), [self.A, self.B, self.C])
+        self.assertEqual(self.A.find_route_to(self.C), [self.A, self.B, self.C])
+
+        stats = self.db.get_cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_routes_hit(self):
+        self.assertEqual(self.A.find_routes_to(self.C), [[self.A, self.B, self.C]])
+        self.assertEqual(self.A.find_routes_to(self.C), [[self.A, self.B, self.C]])
+
+        self.assertEqual(self.db.get_cache_stats()["hits"], 1)
+
+    def test_neighbors_hit(self):
+        self.assertEqual(self.A.find_neighbors(distance=2), [self.B, self.C])
+        self.assertEqual(self.A.find_neighbors(distance=2), [self.B, self.C])
+        self.assertEqual(self.A.find_neighbors(distance=1), [self.B])
+
+        stats = self.db.get_cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_result_is_a_copy(self):
+        self.A.find_route_to(self.C).append(self.A)
+
+        self.assertEqual(self.A.find_route_to(self.C), [self.A, self.B, self.C])
+
+    def test_invalidated_by_attach(self):
+        self.assertEqual(self.A.find_route_to(self.C), [self.A, self.B, self.C])
+        self.A.attach(self.C)
+
+        self.assertEqual(self.A.find_route_to(self.C), [self.A, self.C])
+
+    def test_invalidated_by_detach(self):
+        self.assertEqual(self.A.find_neighbors(distance=2), [self.B, self.C])
+        self.B.detach(self.C)
+
+        self.assertEqual(self.A.find_neighbors(distance=2), [self.B])
+
+    def test_invalidated_by_delete(self):
+        self.assertEqual(self.A.find_route_to(self.C), [self.A, self.B, self.C])
+        self.B.delete()
+
+        self.assertIsNone(self.A.find_route_to(self.C))
+
+    def test_invalidated_by_edge_property(self):
+        fn = lambda edge: edge.get_property("distance") or 1
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B, self.C])
+        self.B.get_edge(self.C).set_property("distance", 5)
+
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B])
+
+    def test_invalidated_by_node_property(self):
+        fn = lambda edge: edge.get_destination().get_property("distance") or 1
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B, self.C])
+        self.C.set_property("distance", 5)
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B])
+        self.C.delete_property("distance")
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B, self.C])
+        self.C.set_properties({"distance": 5})
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B])
+        self.db.put_node("C", {"distance": 1})
+
+        self.assertEqual(self.A.find_neighbors(2, fn), [self.B, self.C])
+
+    def test_lru_eviction(self):
+        db = GraphDatabase(cache_size=2)
+        A = db.put_node("A")
+        A.find_neighbors(distance=1)
+        A.find_neighbors(distance=2)
+        A.find_neighbors(distance=1)
+        A.find_neighbors(distance=3)
+        A.find_neighbors(distance=1)
+
+        stats = db.get_cache_stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_clear_cache(self):
+        self.A.find_route_to(self.C)
+        self.db.clear_cache()
+
+        self.assertEqual(
+            self.db.get_cache_stats(),
+            {"hits": 0, "misses": 0, "size": 0, "max_size": 16},
+        )
@@ -0,0 +1,114 @@
+import unittest
+import os
+from edgeable import GraphDatabase
+
+
+class TestDatabaseComponents(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+
+    def test_is_connected_to(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        D = self.db.put_node("D")
+        A.attach(B)
+        B.attach(C)
+
+        self.assertTrue(A.is_connected_to(C))
+        self.assertTrue(C.is_connected_to(A))
+        self.assertFalse(A.is_connected_to(D))
+        self.assertTrue(D.is_connected_to(D))
+
+    def test_is_connected_to_after_attach(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        self.assertFalse(A.is_connected_to(B))
+
+        A.attach(B)
+        self.assertTrue(A.is_connected_to(B))
+
+    def test_is_connected_to_directed(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        B.attach(A, directed=True)
+
+        self.assertTrue(A.is_connected_to(B))
+
+    def test_is_connected_to_after_detach(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B)
+        B.attach(C)
+        self.assertTrue(A.is_connected_to(C))
+
+        B.detach(C)
+        self.assertTrue(A.is_connected_to(B))
+        self.assertFalse(A.is_connected_to(C))
+
+    def test_is_connected_to_after_delete(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B)
+        B.attach(C)
+
+        B.delete()
+        self.assertFalse(A.is_connected_to(C))
+
+    def test_component_of(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B)
+
+        self.assertEqual(sorted(self.db.component_of(A), key=str), [A, B])
+        self.assertEqual(self.db.component_of(C), [C])
+
+    def test_components(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        D = self.db.put_node("D")
+        A.attach(B)
+        C.attach(D)
+        D.delete()
+
+        components = sorted(
+            [sorted(component, key=str) for component in self.db.components()],
+            key=len,
+        )
+        self.assertEqual(components, [[C], [A, B]])
+
+    def test_deleted_destination(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        X = self.db.put_node("X")
+        A.attach(X, directed=True)
+        B.attach(X, directed=True)
+        X.delete()
+
+        # the directed edges to X remain, but do not connect A and B
+        self.assertFalse(A.is_connected_to(B))
+        components = sorted(
+            [sorted(component, key=str) for component in self.db.components()],
+            key=str,
+        )
+        self.assertEqual(components, [[A], [B]])
+
+    def test_components_after_reload(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        self.db.save()
+        self.db.reload()
+
+        A = self.db.get_node("A")
+        B = self.db.get_node("B")
+        C = self.db.put_node("C")
+        self.assertFalse(A.is_connected_to(B))
+        A.attach(B)
+        B.attach(C)
+        self.assertTrue(A.is_connected_to(C))
+
+        os.remove("graph.db")
@@ -0,0 +1,248 @@
+import asyncio
+import threading
+import time
+import unittest
+from edgeable import GraphDatabase, GraphDispatcher
+
+
+class TestDatabaseDispatch(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+
+    def test_create_node_callback(self):
+        created = []
+        self.db.on_create_node(
+            lambda node: created.append(node.get_id()), asynchronous=True
+        )
+
+        for id in "ABC":
+            self.db.put_node(id)
+
+        self.assertTrue(self.db.flush_events(1))
+        self.assertEqual(created, ["A", "B", "C"])
+
+    def test_delivered_on_worker(self):
+        threads = []
+        self.db.on_create_edge(
+            lambda edge: threads.append(threading.current_thread()), asynchronous=True
+        )
+
+        A = self.db.put_node("A")
+        A.attach(self.db.put_node("B"))
+
+        self.db.flush_events(1)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_callback_reads_database(self):
+        counts = []
+        self.db.on_create_node(
+            lambda node: counts.append(len(self.db.get_nodes())), asynchronous=True
+        )
+
+        self.db.put_node("A")
+
+        self.db.flush_events(1)
+        self.assertEqual(counts, [1])
+
+    def test_cannot_cancel(self):
+        self.db.on_create_node(lambda node: False, asynchronous=True)
+
+        self.db.put_node("A")
+
+        self.db.flush_events(1)
+        self.assertTrue(self.db.has_node("A"))
+
+    def test_not_called_when_cancelled(self):
+        created = []
+        self.db.on_create_node(lambda node: node.get_id() != "B")
+        self.db.on_create_node(
+            lambda node: created.append(node.get_id()), asynchronous=True
+        )
+
+        self.db.put_node("A")
+        self.db.put_node("B")
+
+        self.db.flush_events(1)
+        self.assertEqual(created, ["A"])
+
+    def test_change_and_remove_callback(self):
+        created = []
+        id = self.db.on_create_node(lambda node: False)
+        self.db.on_create_node(
+            lambda node: created.append(node.get_id()), id, asynchronous=True
+        )
+
+        self.db.put_node("A")
+        self.db.on_create_node(None, id)
+        self.db.put_node("B")
+
+        self.db.flush_events(1)
+        self.assertTrue(self.db.has_node("A"))
+        self.assertEqual(created, ["A"])
+
+    def test_callback_error(self):
+        created = []
+        self.db.on_create_node(lambda node: 1 / 0, asynchronous=True)
+        self.db.on_create_node(
+            lambda node: created.append(node.get_id()), asynchronous=True
+        )
+
+        with self.assertLogs("edgeable", "ERROR"):
+            self.db.put_node("A")
+            self.db.flush_events(1)
+
+        self.assertEqual(created, ["A"])
+        self.assertEqual(self.db.get_dispatch_stats()["errors"], 1)
+
+    def test_backpressure(self):
+        release = threading.Event()
+        callers = []
+
+        def slow(node):
+            callers.append(threading.current_thread())
+            release.wait(1)
+
+        self.db.set_dispatcher(GraphDispatcher(max_queue=2, batch_size=1))
+        self.db.on_create_node(slow, asynchronous=True)
+
+        for i in range(5):
+            self.db.put_node(i)
+            if i == 0:
+                time.sleep(0.1)
+        release.set()
+
+        self.db.flush_events(1)
+        stats = self.db.get_dispatch_stats()
+        self.assertEqual(len(callers), 5)
+        self.assertIn(threading.current_thread(), callers)
+        self.assertGreater(stats["overflowed"], 0)
+        self.assertLessEqual(stats["max_depth"], 2)
+
+    def test_coalesce(self):
+        release = threading.Event()
+        events = []
+
+        self.db.set_dispatcher(GraphDispatcher(coalesce=True))
+        self.db.on_create_node(lambda node: release.wait(1), asynchronous=True)
+        self.db.on_create_node(
+            lambda node: events.append(("create", node.get_id())), asynchronous=True
+        )
+        self.db.on_delete_node(
+            lambda node: events.append(("delete", node.get_id())), asynchronous=True
+        )
+
+        self.db.put_node("first")
+        time.sleep(0.1)
+        A = self.db.put_node("A")
+        A.delete()
+        self.db.put_node("A")
+        B = self.db.put_node("B")
+        B.delete()
+        release.set()
+
+        self.db.flush_events(1)
+        self.assertEqual(
+            events, [("create", "first"), ("create", "A"), ("delete", "B")]
+        )
+        self.assertEqual(self.db.get_dispatch_stats()["coalesced"], 3)
+
+    def test_shared_dispatcher(self):
+        created = []
+        dispatcher = GraphDispatcher(workers=2)
+        other = GraphDatabase()
+        for db in (self.db, other):
+            db.set_dispatcher(dispatcher)
+            db.on_create_node(lambda node: created.append(node), asynchronous=True)
+
+        self.db.put_node("A")
+        other.put_node("A")
+
+        dispatcher.flush(1)
+        self.assertEqual(len(created), 2)
+        self.assertEqual(dispatcher.get_stats()["delivered"], 2)
+
+    def test_transaction(self):
+        created = []
+        self.db.on_create_node(
+            lambda node: created.append(node.get_id()), asynchronous=True
+        )
+
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.put_node("A")
+                raise ValueError()
+        with self.db.transaction():
+            self.db.put_node("B")
+            self.db.flush_events(1)
+            self.assertEqual(created, [])
+
+        self.db.flush_events(1)
+        self.assertEqual(created, ["B"])
+
+    def test_asyncio_loop(self):
+        created = []
+
+        async def callback(node):
+            await asyncio.sleep(0)
+            created.append(node.get_id())
+
+        async def main():
+            self.db.set_dispatcher(GraphDispatcher(loop=asyncio.get_event_loop()))
+            self.db.on_create_node(callback, asynchronous=True)
+            self.db.put_node("A")
+            self.db.put_node("B")
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+        self.assertEqual(created, ["A", "B"])
+
+    def test_close(self):
+        dispatcher = GraphDispatcher()
+        self.db.set_dispatcher(dispatcher)
+        created = []
+        self.db.on_create_node(lambda node: created.append(node), asynchronous=True)
+
+        self.db.put_node("A")
+        dispatcher.close(1)
+
+        self.assertEqual(len(created), 1)
+        with self.assertRaises(RuntimeError):
+            self.db.put_node("B")
+
+    def test_idle_workers_stop(self):
+        dispatcher = GraphDispatcher(idle_timeout=0.05)
+        self.db.set_dispatcher(dispatcher)
+        threads = []
+        self.db.on_create_node(
+            lambda node: threads.append(threading.current_thread()), asynchronous=True
+        )
+
+        self.db.put_node("A")
+        self.assertTrue(self.db.flush_events(1))
+        thread = threads[0]
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(dispatcher._threads, [])
+
+        # the next event starts a new worker
+        self.db.put_node("B")
+        self.assertTrue(self.db.flush_events(1))
+        self.assertEqual(len(threads), 2)
+        dispatcher.close(1)
+        self.assertEqual(dispatcher._threads, [])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            GraphDispatcher(max_queue=0)
+        with self.assertRaises(RuntimeError):
+            GraphDispatcher(workers="1")
+        with self.assertRaises(RuntimeError):
+            GraphDispatcher(idle_timeout=0)
+        with self.assertRaises(RuntimeError):
+            self.db.set_dispatcher(None)
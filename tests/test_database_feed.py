@@ -0,0 +1,186 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from edgeable import GraphDatabase, GraphReplica
+
+
+class TestDatabaseFeed(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase(feed_size=100)
+
+    def assertReplicated(self, replica):
+        self.assertEqual(replica._graph.keys(), self.db._graph.keys())
+        for id, node in self.db._graph.items():
+            self.assertEqual(replica._graph[id]._properties, node._properties)
+            self.assertEqual(
+                {d: e._properties for (d, e) in replica._graph[id]._edges.items()},
+                {d: e._properties for (d, e) in node._edges.items()},
+            )
+        self.assertEqual(replica.get_properties(), self.db.get_properties())
+
+    def modify(self):
+        A = self.db.put_node("A", {"key": "value"})
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B, {"weight": 1})
+        C.attach(A, directed=True)
+        A.get_edge(B).set_property("weight", 2)
+        B.set_property("key", "value")
+        A.delete_property("key")
+        self.db.set_property("name", "graph")
+        C.delete()
+
+    def test_changes(self):
+        A = self.db.put_node("A", {"key": "value"})
+        B = self.db.put_node("B")
+        A.attach(B, directed=True)
+        A.detach(B)
+        A.set_property("key", "changed")
+        B.delete()
+
+        self.assertEqual(
+            list(self.db.changes(timeout=0)),
+            [
+                (1, "node", "A", {"key": "value"}),
+                (2, "node", "B", {}),
+                (3, "edge", "A", "B", {}),
+                (4, "delete_edge", "A", "B"),
+                (5, "node", "A", {"key": "changed"}),
+                (6, "delete_node", "B"),
+            ],
+        )
+        self.assertEqual(self.db.get_change_sequence(), 6)
+
+    def test_resume(self):
+        for id in range(5):
+            self.db.put_node(id)
+
+        changes = self.db.changes(since=3, timeout=0)
+        self.assertEqual([change[0] for change in changes], [4, 5])
+
+    def test_not_retained(self):
+        db = GraphDatabase(feed_size=2)
+        for id in range(5):
+            db.put_node(id)
+
+        self.assertEqual(len(list(db.changes(since=3, timeout=0))), 2)
+        with self.assertRaises(RuntimeError):
+            list(db.changes(since=1, timeout=0))
+
+    def test_changes_wait(self):
+        changes = self.db.changes()
+        threading.Timer(0.05, lambda: self.db.put_node("A")).start()
+
+        self.assertEqual(next(changes), (1, "node", "A", {}))
+
+    def test_changes_not_enabled(self):
+        db = GraphDatabase()
+        with self.assertRaises(RuntimeError):
+            list(db.changes())
+        with self.assertRaises(RuntimeError):
+            db.checkpoint()
+
+    def test_transaction(self):
+        self.db.on_create_node(lambda node: node.get_id() != "B")
+
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.put_node("X")
+                raise ValueError()
+        with self.db.transaction():
+            A = self.db.put_node("A")
+            A.attach(self.db.put_node("B"))
+
+        replica = GraphDatabase()
+        replica._apply_changes(list(self.db.changes(timeout=0)))
+        self.assertReplicated(replica)
+        self.assertEqual(list(replica._graph), ["A"])
+
+    def test_checkpoint(self):
+        self.modify()
+        sequence, changes = self.db.checkpoint()
+
+        replica = GraphDatabase()
+        replica.put_node("stale")
+        replica._apply_changes([(sequence,) + change for change in changes])
+
+        self.assertEqual(sequence, self.db.get_change_sequence())
+        self.assertReplicated(replica)
+
+    def test_replica(self):
+        self.db.put_node("before")
+        replica = GraphDatabase()
+        sync = GraphReplica(replica, self.db)
+
+        self.modify()
+        self.assertTrue(sync.wait_for(self.db.get_change_sequence(), 1))
+        sync.close()
+
+        self.assertReplicated(replica)
+        self.assertTrue(replica.get_node("A").is_connected_to(replica.get_node("B")))
+
+    def test_replica_resume(self):
+        replica = GraphDatabase()
+        sync = GraphReplica(replica, self.db)
+        self.db.put_node("A")
+        sync.wait_for(1, 1)
+        sync.close()
+
+        self.db.put_node("B")
+        sync = GraphReplica(replica, self.db, since=sync.get_cursor())
+        sync.wait_for(2, 1)
+        sync.close()
+
+        self.assertReplicated(replica)
+
+    def test_replica_pipe(self):
+        self.modify()
+        stream = io.BytesIO()
+        self.db.write_changes(stream, timeout=0)
+        stream.seek(0)
+
+        replica = GraphDatabase()
+        GraphReplica(replica, stream)._thread.join(1)
+
+        self.assertReplicated(replica)
+
+    def test_replica_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), "feed.sock")
+        server = self.db.serve_changes(path)
+        try:
+            self.db.put_node("before")
+            replica = GraphDatabase(feed_size=100)
+            sync = GraphReplica(replica, path)
+
+            self.modify()
+            self.assertTrue(sync.wait_for(self.db.get_change_sequence(), 2))
+            self.assertReplicated(replica)
+
+            # replicas can be chained, as applied changes are logged
+            chained = GraphDatabase()
+            chained_sync = GraphReplica(chained, replica)
+            self.db.put_node("after")
+            sync.wait_for(self.db.get_change_sequence(), 2)
+            chained_sync.wait_for(replica.get_change_sequence(), 2)
+            sync.close()
+            chained_sync.close()
+            self.assertReplicated(chained)
+        finally:
+            server.close()
+
+    def test_reload(self):
+        filename = os.path.join(tempfile.mkdtemp(), "graph.db")
+        db = GraphDatabase(filename, feed_size=100)
+        db.put_node("A")
+        db.save()
+        db.put_node("B")
+
+        replica = GraphDatabase()
+        sync = GraphReplica(replica, db)
+        db.reload()
+        sync.wait_for(db.get_change_sequence(), 1)
+        sync.close()
+
+        self.assertEqual(list(replica._graph), ["A"])
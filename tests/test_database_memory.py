@@ -0,0 +1,75 @@
+import unittest
+from edgeable import GraphDatabase
+
+
+class TestDatabaseMemory(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        for i in range(100):
+            self.db.put_node(i, {"name": "node-%d" % i, "tags": ["a", "b"]})
+        for i in range(99):
+            self.db.get_node(i).attach(self.db.get_node(i + 1), {"weight": i})
+
+    def test_report(self):
+        report = self.db.memory_report()
+        self.assertEqual(report["nodes"], 100)
+        self.assertEqual(report["sampled"], 100)
+        for name in (
+            "index",
+            "node_objects",
+            "node_properties",
+            "adjacency",
+            "edge_objects",
+            "edge_properties",
+        ):
+            self.assertGreater(report[name], 0)
+        self.assertEqual(
+            report["total"],
+            sum(
+                report[name]
+                for name in (
+                    "index",
+                    "node_objects",
+                    "node_properties",
+                    "adjacency",
+                    "edge_objects",
+                    "edge_properties",
+                )
+            ),
+        )
+        self.assertEqual(sorted(report["node_property_keys"]), ["name", "tags"])
+        self.assertEqual(list(report["edge_property_keys"]), ["weight"])
+
+    def test_duplicated_edge_properties(self):
+        # every edge is undirected, so half of its properties are duplicated
+        report = self.db.memory_report()
+        self.assertEqual(
+            report["duplicated_edge_properties"], report["edge_properties"] // 2
+        )
+
+        db = GraphDatabase()
+        db.put_node("A").attach(db.put_node("B"), {"weight": 1}, directed=True)
+        self.assertEqual(db.memory_report()["duplicated_edge_properties"], 0)
+
+    def test_degrees(self):
+        degrees = self.db.memory_report()["degrees"]
+        self.assertEqual(degrees[2]["nodes"], 2)
+        self.assertEqual(degrees[4]["nodes"], 98)
+        self.assertGreater(degrees[4]["bytes"], degrees[2]["bytes"])
+
+    def test_sampling(self):
+        exact = self.db.memory_report()
+        report = self.db.memory_report(sample_size=50, seed=1)
+        self.assertEqual(report["sampled"], 50)
+        self.assertEqual(report, self.db.memory_report(sample_size=50, seed=1))
+        self.assertAlmostEqual(report["total"] / exact["total"], 1.0, delta=0.2)
+
+    def test_empty(self):
+        report = GraphDatabase().memory_report()
+        self.assertEqual(report["nodes"], 0)
+        self.assertEqual(report["total"], report["index"])
+        self.assertEqual(report["degrees"], {})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            self.db.memory_report(sample_size=0)
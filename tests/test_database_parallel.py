@@ -0,0 +1,171 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+import unittest
+from edgeable import GraphDatabase, GraphGenerator, P
+
+
+def score(node):
+    return json.loads(node.get_property("data"))["score"]
+
+
+class TestDatabaseParallel(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        GraphGenerator(self.db, seed=1).power_law(
+            500,
+            node_properties=lambda id, rng: {
+                "data": json.dumps({"score": rng.random()}),
+                "type": rng.choice(["a", "b"]),
+            },
+        )
+        self.filter_fn = lambda node: score(node) > 0.5
+
+    def test_threads(self):
+        nodes = self.db.get_nodes(self.filter_fn)
+        self.assertGreater(len(nodes), 0)
+        self.assertEqual(self.db.get_nodes(self.filter_fn, parallel=True), nodes)
+        self.assertEqual(
+            self.db.get_nodes(self.filter_fn, parallel="threads", workers=3), nodes
+        )
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "requires fork"
+    )
+    def test_processes(self):
+        nodes = self.db.get_nodes(self.filter_fn)
+        self.assertEqual(
+            self.db.get_nodes(self.filter_fn, parallel="processes", workers=2), nodes
+        )
+
+        # workers run in other processes, so cannot change the graph
+        def modify(node):
+            node.set_property("modified", True)
+            return os.getpid()
+
+        pids = self.db.transform_nodes(
+            lambda node: {"pid": modify(node)}, parallel="processes", workers=2
+        )
+        self.assertEqual(pids, 500)
+        self.assertFalse(any(node.has_property("modified") for node in nodes))
+        self.assertNotIn(
+            os.getpid(), [node.get_property("pid") for node in self.db.get_nodes()]
+        )
+
+    def test_edges(self):
+        edge_filter_fn = lambda edge: edge._destination_id % 3 == 0
+        node_filter_fn = P("type") == "a"
+        edges = self.db.get_edges(edge_filter_fn, node_filter_fn)
+        self.assertGreater(len(edges), 0)
+        self.assertEqual(
+            self.db.get_edges(edge_filter_fn, node_filter_fn, parallel=True), edges
+        )
+
+    def test_default_filters_not_parallel(self):
+        import edgeable.parallel
+
+        pools = []
+        chunks = edgeable.parallel._chunks
+        edgeable.parallel._chunks = lambda count, workers: pools.append(
+            count
+        ) or chunks(count, workers)
+        try:
+            edge_filter_fn = lambda edge: edge._destination_id % 3 == 0
+            edges = self.db.get_edges(edge_filter_fn, parallel=True)
+            self.assertEqual(edges, self.db.get_edges(edge_filter_fn))
+            self.assertEqual(pools, [self.db.get_edge_count()])
+
+            # only the node filter supplied is evaluated in parallel
+            pools.clear()
+            self.db.get_edges(node_filter_fn=self.filter_fn, parallel=True)
+            self.assertEqual(pools, [500])
+
+            pools.clear()
+            self.db.get_nodes(parallel="processes")
+            self.db.transform_nodes(lambda node: None, parallel=True)
+            self.assertEqual(pools, [500])
+        finally:
+            edgeable.parallel._chunks = chunks
+
+    def test_index(self):
+        self.db.create_index("type")
+        predicate = (P("type") == "a") & P("data").contains("0.1")
+        nodes = self.db.get_nodes(predicate)
+        self.assertEqual(self.db.get_nodes(predicate, parallel=True, workers=4), nodes)
+
+    def test_transform(self):
+        changed = self.db.transform_nodes(
+            lambda node: {"score": score(node)} if node.get_id() % 2 else None,
+            filter_fn=P("type") == "a",
+            parallel=True,
+        )
+        expected = [
+            node for node in self.db.get_nodes(P("type") == "a") if node.get_id() % 2
+        ]
+        self.assertEqual(changed, len(expected))
+        for node in self.db.get_nodes():
+            self.assertEqual(node.has_property("score"), node in expected)
+
+        with self.assertRaises(RuntimeError):
+            self.db.transform_nodes(lambda node: "score", parallel=True)
+        self.assertEqual(self.db.get_nodes(P("score").exists()), expected)
+
+    def test_locked_operations_with_waiting_writer(self):
+        # workers calling locked operations share the lock of the caller,
+        # rather than queueing behind a writer which waits for the caller
+        writer = threading.Thread(target=lambda: self.db.put_node("X"))
+
+        def filter_fn(node):
+            if node.get_id() == 0:
+                writer.start()
+                while not self.db._graph_lock._waiting_writers:
+                    time.sleep(0.001)
+            return len(node.find_neighbors()) > 3
+
+        nodes = self.db.get_nodes(filter_fn, parallel=True, workers=2)
+        writer.join()
+        self.assertEqual(
+            nodes, self.db.get_nodes(lambda node: len(node.find_neighbors()) > 3)
+        )
+        self.assertTrue(self.db.has_node("X"))
+
+    def test_locked_operations_with_stripes(self):
+        # workers also share the stripes of the caller, which a writer of a
+        # single node may be waiting for
+        db = GraphDatabase(lock_stripes=4)
+        for id in range(20):
+            db.put_node(id)
+        for id in range(19):
+            db.get_node(id).attach(db.get_node(id + 1))
+        writer = threading.Thread(
+            target=lambda: db.get_node(5).set_property("a", 1), daemon=True
+        )
+
+        def filter_fn(node):
+            if node.get_id() == 0:
+                writer.start()
+                while not any(stripe._waiting_writers for stripe in db._stripes):
+                    time.sleep(0.001)
+            return len(node.find_neighbors(1)) > 1
+
+        nodes = []
+        reader = threading.Thread(
+            target=lambda: nodes.extend(db.get_nodes(filter_fn, parallel=True)),
+            daemon=True,
+        )
+        reader.start()
+        reader.join(10)
+        self.assertFalse(reader.is_alive())
+        writer.join(5)
+        self.assertEqual(len(nodes), 18)
+        self.assertEqual(db.get_node(5).get_property("a"), 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            self.db.get_nodes(self.filter_fn, parallel="fibers")
+        with self.assertRaises(RuntimeError):
+            self.db.get_nodes(self.filter_fn, parallel=True, workers=0)
+        with self.assertRaises(RuntimeError):
+            self.db.transform_nodes({})
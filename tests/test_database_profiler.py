@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+from edgeable import GraphDatabase, GraphProfiler
+
+
+class TestDatabaseProfiler(unittest.TestCase):
+    def test_disabled(self):
+        db = GraphDatabase()
+        db.put_node("A")
+        stats = db.stats()
+        self.assertEqual(stats["calls"], {})
+        self.assertEqual(stats["traversals"], {})
+        self.assertEqual(stats["callbacks"], {})
+        self.assertIn("GraphDatabase.put_node", stats["lock"])
+        self.assertIn("hits", stats["cache"])
+        self.assertIn("delivered", stats["dispatch"])
+
+    def test_calls(self):
+        db = GraphDatabase()
+        db.set_profiler(GraphProfiler())
+        A = db.put_node("A")
+        B = db.put_node("B")
+        A.attach(B)
+        db.get_nodes()
+
+        calls = db.stats()["calls"]
+        self.assertEqual(calls["GraphDatabase.put_node"]["count"], 2)
+        self.assertEqual(calls["GraphNode.attach"]["count"], 1)
+        self.assertEqual(calls["GraphDatabase.get_nodes"]["count"], 1)
+        put_node = calls["GraphDatabase.put_node"]
+        self.assertEqual(sum(put_node["histogram"].values()), 2)
+        self.assertGreaterEqual(put_node["total"], put_node["max"])
+        self.assertEqual(put_node["wait"]["count"], 2)
+
+        db.set_profiler(None)
+        db.put_node("C")
+        self.assertEqual(db.stats()["calls"], {})
+
+    def test_lock_wait(self):
+        db = GraphDatabase()
+        db.set_profiler(GraphProfiler())
+        acquired = threading.Event()
+
+        def hold():
+            db._graph_lock.acquire_write()
+            acquired.set()
+            time.sleep(0.05)
+            db._graph_lock.release()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        db.put_node("A")
+        thread.join()
+
+        wait = db.stats()["calls"]["GraphDatabase.put_node"]["wait"]
+        self.assertGreaterEqual(wait["max"], 0.04)
+
+    def test_traversals(self):
+        db = GraphDatabase()
+        db.set_profiler(GraphProfiler())
+        A = db.put_node("A")
+        B = db.put_node("B")
+        C = db.put_node("C")
+        A.attach(B)
+        B.attach(C)
+
+        A.find_route_to(C)
+        A.find_neighbors(1)
+        list(A.bfs())
+        next(A.dfs())
+
+        traversals = db.stats()["traversals"]
+        self.assertEqual(traversals["find_route_to"]["total"], 3)
+        self.assertEqual(traversals["find_neighbors"]["total"], 2)
+        self.assertEqual(traversals["bfs"]["total"], 3)
+        self.assertEqual(traversals["bfs"]["histogram"], {4: 1})
+        self.assertEqual(traversals["dfs"]["total"], 1)
+
+    def test_abandoned_traversal(self):
+        db = GraphDatabase()
+        db.set_profiler(GraphProfiler())
+        A = db.put_node("A")
+        A.attach(db.put_node("B"))
+        steps = A.dfs()
+        next(steps)
+        steps.close()
+        self.assertEqual(db.stats()["traversals"]["dfs"]["total"], 1)
+
+    def test_callbacks(self):
+        db = GraphDatabase()
+        db.set_profiler(GraphProfiler())
+        db.on_create_node(lambda node: time.sleep(0.01))
+        db.put_node("A")
+
+        callbacks = db.stats()["callbacks"]
+        self.assertEqual(list(callbacks), ["create_node"])
+        self.assertGreaterEqual(callbacks["create_node"]["total"], 0.01)
+
+    def test_exporter(self):
+        exported = []
+        profiler = GraphProfiler(exporter=exported.append)
+        db = GraphDatabase()
+        db.set_profiler(profiler)
+        db.put_node("A")
+        profiler.export()
+        self.assertIn("GraphDatabase.put_node", exported[0]["calls"])
+
+        profiler.reset()
+        self.assertEqual(profiler.get_stats()["calls"], {})
+
+    def test_exporter_interval(self):
+        exported = threading.Event()
+        profiler = GraphProfiler(exporter=lambda stats: exported.set(), interval=0.01)
+        self.assertTrue(exported.wait(1))
+        profiler.close()
+
+    def test_shared_profiler(self):
+        profiler = GraphProfiler()
+        for _ in range(2):
+            db = GraphDatabase()
+            db.set_profiler(profiler)
+            db.put_node("A")
+        self.assertEqual(
+            profiler.get_stats()["calls"]["GraphDatabase.put_node"]["count"], 2
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            GraphDatabase().set_profiler({})
+        with self.assertRaises(RuntimeError):
+            GraphProfiler(exporter=1)
+        with self.assertRaises(RuntimeError):
+            GraphProfiler(interval=1)
+        with self.assertRaises(RuntimeError):
+            GraphProfiler(exporter=print, interval=0)
@@ -42,3 +42,18 @@ class TestDatabaseProperties(unittest.TestCase):
     def test_delete_not_existing_property(self):
         self.assertEqual(self.db.delete_property("my_key"), None)
         self.assertEqual(self.db.has_property("my_key"), False)
+
+    def test_properties_view(self):
+        self.db.set_property("my_key", "my_value")
+
+        properties = self.db.get_properties_view()
+        with self.assertRaises(TypeError):
+            properties["my_key_2"] = "my_value_2"
+        self.db.set_properties({"my_key_2": "my_value_2"})
+        self.assertEqual(properties, {"my_key": "my_value", "my_key_2": "my_value_2"})
+
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.set_properties({"my_key": "my_value_new"})
+                raise ValueError()
+        self.assertEqual(properties, {"my_key": "my_value", "my_key_2": "my_value_2"})
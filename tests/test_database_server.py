@@ -0,0 +1,185 @@
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from edgeable import GraphDatabase, GraphClient, GraphRemoteNode
+
+
+class TestDatabaseServer(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.server = self.db.serve(os.path.join(tempfile.mkdtemp(), "graph.sock"))
+        self.client = GraphClient(self.server.get_address(), pool_size=2)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def test_nodes(self):
+        A = self.client.put_node("A", {"type": "user"})
+        B = self.client.put_node("B", {"type": "group"})
+
+        self.assertEqual(A, GraphRemoteNode(self.client, "A"))
+        self.assertEqual(self.db.get_node("A").get_property("type"), "user")
+        self.assertEqual(self.client.get_node("B"), B)
+        self.assertIsNone(self.client.get_node("C"))
+        self.assertEqual(self.client.get_nodes({"type": "user"}), [A])
+        self.assertEqual(self.client.get_node_count(), 2)
+
+        A.set_property("key", "value")
+        self.assertEqual(A.get_properties(), {"type": "user", "key": "value"})
+        self.assertEqual(A.delete_property("key"), "value")
+        B.delete()
+        self.assertFalse(self.db.has_node("B"))
+
+    def test_edges(self):
+        A = self.client.put_node("A")
+        B = self.client.put_node("B")
+        C = self.client.put_node("C")
+
+        self.assertTrue(A.attach(B, {"weight": 1}))
+        B.attach(C)
+        A.get_edge(B).set_property("weight", 2)
+
+        self.assertEqual(self.client.get_edge_count(), 4)
+        self.assertEqual(B.get_edge(A).get_property("weight"), 2)
+        self.assertEqual([str(edge) for edge in A.get_edges()], ["A->B"])
+        self.assertEqual(A.find_route_to(C), [A, B, C])
+        self.assertEqual(A.find_neighbors(2), [B, C])
+        self.assertTrue(A.can_reach(C))
+
+        A.detach(B)
+        self.assertFalse(A.has_edge(B))
+        self.assertIsNone(A.find_route_to(C))
+
+    def test_properties(self):
+        self.client.set_property("name", "graph")
+
+        self.assertEqual(self.client.get_properties(), {"name": "graph"})
+        self.assertEqual(self.db.get_property("name"), "graph")
+
+    def test_errors(self):
+        A = self.client.put_node("A")
+
+        with self.assertRaisesRegex(RuntimeError, "Node does not exist."):
+            A.attach(GraphRemoteNode(self.client, "missing"))
+        with self.assertRaisesRegex(RuntimeError, "Unknown operation"):
+            self.client.call("_call")
+        with self.assertRaisesRegex(RuntimeError, "TypeError"):
+            self.client.call("put_node")
+        with self.assertRaises(pickle.PicklingError):
+            self.client.set_property("key", object())
+
+        # the connection is still usable
+        self.assertTrue(self.client.has_node("A"))
+
+    def test_unsafe_values(self):
+        self.db.put_node("A", {"key": object()})
+
+        with self.assertRaisesRegex(RuntimeError, "Only basic types"):
+            self.client.get_node("A").get_properties()
+        self.assertTrue(self.client.has_node("A"))
+
+    def test_malformed_requests(self):
+        import socket
+        from edgeable.server import _frame, _read_frames
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(self.server.get_address())
+        stream = connection.makefile("rb")
+        responses = _read_frames(stream)
+        try:
+            requests = [
+                ("not a request", (None, [(False, "Malformed request.")])),
+                ((1, True), (None, [(False, "Malformed request.")])),
+                ((2, "yes", []), (2, [(False, "Malformed request.")])),
+                ((3, False, [("has_node",)]), (3, [(False, "Malformed operation.")])),
+                (
+                    (4, False, [("has_node", "A", {}), ("has_node", ["A"], {})]),
+                    (4, [(False, "Malformed operation."), (True, False)]),
+                ),
+                (
+                    (5, True, [("has_node", ["A"], {1: 2})]),
+                    (5, [(False, "Malformed operation.")]),
+                ),
+            ]
+            for request, response in requests:
+                connection.sendall(_frame(request))
+                self.assertEqual(next(responses), response)
+        finally:
+            stream.close()
+            connection.close()
+
+        # the server still serves other connections
+        self.assertFalse(self.client.has_node("A"))
+
+    def test_check_basic(self):
+        from edgeable.server import _check_basic
+
+        _check_basic((1, [True, None, 1.5], {"key": {"a", frozenset([b"b"])}}))
+        for value in (object(), [1, {"key": complex(1, 2)}], {("a", range(2)): 1}):
+            with self.assertRaisesRegex(pickle.PicklingError, "Only basic types"):
+                _check_basic(value)
+
+    def test_pipelining(self):
+        futures = [self.client.submit("put_node", i) for i in range(100)]
+
+        self.assertEqual([future.result() for future in futures], list(range(100)))
+        self.assertEqual(len(self.client._connections), 2)
+
+    def test_batch(self):
+        with self.client.batch() as batch:
+            A = batch.call("put_node", "A")
+            missing = batch.call("node_delete", "missing")
+            B = batch.call("put_node", "B")
+            edge = batch.call("node_attach", "A", "B")
+
+        self.assertEqual(A.result(), "A")
+        self.assertEqual(B.result(), "B")
+        self.assertTrue(edge.result())
+        with self.assertRaises(RuntimeError):
+            missing.result()
+
+    def test_atomic_batch(self):
+        with self.client.batch(atomic=True) as batch:
+            batch.call("put_node", "A")
+            failed = batch.call("node_attach", "A", "missing")
+
+        with self.assertRaises(RuntimeError):
+            failed.result()
+        self.assertFalse(self.db.has_node("A"))
+
+    def test_threads(self):
+        def work(i):
+            for j in range(20):
+                self.client.put_node("%d-%d" % (i, j)).set_property("key", j)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.db.get_node_count(), 80)
+
+    def test_tcp(self):
+        server = self.db.serve(("127.0.0.1", 0))
+        try:
+            with GraphClient(server.get_address()) as client:
+                client.put_node("A")
+            self.assertTrue(self.db.has_node("A"))
+        finally:
+            server.close()
+
+    def test_server_closed(self):
+        self.client.put_node("A")
+        self.server.close()
+        self.client.close()
+
+        with self.assertRaises(OSError):
+            self.client.put_node("B")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            GraphClient(self.server.get_address(), pool_size=0)
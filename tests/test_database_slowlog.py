@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from edgeable import GraphDatabase, GraphSlowLog
+
+
+class TestDatabaseSlowLog(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.A = self.db.put_node("A")
+        self.B = self.db.put_node("B")
+        self.C = self.db.put_node("C")
+        self.A.attach(self.B)
+        self.B.attach(self.C)
+
+    def test_disabled(self):
+        self.A.find_route_to(self.C)
+        self.assertIsNone(self.db._slow_log)
+
+    def test_records_slow_operations(self):
+        slow_log = GraphSlowLog(threshold=0)
+        self.db.set_slow_log(slow_log)
+        self.A.find_route_to(self.C)
+        self.A.find_neighbors(distance=2)
+
+        entries = slow_log.get_entries()
+        self.assertEqual(
+            [entry["operation"] for entry in entries],
+            ["GraphNode.find_route_to", "GraphNode.find_neighbors"],
+        )
+        self.assertEqual(entries[0]["arguments"], ["'A'", "'C'"])
+        self.assertEqual(entries[0]["visits"], 3)
+        self.assertEqual(entries[1]["keywords"], {"distance": "2"})
+        self.assertGreaterEqual(entries[0]["seconds"], 0)
+        self.assertGreaterEqual(entries[0]["wait"], 0)
+        self.assertLessEqual(entries[0]["time"], time.time())
+
+    def test_threshold(self):
+        slow_log = GraphSlowLog(threshold=0.05)
+        self.db.set_slow_log(slow_log)
+        self.db.get_nodes()
+        self.db.get_nodes(lambda node: time.sleep(0.02) or True)
+
+        entries = slow_log.get_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["visits"], 3)
+        self.assertIn("<lambda> (%s:" % __file__, entries[0]["arguments"][0])
+        self.assertGreaterEqual(entries[0]["seconds"], 0.06)
+
+    def test_nested_operations(self):
+        slow_log = GraphSlowLog(threshold=0)
+        self.db.set_slow_log(slow_log)
+        self.db.get_edges()
+        self.A.find_routes_to(self.C)
+
+        entries = slow_log.get_entries()
+        self.assertEqual(
+            [entry["operation"] for entry in entries],
+            ["GraphDatabase.get_edges", "GraphNode.find_routes_to"],
+        )
+        self.assertEqual(entries[0]["visits"], 3)
+        self.assertGreater(entries[1]["visits"], 3)
+
+    def test_lock_wait(self):
+        slow_log = GraphSlowLog(threshold=0)
+        self.db.set_slow_log(slow_log)
+        acquired = threading.Event()
+
+        def hold():
+            self.db._graph_lock.acquire_write()
+            acquired.set()
+            time.sleep(0.05)
+            self.db._graph_lock.release()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        self.A.find_neighbors()
+        thread.join()
+
+        entry = slow_log.get_entries()[0]
+        self.assertGreaterEqual(entry["wait"], 0.04)
+        self.assertGreaterEqual(entry["seconds"], entry["wait"])
+
+    def test_save_and_reload(self):
+        db = GraphDatabase(filename=os.path.join(tempfile.mkdtemp(), "graph.db"))
+        slow_log = GraphSlowLog(threshold=0)
+        db.set_slow_log(slow_log)
+        db.put_node("A")
+        db.save()
+        db.reload()
+        self.assertEqual(
+            [entry["operation"] for entry in slow_log.get_entries()],
+            ["GraphDatabase.save", "GraphDatabase.reload"],
+        )
+
+    def test_ring_buffer(self):
+        slow_log = GraphSlowLog(threshold=0, max_entries=2)
+        self.db.set_slow_log(slow_log)
+        for node in (self.A, self.B, self.C):
+            node.find_neighbors()
+        self.assertEqual(
+            [entry["arguments"] for entry in slow_log.get_entries()],
+            [["'B'"], ["'C'"]],
+        )
+        slow_log.clear()
+        self.assertEqual(slow_log.get_entries(), [])
+
+    def test_log(self):
+        self.db.set_slow_log(GraphSlowLog(threshold=0, log=True))
+        with self.assertLogs("edgeable", "WARNING") as logs:
+            self.A.find_route_to(self.C)
+        self.assertIn("slow GraphNode.find_route_to", logs.output[0])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            self.db.set_slow_log({})
+        with self.assertRaises(RuntimeError):
+            GraphSlowLog(threshold=-1)
+        with self.assertRaises(RuntimeError):
+            GraphSlowLog(max_entries=0)
@@ -0,0 +1,179 @@
+import unittest
+import os
+import threading
+from edgeable import GraphDatabase
+
+
+class TestDatabaseSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase(properties={"key": "value"})
+
+        self.A = self.db.put_node("A", {"key": "value"})
+        self.B = self.db.put_node("B")
+        self.C = self.db.put_node("C")
+        self.A.attach(self.B, {"key": "value"})
+        self.B.attach(self.C)
+
+    def test_snapshot_reads(self):
+        with self.db.snapshot() as snap:
+            A = snap.get_node("A")
+            B = snap.get_node("B")
+            C = snap.get_node("C")
+
+            self.assertEqual(snap.get_node_count(), 3)
+            self.assertEqual(snap.get_edge_count(), 4)
+            self.assertEqual(A.get_properties(), {"key": "value"})
+            self.assertEqual(A.get_edge(B).get_property("key"), "value")
+            self.assertEqual(A.find_route_to(C), [A, B, C])
+            self.assertEqual(A.find_routes_to(C), [[A, B, C]])
+            self.assertEqual(A.find_neighbors(distance=2), [B, C])
+            self.assertEqual(snap.get_property("key"), "value")
+            self.assertEqual(
+                [node.get_id() for node in snap.get_nodes()], ["A", "B", "C"]
+            )
+
+    def test_snapshot_isolated_from_properties(self):
+        with self.db.snapshot() as snap:
+            self.A.set_property("key", "changed")
+            self.A.get_edge(self.B).set_property("key", "changed")
+            self.db.set_property("key", "changed")
+
+            A = snap.get_node("A")
+            self.assertEqual(A.get_property("key"), "value")
+            self.assertEqual(
+                A.get_edge(snap.get_node("B")).get_property("key"), "value"
+            )
+            self.assertEqual(
+                snap.get_node("B").get_edge(A).get_property("key"), "value"
+            )
+            self.assertEqual(snap.get_property("key"), "value")
+
+        self.assertEqual(self.A.get_property("key"), "changed")
+
+    def test_snapshot_properties_view(self):
+        with self.db.snapshot() as snap:
+            A = snap.get_node("A")
+            properties = A.get_properties_view()
+            edge = A.get_edge(snap.get_node("B")).get_properties_view()
+            self.A.set_properties({"key": "changed"})
+            self.A.get_edge(self.B).set_properties({"key": "changed"})
+            self.db.set_properties({"key": "changed"})
+
+            self.assertEqual(properties, {"key": "value"})
+            self.assertEqual(edge, {"key": "value"})
+            self.assertEqual(snap.get_properties_view(), {"key": "value"})
+            self.assertEqual(snap.get_node("A").get_properties_view(), {"key": "value"})
+
+    def test_snapshot_reads_without_copying(self):
+        import edgeable.database
+
+        captured = []
+        capture = edgeable.database._capture
+        edgeable.database._capture = lambda node: captured.append(node) or capture(node)
+        try:
+            with self.db.snapshot() as snap:
+                A = snap.get_node("A")
+                self.assertEqual(
+                    A.find_route_to(snap.get_node("C")),
+                    [A, snap.get_node("B"), snap.get_node("C")],
+                )
+                self.assertEqual(len(snap.get_edges()), 4)
+                self.assertEqual(snap.get_edge_count(), 4)
+                self.assertEqual(captured, [])
+                self.assertEqual(snap._saved, {})
+
+                # only the node being modified is saved
+                self.B.set_property("key", "changed")
+                self.assertEqual(list(snap._saved), ["B"])
+                self.assertEqual(len(captured), 1)
+        finally:
+            edgeable.database._capture = capture
+
+    def test_snapshot_items_read_before_changes(self):
+        with self.db.snapshot() as snap:
+            A = snap.get_node("A")
+            edge = A.get_edges()[0]
+            view = A.get_properties_view()
+            self.A.set_property("key", "changed")
+            self.A.get_edge(self.B).set_property("key", "changed")
+            self.A.detach(self.B)
+
+            self.assertEqual(view, {"key": "value"})
+            self.assertEqual(A.get_property("key"), "value")
+            self.assertEqual(edge.get_property("key"), "value")
+            self.assertEqual(edge.get_destination(), snap.get_node("B"))
+            self.assertEqual(A.get_edges(), [edge])
+
+    def test_snapshot_predicates(self):
+        from edgeable import P
+
+        with self.db.snapshot() as snap:
+            self.B.set_property("key", "value")
+            nodes = snap.get_nodes(P("key") == "value")
+            edges = snap.get_edges(P("key") == "value")
+            self.assertEqual([node.get_id() for node in nodes], ["A"])
+            self.assertEqual([edge._source_id for edge in edges], ["A", "B"])
+
+    def test_snapshot_isolated_from_structure(self):
+        with self.db.snapshot() as snap:
+            D = self.db.put_node("D")
+            D.attach(self.C)
+            self.A.detach(self.B)
+            self.B.delete()
+
+            self.assertFalse(snap.has_node("D"))
+            self.assertTrue(snap.has_node("B"))
+            self.assertEqual(snap.get_node_count(), 3)
+            self.assertEqual(snap.get_edge_count(), 4)
+            self.assertEqual(
+                snap.get_node("A").find_route_to(snap.get_node("C")),
+                [snap.get_node("A"), snap.get_node("B"), snap.get_node("C")],
+            )
+
+        self.assertEqual(self.db.get_node_count(), 3)
+
+    def test_snapshot_isolated_from_reload(self):
+        self.db.save()
+        self.A.attach(self.C)
+
+        with self.db.snapshot() as snap:
+            self.db.reload()
+
+            self.assertTrue(snap.get_node("A").has_edge(snap.get_node("C")))
+            self.assertFalse(self.db.get_node("A").has_edge(self.db.get_node("C")))
+
+        os.remove("graph.db")
+
+    def test_snapshot_does_not_block_writers(self):
+        with self.db.snapshot() as snap:
+            reading = threading.Event()
+            release = threading.Event()
+
+            def slow_filter(node):
+                reading.set()
+                release.wait(5)
+                return True
+
+            reader = threading.Thread(target=lambda: snap.get_nodes(slow_filter))
+            reader.start()
+            reading.wait(5)
+
+            writer = threading.Thread(target=lambda: self.db.put_node("D"))
+            writer.start()
+            writer.join(1)
+            self.assertFalse(writer.is_alive())
+
+            release.set()
+            reader.join(5)
+
+    def test_snapshot_released_when_closed(self):
+        snap = self.db.snapshot()
+        self.A.set_property("key", "changed")
+        self.assertIn("A", snap._saved)
+
+        snap.close()
+        self.assertEqual(len(self.db._snapshots), 0)
+        self.assertEqual(snap._saved, {})
+
+        self.B.set_property("key", "changed")
+        self.assertEqual(snap._saved, {})
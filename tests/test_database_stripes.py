@@ -0,0 +1,175 @@
+import unittest
+import threading
+from edgeable import GraphDatabase
+
+
+class TestDatabaseStripes(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase(lock_stripes=16)
+
+    def distinct_nodes(self, count):
+        """Create nodes which hash to distinct stripes."""
+        nodes = {}
+        i = 0
+        while len(nodes) < count:
+            stripe = hash(str(i)) % 16
+            if stripe not in nodes:
+                nodes[stripe] = self.db.put_node(str(i))
+            i += 1
+        return [nodes[stripe] for stripe in sorted(nodes)]
+
+    def test_invalid_lock_stripes(self):
+        with self.assertRaises(RuntimeError):
+            GraphDatabase(lock_stripes=-1)
+
+    def test_operations(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B, {"key": "value"})
+        B.attach(C)
+        A.set_property("key", "value")
+        A.get_edge(B).set_property("key", "value2")
+
+        self.assertEqual(A.get_property("key"), "value")
+        self.assertEqual(B.get_edge(A).get_property("key"), "value2")
+        self.assertEqual(A.find_route_to(C), [A, B, C])
+
+        B.delete()
+        self.assertEqual(self.db.get_edge_count(), 0)
+
+    def test_disjoint_writes_concurrent(self):
+        A, B, C = self.distinct_nodes(3)
+        blocked = threading.Event()
+        release = threading.Event()
+        log = self.db._log
+
+        def block(op, *args):
+            if op == "edge":
+                blocked.set()
+                release.wait(5)
+            log(op, *args)
+
+        # block the attach while it holds the stripes of A and B
+        self.db._log = block
+        writer = threading.Thread(target=lambda: A.attach(B, directed=True))
+        writer.start()
+        blocked.wait(5)
+
+        # a write to an unrelated node is not blocked
+        other = threading.Thread(target=lambda: C.set_property("key", "value"))
+        other.start()
+        other.join(1)
+        self.assertFalse(other.is_alive())
+
+        # a write to a node being attached waits
+        same = threading.Thread(target=lambda: B.set_property("key", "value"))
+        same.start()
+        same.join(0.25)
+        self.assertTrue(same.is_alive())
+
+        # graph-wide reads wait
+        reader = threading.Thread(target=self.db.get_nodes)
+        reader.start()
+        reader.join(0.25)
+        self.assertTrue(reader.is_alive())
+
+        release.set()
+        for thread in (writer, same, reader):
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        self.assertTrue(A.has_edge(B))
+
+    def test_callbacks_modify_graph(self):
+        A, B, C = self.distinct_nodes(3)
+
+        def create(edge):
+            self.db.put_node("created-" + edge._destination_id)
+            C.set_property("key", "value")
+
+        def delete(edge):
+            edge.get_source().set_property("detached", True)
+
+        self.db.on_create_edge(create)
+        self.db.on_delete_edge(delete)
+        A.attach(B)
+        A.detach(B, directed=True)
+
+        self.assertTrue(self.db.has_node("created-" + B.get_id()))
+        self.assertTrue(self.db.has_node("created-" + A.get_id()))
+        self.assertEqual(C.get_property("key"), "value")
+        self.assertTrue(A.get_property("detached"))
+        self.assertTrue(B.has_edge(A))
+
+    def test_callbacks_take_graph_lock(self):
+        A, B, C = self.distinct_nodes(3)
+        stripe = self.db._stripes[hash(A.get_id()) % 16]
+        holding = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def hold():
+            stripe.acquire_write()
+            holding.set()
+            release.wait(5)
+            stripe.release()
+
+        def modify_lower_stripe(edge):
+            try:
+                A.set_property("key", "value")
+            except RuntimeError as e:
+                errors.append(e)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        holding.wait(5)
+
+        # with a callback registered the attach holds the graph-wide lock,
+        # so the callback does not wait for A's stripe behind B's and C's
+        self.db.on_create_edge(modify_lower_stripe)
+        B.attach(C, directed=True)
+        release.set()
+        holder.join(5)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(A.get_property("key"), "value")
+        self.assertTrue(B.has_edge(C))
+
+    def test_asynchronous_callbacks_keep_stripes(self):
+        self.db.on_create_edge(lambda edge: None, asynchronous=True)
+        self.assertFalse(self.db._has_synchronous_callbacks("create_edge"))
+        self.db.on_create_edge(lambda edge: None, id="sync")
+        self.assertTrue(self.db._has_synchronous_callbacks("create_edge"))
+        self.assertFalse(self.db._has_synchronous_callbacks("delete_edge"))
+        self.db.on_create_edge(None, id="sync")
+        self.assertFalse(self.db._has_synchronous_callbacks("create_edge"))
+
+    def test_unrelated_callbacks_keep_stripes(self):
+        A, B, C = self.distinct_nodes(3)
+        A.attach(B)
+        self.db.on_create_node(lambda node: None)
+        self.db.on_delete_edge(lambda edge: None)
+
+        # with the graph lock held for reading elsewhere, only writes which
+        # fall back to the graph-wide write lock wait
+        self.db._graph_lock.acquire_read()
+        try:
+            writes = [
+                lambda: A.set_property("key", "value"),
+                lambda: A.get_edge(B).set_property("key", "value"),
+                lambda: A.attach(C),
+            ]
+            for write in writes:
+                thread = threading.Thread(target=write)
+                thread.start()
+                thread.join(1)
+                self.assertFalse(thread.is_alive())
+
+            detach = threading.Thread(target=lambda: A.detach(B))
+            detach.start()
+            detach.join(0.25)
+            self.assertTrue(detach.is_alive())
+        finally:
+            self.db._graph_lock.release()
+        detach.join(5)
+        self.assertFalse(A.has_edge(B))
@@ -0,0 +1,110 @@
+import unittest
+from edgeable import GraphDatabase
+
+
+class TestDatabaseSubscriptions(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.events = []
+
+    def record(self, name):
+        return lambda item: self.events.append((name, str(item)))
+
+    def test_property_value(self):
+        self.db.on_create_node(self.record("user"), properties={"type": "user"})
+
+        self.db.put_node("A", {"type": "user"})
+        self.db.put_node("B", {"type": "group"})
+        self.db.put_node("C")
+        self.db.put_node("D", {"type": ["user"]})
+
+        self.assertEqual(self.events, [("user", "A")])
+
+    def test_multiple_properties(self):
+        self.db.on_create_node(
+            self.record("admin"),
+            properties={"type": "user", "role": "admin"},
+            has_properties=["email"],
+        )
+
+        self.db.put_node("A", {"type": "user", "role": "admin", "email": "a"})
+        self.db.put_node("B", {"type": "user", "role": "admin"})
+        self.db.put_node("C", {"type": "user", "role": "guest", "email": "c"})
+
+        self.assertEqual(self.events, [("admin", "A")])
+
+    def test_has_properties(self):
+        self.db.on_create_edge(self.record("weighted"), has_properties=["weight"])
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+
+        A.attach(B, {"weight": 0})
+        A.attach(C, directed=True)
+
+        self.assertEqual(self.events, [("weighted", "A->B"), ("weighted", "B->A")])
+
+    def test_prefix(self):
+        self.db.on_create_node(self.record("user"), prefix="user:")
+        self.db.on_create_node(self.record("u"), prefix="u")
+        self.db.on_delete_edge(self.record("edge"), prefix="user:")
+
+        A = self.db.put_node("user:1")
+        B = self.db.put_node("group:1")
+        self.db.put_node(1)
+        A.attach(B)
+        A.detach(B)
+
+        self.assertEqual(
+            self.events,
+            [("user", "user:1"), ("u", "user:1"), ("edge", "user:1->group:1")],
+        )
+
+    def test_order_and_cancel(self):
+        self.db.on_create_node(self.record("first"))
+        self.db.on_create_node(lambda node: False, properties={"cancel": True})
+        self.db.on_create_node(self.record("last"))
+
+        self.db.put_node("A")
+        self.db.put_node("B", {"cancel": True})
+
+        self.assertTrue(self.db.has_node("A"))
+        self.assertFalse(self.db.has_node("B"))
+        self.assertEqual(self.events, [("first", "A"), ("last", "A"), ("first", "B")])
+
+    def test_change_filter(self):
+        id = self.db.on_create_node(self.record("first"), prefix="A")
+        self.db.on_create_node(self.record("second"))
+        self.db.on_create_node(self.record("changed"), id, prefix="B")
+
+        self.db.put_node("A")
+        self.db.put_node("B")
+        self.db.on_create_node(None, id)
+        self.db.put_node("BB")
+
+        self.assertEqual(
+            self.events,
+            [("second", "A"), ("changed", "B"), ("second", "B"), ("second", "BB")],
+        )
+
+    def test_asynchronous(self):
+        self.db.on_create_node(
+            self.record("user"), asynchronous=True, properties={"type": "user"}
+        )
+
+        self.db.put_node("A", {"type": "user"})
+        self.db.put_node("B")
+
+        self.db.flush_events(1)
+        self.assertEqual(self.events, [("user", "A")])
+        self.assertEqual(self.db.get_dispatch_stats()["queued"], 1)
+
+    def test_invalid_filters(self):
+        with self.assertRaises(RuntimeError):
+            self.db.on_create_node(self.record("x"), properties=[])
+        with self.assertRaises(RuntimeError):
+            self.db.on_create_node(self.record("x"), properties={"key": []})
+        with self.assertRaises(RuntimeError):
+            self.db.on_create_node(self.record("x"), has_properties="key")
+        with self.assertRaises(RuntimeError):
+            self.db.on_create_node(self.record("x"), prefix=1)
@@ -0,0 +1,155 @@
+import unittest
+from edgeable import GraphDatabase
+
+
+class TestDatabaseTransaction(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+
+    def test_commit(self):
+        with self.db.transaction():
+            A = self.db.put_node("A", {"key": "value"})
+            B = self.db.put_node("B")
+            A.attach(B)
+
+        self.assertEqual(self.db.get_node_count(), 2)
+        self.assertTrue(B.has_edge(A))
+        self.assertEqual(A.get_property("key"), "value")
+
+    def test_callbacks_deferred(self):
+        created = []
+        self.db.on_create_node(lambda node: created.append(node.get_id()))
+        self.db.on_create_edge(lambda edge: created.append(str(edge)))
+
+        with self.db.transaction():
+            A = self.db.put_node("A")
+            B = self.db.put_node("B")
+            A.attach(B)
+            self.assertEqual(created, [])
+
+        self.assertEqual(created, ["A", "B", "A->B", "B->A"])
+
+    def test_callbacks_modify(self):
+        self.db.on_create_node(lambda node: node.set_property("key", "value"))
+
+        with self.db.transaction():
+            A = self.db.put_node("A")
+
+        self.assertEqual(A.get_property("key"), "value")
+
+    def test_create_node_cancelled(self):
+        self.db.on_create_node(lambda node: node.get_id() != "B")
+
+        with self.db.transaction():
+            A = self.db.put_node("A")
+            B = self.db.put_node("B")
+            A.attach(B)
+
+        self.assertTrue(self.db.has_node("A"))
+        self.assertFalse(self.db.has_node("B"))
+        self.assertEqual(A.get_edges(), [])
+
+    def test_create_edge_cancelled(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        self.db.on_create_edge(lambda edge: edge.get_destination() != C)
+
+        with self.db.transaction():
+            A.attach(B)
+            A.attach(C)
+
+        self.assertTrue(A.has_edge(B))
+        self.assertFalse(A.has_edge(C))
+        self.assertTrue(C.has_edge(A))
+
+    def test_delete_edge_cancelled(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B)
+        self.db.on_delete_edge(lambda edge: False)
+
+        with self.db.transaction():
+            A.detach(B)
+            self.assertFalse(A.has_edge(B))
+
+        self.assertTrue(A.has_edge(B))
+        self.assertTrue(B.has_edge(A))
+
+    def test_delete_node_cancelled(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B)
+        deleted = []
+        self.db.on_delete_node(lambda node: False)
+        self.db.on_delete_edge(lambda edge: deleted.append(str(edge)))
+
+        with self.db.transaction():
+            A.delete()
+            self.assertFalse(self.db.has_node("A"))
+
+        self.assertTrue(self.db.has_node("A"))
+        self.assertTrue(A.has_edge(B))
+        self.assertTrue(B.has_edge(A))
+        self.assertEqual(deleted, [])
+
+    def test_delete_node(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B)
+        deleted = []
+        self.db.on_delete_edge(lambda edge: deleted.append(str(edge)))
+
+        with self.db.transaction():
+            A.delete()
+
+        self.assertFalse(self.db.has_node("A"))
+        self.assertEqual(B.get_edges(), [])
+        self.assertEqual(sorted(deleted), ["A->B", "B->A"])
+
+    def test_rollback(self):
+        A = self.db.put_node("A", {"key": "value"})
+        B = self.db.put_node("B")
+        A.attach(B, {"key": "value"})
+        self.db.set_property("key", "value")
+        created = []
+        self.db.on_create_node(lambda node: created.append(node))
+
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                C = self.db.put_node("C")
+                C.attach(A)
+                A.set_property("key", "changed")
+                A.get_edge(B).set_property("key", "changed")
+                self.db.set_property("key", "changed")
+                B.delete()
+                raise ValueError()
+
+        self.assertEqual(created, [])
+        self.assertFalse(self.db.has_node("C"))
+        self.assertTrue(self.db.has_node("B"))
+        self.assertEqual(A.get_property("key"), "value")
+        self.assertEqual(A.get_edge(B).get_property("key"), "value")
+        self.assertEqual(B.get_edge(A).get_property("key"), "value")
+        self.assertEqual([edge.get_destination() for edge in A.get_edges()], [B])
+        self.assertEqual(self.db.get_property("key"), "value")
+        self.assertTrue(A.is_connected_to(B))
+        self.assertFalse(A.can_reach(self.db.put_node("C")))
+
+    def test_nested_transaction(self):
+        with self.db.transaction():
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    pass
+
+        # the lock is released
+        self.db.put_node("A")
+
+    def test_lock_held_once(self):
+        with self.db.transaction():
+            for i in range(10):
+                self.db.put_node(i)
+
+        stats = self.db.get_lock_stats()
+        self.assertEqual(stats["GraphDatabase.transaction"]["count"], 1)
+        self.assertNotIn("GraphDatabase.put_node", stats)
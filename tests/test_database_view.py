@@ -0,0 +1,177 @@
+import unittest
+from edgeable import GraphDatabase, GraphViewNode, P
+
+
+def ids(nodes):
+    return [node.get_id() for node in nodes]
+
+
+class TestDatabaseView(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase(properties={"key": "value"})
+
+        # A - B - C - D, with an inactive shortcut from A to D
+        self.A = self.db.put_node("A", {"active": True})
+        self.B = self.db.put_node("B", {"active": True})
+        self.C = self.db.put_node("C", {"active": True})
+        self.D = self.db.put_node("D", {"active": True})
+        self.E = self.db.put_node("E", {"active": False})
+        self.A.attach(self.B, {"active": True})
+        self.B.attach(self.C, {"active": True})
+        self.C.attach(self.D, {"active": True})
+        self.A.attach(self.D, {"active": False})
+        self.D.attach(self.E, {"active": True})
+
+    def test_view_reads(self):
+        view = self.db.view(P("active") == True, P("active") == True)
+        A = view.get_node("A")
+        D = view.get_node("D")
+
+        self.assertEqual(view.get_node_count(), 4)
+        self.assertEqual(view.get_edge_count(), 6)
+        self.assertEqual(ids(view.get_nodes()), ["A", "B", "C", "D"])
+        self.assertEqual(
+            ids(view.get_nodes(lambda node: node.get_id() > "B")), ["C", "D"]
+        )
+        self.assertIsNone(view.get_node("E"))
+        self.assertFalse(view.has_node("E"))
+        self.assertTrue(view.has_node("A"))
+        self.assertEqual(ids(edge.get_destination() for edge in A.get_edges()), ["B"])
+        self.assertIsNone(A.get_edge(D))
+        self.assertFalse(A.has_edge(D))
+        self.assertTrue(A.has_edge(view.get_node("B")))
+        self.assertEqual(A.get_edge(view.get_node("B")).get_property("active"), True)
+        self.assertEqual(A.get_properties(), {"active": True})
+        self.assertEqual(view.get_property("key"), "value")
+        self.assertEqual(len(view.get_edges()), 6)
+        self.assertIsInstance(view.get_edges()[0].get_source(), GraphViewNode)
+
+    def test_view_traversals(self):
+        view = self.db.view(edge_filter=lambda edge: edge.get_property("active"))
+        A = view.get_node("A")
+        D = view.get_node("D")
+
+        self.assertEqual(ids(A.find_route_to(D)), ["A", "B", "C", "D"])
+        self.assertEqual(self.A.find_route_to(self.D), [self.A, self.D])
+        self.assertEqual(
+            [ids(route) for route in A.find_routes_to(D)], [["A", "B", "C", "D"]]
+        )
+        self.assertEqual(ids(A.find_neighbors(distance=2)), ["B", "C"])
+        self.assertEqual(
+            [(node.get_id(), depth) for (node, depth, _) in A.bfs()],
+            [("A", 0), ("B", 1), ("C", 2), ("D", 3), ("E", 4)],
+        )
+        self.assertEqual(
+            ids(node for (node, _, _) in A.dfs(max_depth=2)), ["A", "B", "C"]
+        )
+        self.assertEqual(
+            [
+                ids(node for (node, _, _) in level)
+                for level in A.walk_levels(max_depth=1)
+            ],
+            [["A"], ["B"]],
+        )
+        steps = list(A.bfs(node_filter_fn=lambda node: node.get_id() != "C"))
+        self.assertEqual(ids(node for (node, _, _) in steps), ["A", "B"])
+        self.assertEqual(steps[1][2].get_source(), A)
+
+    def test_view_reflects_changes(self):
+        view = self.db.view(P("active") == True)
+        self.assertEqual(view.get_node_count(), 4)
+        self.E.set_property("active", True)
+        self.B.set_property("active", False)
+        self.assertEqual(ids(view.get_nodes()), ["A", "C", "D", "E"])
+        self.assertEqual(
+            ids(view.get_node("A").find_route_to(view.get_node("C"))), ["A", "D", "C"]
+        )
+        self.db.put_node("F", {"active": True})
+        self.assertEqual(view.get_node_count(), 5)
+
+    def test_view_memoize(self):
+        calls = []
+
+        def active(node):
+            calls.append(node.get_id())
+            return node.get_property("active")
+
+        view = self.db.view(active, memoize=True)
+        self.assertEqual(view.get_node_count(), 4)
+        self.assertEqual(view.get_node_count(), 4)
+        self.assertEqual(len(calls), 5)
+
+        # only the changed node is evaluated again
+        self.B.set_property("active", False)
+        self.assertEqual(ids(view.get_nodes()), ["A", "C", "D"])
+        self.assertEqual(calls[5:], ["B"])
+
+        self.C.delete()
+        self.assertEqual(view.get_node_count(), 2)
+        self.assertEqual(len(calls), 6)
+
+    def test_view_memoize_edges(self):
+        view = self.db.view(
+            edge_filter=lambda edge: edge.get_property("active"), memoize=True
+        )
+        self.assertEqual(view.get_edge_count(), 8)
+        # the property is also set on the reverse edge
+        self.A.get_edge(self.D).set_property("active", True)
+        self.assertEqual(view.get_edge_count(), 10)
+        self.A.detach(self.B, directed=True)
+        self.A.attach(self.B, {"active": False}, directed=True)
+        self.assertEqual(view.get_edge_count(), 9)
+
+    def test_view_memoize_rollback(self):
+        view = self.db.view(P("active") == True, memoize=True)
+        self.assertEqual(view.get_node_count(), 4)
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.E.set_property("active", True)
+                self.assertEqual(view.get_node_count(), 5)
+                raise ValueError()
+        self.assertEqual(view.get_node_count(), 4)
+
+    def test_view_uses_index(self):
+        self.db.create_index("active")
+        calls = []
+
+        def other(node):
+            calls.append(node.get_id())
+            return True
+
+        view = self.db.view(P("active") == False)
+        self.assertEqual(ids(view.get_nodes(other)), ["E"])
+        self.assertEqual(calls, ["E"])
+
+    def test_view_does_not_copy(self):
+        view = self.db.view(P("active") == True)
+        node = view.get_node("A")
+        self.assertIs(node._node, self.A)
+        self.assertIs(node.get_properties_view().get("active"), True)
+        self.A.set_property("color", "red")
+        self.assertEqual(node.get_property("color"), "red")
+
+    def test_view_deleted_node(self):
+        view = self.db.view()
+        A = view.get_node("A")
+        self.A.delete()
+        with self.assertRaises(RuntimeError):
+            A.get_edges()
+        with self.assertRaises(RuntimeError):
+            A.bfs()
+
+    def test_view_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            self.db.view("active")
+        with self.assertRaises(RuntimeError):
+            self.db.view(edge_filter=1)
+        view = self.db.view()
+        with self.assertRaises(RuntimeError):
+            view.get_nodes(1)
+        with self.assertRaises(RuntimeError):
+            view.get_node("A").find_route_to(self.B)
+        with self.assertRaises(RuntimeError):
+            view.get_node("A").get_edge(self.B)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -105,3 +105,21 @@ class TestEdgeProperties(unittest.TestCase):
 
         self.assertEqual(edge.delete_property("my_key"), None)
         self.assertEqual(edge.has_property("my_key"), False)
+
+    def test_edge_properties_view(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B, {"my_key": "my_value"})
+
+        properties = A.get_edge(B).get_properties_view()
+        reverse = B.get_edge(A).get_properties_view()
+        with self.assertRaises(TypeError):
+            properties["my_key_2"] = "my_value_2"
+
+        A.get_edge(B).set_properties({"my_key_2": "my_value_2"})
+        A.attach(B, {"my_key_3": "my_value_3"}, directed=True)
+        self.assertEqual(
+            properties,
+            {"my_key": "my_value", "my_key_2": "my_value_2", "my_key_3": "my_value_3"},
+        )
+        self.assertEqual(reverse, {"my_key": "my_value", "my_key_2": "my_value_2"})
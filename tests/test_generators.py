@@ -0,0 +1,146 @@
+import unittest
+from edgeable import GraphDatabase, GraphGenerator
+
+
+def edges(db):
+    return sorted((edge._source_id, edge._destination_id) for edge in db.get_edges())
+
+
+class TestGenerators(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.generator = GraphGenerator(self.db, seed=1)
+
+    def test_erdos_renyi(self):
+        ids = self.generator.erdos_renyi(200, 0.05)
+        self.assertEqual(ids, range(200))
+        self.assertEqual(self.db.get_node_count(), 200)
+        # each undirected edge is a pair of edges
+        count = self.db.get_edge_count()
+        self.assertAlmostEqual(count / 2, 0.05 * 200 * 199 / 2, delta=100)
+        for source, destination in edges(self.db):
+            self.assertTrue(
+                self.db.get_node(destination).has_edge(self.db.get_node(source))
+            )
+
+    def test_erdos_renyi_directed(self):
+        self.generator.erdos_renyi(50, 1.0, directed=True)
+        self.assertEqual(self.db.get_edge_count(), 50 * 49)
+        self.assertFalse(self.db.get_node(0).has_edge(self.db.get_node(0)))
+
+    def test_erdos_renyi_empty(self):
+        self.generator.erdos_renyi(50, 0)
+        self.assertEqual(self.db.get_node_count(), 50)
+        self.assertEqual(self.db.get_edge_count(), 0)
+
+    def test_barabasi_albert(self):
+        self.generator.barabasi_albert(1000, 2)
+        self.assertEqual(self.db.get_edge_count(), (1000 - 2) * 2 * 2)
+        degrees = sorted(len(node._edges) for node in self.db.get_nodes())
+        self.assertGreaterEqual(degrees[0], 2)
+        self.assertGreater(degrees[-1], 20)
+
+    def test_grid(self):
+        self.generator.grid(3, 4)
+        self.assertEqual(self.db.get_edge_count(), 2 * (3 * 3 + 2 * 4))
+        node = self.db.get_node(5)
+        self.assertEqual(node.get_properties(), {"row": 1, "column": 1})
+        self.assertEqual(
+            sorted(n.get_id() for n in node.find_neighbors()), [1, 4, 6, 9]
+        )
+
+    def test_periodic_grid(self):
+        self.generator.grid(3, 4, periodic=True)
+        self.assertEqual(self.db.get_edge_count(), 2 * 2 * 12)
+        self.assertTrue(self.db.get_node(0).has_edge(self.db.get_node(3)))
+        self.assertTrue(self.db.get_node(0).has_edge(self.db.get_node(8)))
+
+    def test_power_law(self):
+        self.generator.power_law(2000, exponent=2.5, average_degree=4)
+        degrees = sorted(len(node._edges) for node in self.db.get_nodes())
+        self.assertAlmostEqual(sum(degrees) / 2000, 4, delta=0.5)
+        self.assertGreater(degrees[-1], 10 * degrees[len(degrees) // 2])
+
+    def test_random_dag(self):
+        self.generator.random_dag(100, 0.1)
+        self.assertGreater(self.db.get_edge_count(), 0)
+        for source, destination in edges(self.db):
+            self.assertLess(source, destination)
+
+    def test_properties(self):
+        self.generator.power_law(
+            100,
+            node_properties=lambda id, rng: {"type": rng.choice(["a", "b"])},
+            edge_properties=lambda source, destination, rng: {"weight": rng.random()},
+        )
+        for node in self.db.get_nodes():
+            self.assertIn(node.get_property("type"), ["a", "b"])
+        for edge in self.db.get_edges():
+            reverse = self.db.get_node(edge._destination_id).get_edge(edge.get_source())
+            self.assertEqual(
+                edge.get_property("weight"), reverse.get_property("weight")
+            )
+            self.assertIsNot(edge._properties, reverse._properties)
+
+    def test_shared_node_properties(self):
+        shared = {"count": 1}
+        self.generator.erdos_renyi(3, 0, node_properties=lambda id, rng: shared)
+        self.db.get_node(0).set_property("count", 2)
+        self.assertEqual(
+            [node.get_property("count") for node in self.db.get_nodes()], [2, 1, 1]
+        )
+        self.assertEqual(shared, {"count": 1})
+
+    def test_empty_graphs(self):
+        self.assertEqual(len(self.generator.power_law(0)), 0)
+        self.assertEqual(len(self.generator.erdos_renyi(0, 0.5)), 0)
+        self.assertEqual(len(self.generator.random_dag(0, 0.5)), 0)
+        self.assertEqual(self.db.get_node_count(), 0)
+
+    def test_pair(self):
+        from edgeable.generators import _isqrt, _pair
+
+        for n in [0, 1, 2, 3, 4, 99, 100, 10**15, 10**30 - 1, 10**30]:
+            root = _isqrt(n)
+            self.assertLessEqual(root * root, n)
+            self.assertGreater((root + 1) * (root + 1), n)
+        pairs = [(lower, higher) for higher in range(6) for lower in range(higher)]
+        self.assertEqual([_pair(index) for index in range(len(pairs))], pairs)
+
+    def test_seed(self):
+        other = GraphDatabase()
+        GraphGenerator(other, seed=1).barabasi_albert(200, 3)
+        self.generator.barabasi_albert(200, 3)
+        self.assertEqual(edges(self.db), edges(other))
+
+    def test_consecutive_graphs(self):
+        self.assertEqual(self.generator.grid(2, 2), range(0, 4))
+        self.assertEqual(self.generator.erdos_renyi(3, 1.0), range(4, 7))
+        self.assertEqual(self.generator.random_dag(2, 1.0, start=100), range(100, 102))
+        self.assertFalse(self.db.get_node(0).is_connected_to(self.db.get_node(4)))
+        self.assertTrue(self.db.get_node(4).is_connected_to(self.db.get_node(6)))
+        self.assertTrue(self.db.get_node(100).can_reach(self.db.get_node(101)))
+
+        with self.assertRaises(RuntimeError):
+            self.generator.grid(2, 2, start=0)
+
+    def test_transaction_rollback(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.generator.erdos_renyi(10, 0.5)
+                raise ValueError()
+        self.assertEqual(self.db.get_node_count(), 0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            self.generator.erdos_renyi(-1, 0.5)
+        with self.assertRaises(RuntimeError):
+            self.generator.erdos_renyi(10, 2)
+        with self.assertRaises(RuntimeError):
+            self.generator.barabasi_albert(10, 10)
+        with self.assertRaises(RuntimeError):
+            self.generator.grid(0, 1)
+        with self.assertRaises(RuntimeError):
+            self.generator.power_law(10, exponent=2)
+        with self.assertRaises(RuntimeError):
+            self.generator.random_dag(10, 0.5, start="A")
@@ -53,3 +53,34 @@ class TestNodeProperties(unittest.TestCase):
 
         self.assertEqual(A.delete_property("my_key"), None)
         self.assertEqual(A.has_property("my_key"), False)
+
+    def test_node_properties_view(self):
+        A = self.db.put_node("A", {"my_key": "my_value"})
+
+        properties = A.get_properties_view()
+        self.assertEqual(properties, {"my_key": "my_value"})
+        with self.assertRaises(TypeError):
+            properties["my_key_2"] = "my_value_2"
+
+        A.set_property("my_key_2", "my_value_2")
+        A.set_properties({"my_key": "my_value_new"})
+        self.db.put_node("A", {"my_key_3": "my_value_3"})
+        self.assertEqual(
+            properties,
+            {
+                "my_key": "my_value_new",
+                "my_key_2": "my_value_2",
+                "my_key_3": "my_value_3",
+            },
+        )
+
+    def test_node_properties_view_rollback(self):
+        A = self.db.put_node("A", {"my_key": "my_value"})
+        properties = A.get_properties_view()
+
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                A.set_properties({"my_key": "my_value_new"})
+                self.assertEqual(properties["my_key"], "my_value_new")
+                raise ValueError()
+        self.assertEqual(properties, {"my_key": "my_value"})
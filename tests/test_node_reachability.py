@@ -0,0 +1,90 @@
+import unittest
+from edgeable import GraphDatabase
+
+
+class TestNodeReachability(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+
+    def test_can_reach_directed(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B, directed=True)
+        B.attach(C, directed=True)
+
+        self.assertTrue(A.can_reach(C))
+        self.assertTrue(A.can_reach(A))
+        self.assertFalse(C.can_reach(A))
+        self.assertFalse(B.can_reach(A))
+
+    def test_can_reach_undirected(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        A.attach(B)
+
+        self.assertTrue(A.can_reach(B))
+        self.assertTrue(B.can_reach(A))
+
+    def test_can_reach_cycle(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        D = self.db.put_node("D")
+        A.attach(B, directed=True)
+        B.attach(C, directed=True)
+        C.attach(A, directed=True)
+        C.attach(D, directed=True)
+
+        self.assertTrue(B.can_reach(A))
+        self.assertTrue(A.can_reach(D))
+        self.assertFalse(D.can_reach(A))
+
+    def test_can_reach_diamond(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        D = self.db.put_node("D")
+        E = self.db.put_node("E")
+        A.attach(B, directed=True)
+        A.attach(C, directed=True)
+        B.attach(D, directed=True)
+        C.attach(D, directed=True)
+        E.attach(C, directed=True)
+
+        self.assertTrue(E.can_reach(D))
+        self.assertFalse(E.can_reach(B))
+        self.assertFalse(B.can_reach(C))
+
+    def test_can_reach_after_attach(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B, directed=True)
+        self.assertFalse(A.can_reach(C))
+
+        B.attach(C, directed=True)
+        self.assertTrue(A.can_reach(C))
+
+        # redundant for reachability, the index is kept
+        A.attach(C, directed=True)
+        self.assertTrue(self.db._reachability._valid)
+        self.assertTrue(A.can_reach(C))
+
+    def test_can_reach_after_detach(self):
+        A = self.db.put_node("A")
+        B = self.db.put_node("B")
+        C = self.db.put_node("C")
+        A.attach(B, directed=True)
+        B.attach(C, directed=True)
+        self.assertTrue(A.can_reach(C))
+
+        B.detach(C, directed=True)
+        self.assertFalse(A.can_reach(C))
+
+    def test_can_reach_new_node(self):
+        A = self.db.put_node("A")
+        self.assertTrue(A.can_reach(A))
+
+        B = self.db.put_node("B")
+        self.assertFalse(A.can_reach(B))
@@ -0,0 +1,91 @@
+import unittest
+from edgeable import GraphDatabase
+
+
+class TestNodeTraversal(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+
+        self.A = self.db.put_node("A")
+        self.B = self.db.put_node("B")
+        self.C = self.db.put_node("C")
+        self.D = self.db.put_node("D")
+        self.E = self.db.put_node("E")
+
+        self.A.attach(self.B)
+        self.A.attach(self.C, {"blocked": True})
+        self.B.attach(self.D)
+        self.D.attach(self.E)
+
+    def test_bfs(self):
+        steps = list(self.A.bfs())
+
+        self.assertEqual(
+            [(node, depth) for (node, depth, _) in steps],
+            [(self.A, 0), (self.B, 1), (self.C, 1), (self.D, 2), (self.E, 3)],
+        )
+        self.assertIsNone(steps[0][2])
+        self.assertEqual(steps[3][2], self.B.get_edge(self.D))
+
+    def test_dfs(self):
+        steps = list(self.A.dfs())
+
+        self.assertEqual(
+            [(node, depth) for (node, depth, _) in steps],
+            [(self.A, 0), (self.B, 1), (self.D, 2), (self.E, 3), (self.C, 1)],
+        )
+
+    def test_walk_levels(self):
+        levels = [[node for (node, _, _) in level] for level in self.A.walk_levels()]
+
+        self.assertEqual(levels, [[self.A], [self.B, self.C], [self.D], [self.E]])
+
+    def test_max_depth(self):
+        nodes = [node for (node, _, _) in self.A.bfs(max_depth=1)]
+
+        self.assertEqual(nodes, [self.A, self.B, self.C])
+
+    def test_max_visits(self):
+        nodes = [node for (node, _, _) in self.A.dfs(max_visits=2, chunk_size=1)]
+
+        self.assertEqual(nodes, [self.A, self.B])
+
+    def test_edge_filter(self):
+        nodes = [
+            node
+            for (node, _, _) in self.A.bfs(
+                edge_filter_fn=lambda edge: not edge.get_property("blocked")
+            )
+        ]
+
+        self.assertEqual(nodes, [self.A, self.B, self.D, self.E])
+
+    def test_node_filter(self):
+        nodes = [
+            node
+            for (node, _, _) in self.A.bfs(
+                node_filter_fn=lambda node: node.get_id() != "D"
+            )
+        ]
+
+        self.assertEqual(nodes, [self.A, self.B, self.C])
+
+    def test_early_stop(self):
+        for node, _, _ in self.A.bfs(chunk_size=1):
+            if node == self.B:
+                break
+
+        # the read lock is not held once the generator is abandoned
+        self.db.put_node("F")
+        self.assertTrue(self.db.has_node("F"))
+
+    def test_modified_between_chunks(self):
+        steps = self.A.bfs(chunk_size=1)
+        next(steps)
+        self.C.delete()
+
+        self.assertEqual([node for (node, _, _) in steps], [self.B, self.D, self.E])
+
+    def test_invalid_filter(self):
+        with self.assertRaises(RuntimeError):
+            self.A.bfs(edge_filter_fn=None)
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from edgeable import GraphDatabase, GraphProfiler, P
+
+
+def ids(nodes):
+    return sorted(node.get_id() for node in nodes)
+
+
+class TestPredicates(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        self.db.put_node("A", {"type": "user", "age": 25, "name": "Ann"})
+        self.db.put_node("B", {"type": "user", "age": 40, "tags": ["admin"]})
+        self.db.put_node("C", {"type": "group", "age": "unknown"})
+        self.db.put_node("D")
+
+    def test_comparisons(self):
+        self.assertEqual(ids(self.db.get_nodes(P("type") == "user")), ["A", "B"])
+        self.assertEqual(ids(self.db.get_nodes(P("type") != "user")), ["C", "D"])
+        self.assertEqual(ids(self.db.get_nodes(P("age") > 30)), ["B"])
+        self.assertEqual(ids(self.db.get_nodes(P("age") >= 25)), ["A", "B"])
+        self.assertEqual(ids(self.db.get_nodes(P("age") < 30)), ["A"])
+        self.assertEqual(ids(self.db.get_nodes(P("age") <= 40)), ["A", "B"])
+
+    def test_methods(self):
+        self.assertEqual(ids(self.db.get_nodes(P("age").isin([25, 40]))), ["A", "B"])
+        self.assertEqual(ids(self.db.get_nodes(P("age").exists())), ["A", "B", "C"])
+        self.assertEqual(ids(self.db.get_nodes(P("tags").contains("admin"))), ["B"])
+        self.assertEqual(ids(self.db.get_nodes(P("name").startswith("A"))), ["A"])
+        self.assertEqual(ids(self.db.get_nodes(P("age").contains(2))), [])
+
+    def test_combinations(self):
+        predicate = (P("age") > 30) & (P("type") == "user")
+        self.assertEqual(ids(self.db.get_nodes(predicate)), ["B"])
+        predicate = (P("type") == "group") | (P("age") < 30)
+        self.assertEqual(ids(self.db.get_nodes(predicate)), ["A", "C"])
+        self.assertEqual(ids(self.db.get_nodes(~P("age").exists())), ["D"])
+        self.assertEqual(repr(~(P("age") > 30)), "~P('age') > 30")
+
+        with self.assertRaises(RuntimeError):
+            (P("age") > 30) & (lambda node: True)
+
+    def test_equalities(self):
+        predicate = (P("type") == "user") & P("age").isin([25, 40])
+        self.assertEqual(
+            predicate.get_equalities(), {"type": {"user"}, "age": {25, 40}}
+        )
+        predicate = (P("type") == "user") | (P("type") == "group") & (P("age") > 1)
+        self.assertEqual(predicate.get_equalities(), {"type": {"user", "group"}})
+        self.assertEqual(((P("type") == "user") | (P("age") > 1)).get_equalities(), {})
+        self.assertEqual((~(P("type") == "user")).get_equalities(), {})
+        self.assertEqual((P("tags") == ["admin"]).get_equalities(), {})
+
+    def test_edges(self):
+        self.db.get_node("A").attach(self.db.get_node("B"), {"weight": 2})
+        self.db.get_node("B").attach(self.db.get_node("C"), {"weight": 5})
+        edges = self.db.get_edges(P("weight") > 3)
+        self.assertEqual(ids(edge.get_source() for edge in edges), ["B", "C"])
+        edges = self.db.get_edges(node_filter_fn=P("type") == "user")
+        self.assertEqual(len(edges), 3)
+        edges = self.db.get_node("A").get_edges(P("weight") == 2)
+        self.assertEqual(len(edges), 1)
+
+    def test_callable_filters(self):
+        class Adult:
+            def __call__(self, node):
+                return node.get_property("age") == 40
+
+        self.assertEqual(ids(self.db.get_nodes(Adult())), ["B"])
+        with self.assertRaises(RuntimeError):
+            self.db.get_nodes("type")
+        with self.assertRaises(RuntimeError):
+            P(1)
+
+    def test_index(self):
+        profiler = GraphProfiler()
+        self.db.set_profiler(profiler)
+        self.db.create_index("type")
+        self.assertEqual(self.db.get_indexes(), ["type"])
+
+        predicate = (P("type") == "user") & (P("age") > 30)
+        self.assertEqual(ids(self.db.get_nodes(predicate)), ["B"])
+        self.assertEqual(profiler.get_stats()["traversals"]["get_nodes"]["total"], 2)
+
+        self.db.drop_index("type")
+        self.assertEqual(self.db.get_indexes(), [])
+        self.assertEqual(ids(self.db.get_nodes(predicate)), ["B"])
+        self.assertEqual(profiler.get_stats()["traversals"]["get_nodes"]["total"], 6)
+
+    def test_index_updates(self):
+        self.db.create_index("type")
+        users = P("type").isin(["user", "admin"])
+        self.assertEqual(ids(self.db.get_nodes(users)), ["A", "B"])
+
+        self.db.get_node("A").set_property("type", "group")
+        self.db.get_node("C").set_property("type", "admin")
+        self.db.get_node("D").set_properties({"type": "user"})
+        self.db.put_node("E", {"type": "user"})
+        self.db.get_node("B").delete()
+        self.assertEqual(ids(self.db.get_nodes(users)), ["C", "D", "E"])
+
+        self.db.get_node("E").delete_property("type")
+        self.db.get_node("D").set_property("type", ["unhashable"])
+        self.assertEqual(ids(self.db.get_nodes(users)), ["C"])
+
+    def test_index_rollback(self):
+        self.db.create_index("type")
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.get_node("A").set_property("type", "group")
+                self.db.put_node("E", {"type": "user"})
+                self.assertEqual(
+                    ids(self.db.get_nodes(P("type") == "user")), ["B", "E"]
+                )
+                raise ValueError()
+        self.assertEqual(ids(self.db.get_nodes(P("type") == "user")), ["A", "B"])
+
+    def test_index_reload(self):
+        db = GraphDatabase(filename=os.path.join(tempfile.mkdtemp(), "graph.db"))
+        db.put_node("A", {"type": "user"})
+        db.create_index("type")
+        self.assertEqual(ids(db.get_nodes(P("type") == "user")), ["A"])
+        db.save()
+        db.put_node("B", {"type": "user"})
+        db.reload()
+        self.assertEqual(ids(db.get_nodes(P("type") == "user")), ["A"])
+        self.assertEqual(ids(GraphDatabase(filename=db._filename).get_indexes()), [])
@@ -0,0 +1,190 @@
+import unittest
+from edgeable import GraphDatabase, GraphProfiler, GraphQuery, P
+
+
+def ids(matches, *names):
+    return sorted(tuple(match[name].get_id() for name in names) for match in matches)
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.db = GraphDatabase()
+        for id in ("ann", "bob", "cat", "dan"):
+            self.db.put_node(id, {"type": "user"})
+        for id in ("chess", "go"):
+            self.db.put_node(id, {"type": "group"})
+
+        def attach(source, destination, label):
+            self.db.get_node(source).attach(
+                self.db.get_node(destination), {"label": label}, directed=True
+            )
+
+        attach("ann", "bob", "follows")
+        attach("bob", "cat", "follows")
+        attach("cat", "ann", "follows")
+        attach("cat", "dan", "follows")
+        attach("bob", "chess", "member")
+        attach("cat", "go", "member")
+        attach("dan", "go", "member")
+
+    def test_chain(self):
+        query = (
+            GraphQuery(self.db)
+            .node("a", P("type") == "user")
+            .edge("a", "b", P("label") == "follows")
+            .edge("b", "g", P("label") == "member")
+            .node("g", P("type") == "group")
+        )
+        self.assertEqual(
+            ids(query, "a", "b", "g"),
+            [("ann", "bob", "chess"), ("bob", "cat", "go"), ("cat", "dan", "go")],
+        )
+
+    def test_single_node(self):
+        query = GraphQuery(self.db).node("g", P("type") == "group")
+        self.assertEqual(ids(query, "g"), [("chess",), ("go",)])
+        self.assertEqual(len(list(GraphQuery(self.db).node("n"))), 6)
+
+    def test_named_edges(self):
+        query = GraphQuery(self.db).edge("a", "g", P("label") == "member", name="m")
+        matches = list(query)
+        self.assertEqual(len(matches), 3)
+        for match in matches:
+            self.assertEqual(match["m"].get_source(), match["a"])
+            self.assertEqual(match["m"].get_destination(), match["g"])
+
+    def test_cycle(self):
+        follows = P("label") == "follows"
+        query = (
+            GraphQuery(self.db)
+            .edge("a", "b", follows)
+            .edge("b", "c", follows)
+            .edge("c", "a", follows)
+        )
+        self.assertEqual(
+            ids(query, "a", "b", "c"),
+            [("ann", "bob", "cat"), ("bob", "cat", "ann"), ("cat", "ann", "bob")],
+        )
+        self.assertIn("check", [step["step"] for step in query.explain()])
+
+    def test_shared_destination(self):
+        # both edges lead into g, so one of them is followed backwards
+        query = (
+            GraphQuery(self.db)
+            .node("a", P("type") == "user")
+            .node("b", P("type") == "user")
+            .edge("a", "g")
+            .edge("b", "g")
+            .node("g", P("type") == "group")
+        )
+        self.assertEqual(
+            ids(query, "a", "b", "g"),
+            [
+                ("bob", "bob", "chess"),
+                ("cat", "cat", "go"),
+                ("cat", "dan", "go"),
+                ("dan", "cat", "go"),
+                ("dan", "dan", "go"),
+            ],
+        )
+
+    def test_hops(self):
+        follows = P("label") == "follows"
+
+        def reached(min_hops, max_hops):
+            query = (
+                GraphQuery(self.db)
+                .node("a", lambda node: node.get_id() == "ann")
+                .edge("a", "b", follows, min_hops=min_hops, max_hops=max_hops)
+            )
+            return [match["b"].get_id() for match in query]
+
+        self.assertEqual(reached(1, 2), ["bob", "cat"])
+        self.assertEqual(reached(0, 1), ["ann", "bob"])
+        self.assertEqual(reached(2, 2), ["cat"])
+        self.assertEqual(reached(3, None), ["ann", "dan", "bob", "cat"])
+        self.assertEqual(reached(1, None), ["bob", "cat", "ann", "dan"])
+
+        # checked rather than expanded when both ends are bound
+        query = (
+            GraphQuery(self.db)
+            .node("a", P("type") == "user")
+            .node("b", P("type") == "group")
+            .edge("a", "b", min_hops=2, max_hops=2)
+        )
+        self.assertEqual(
+            ids(query, "a", "b"),
+            [("ann", "chess"), ("bob", "go"), ("cat", "go")],
+        )
+
+    def test_disconnected(self):
+        query = (
+            GraphQuery(self.db)
+            .node("a", P("type") == "group")
+            .node("b", P("type") == "group")
+        )
+        self.assertEqual(len(list(query)), 4)
+
+    def test_planner(self):
+        # starting from the selective end avoids scanning every user
+        for i in range(50):
+            self.db.put_node(i, {"type": "user"})
+        query = (
+            GraphQuery(self.db)
+            .node("a", P("type") == "user")
+            .edge("a", "g")
+            .node("g", P("type") == "group")
+        )
+        plan = query.explain()
+        self.assertEqual([step["step"] for step in plan], ["scan", "expand"])
+        self.assertEqual(plan[0]["variable"], "a")
+
+        query = GraphQuery(self.db).node("a").edge("a", "b").node("b", P("id") == 1)
+        self.db.get_node("dan").set_property("id", 1)
+        self.db.create_index("id")
+        plan = query.explain()
+        self.assertEqual(plan[0]["variable"], "b")
+        self.assertEqual(plan[0]["index"], "id")
+        self.assertEqual(plan[0]["cost"], 1)
+        self.assertEqual(ids(query, "a", "b"), [("cat", "dan")])
+
+    def test_lazy(self):
+        profiler = GraphProfiler()
+        self.db.set_profiler(profiler)
+        for i in range(1000):
+            self.db.put_node(i, {"type": "user"})
+        matches = GraphQuery(self.db).node("n", P("type") == "user").run(chunk_size=10)
+        self.assertEqual(next(matches)["n"].get_id(), "ann")
+
+        # the lock is released between chunks
+        self.db.get_node(500).delete()
+        self.db.put_node("eve", {"type": "user"})
+        rest = [match["n"].get_id() for match in matches]
+        self.assertEqual(rest[:3], ["bob", "cat", "dan"])
+        self.assertNotIn(500, rest)
+        self.assertEqual(len(rest), 1002)
+        self.assertEqual(profiler.get_stats()["traversals"]["match"]["total"], 1006)
+
+    def test_invalid_arguments(self):
+        query = GraphQuery(self.db)
+        with self.assertRaises(RuntimeError):
+            query.run()
+        with self.assertRaises(RuntimeError):
+            query.node(1)
+        with self.assertRaises(RuntimeError):
+            query.node("a", "type")
+        with self.assertRaises(RuntimeError):
+            query.edge("a", "b", min_hops=-1)
+        with self.assertRaises(RuntimeError):
+            query.edge("a", "b", min_hops=2, max_hops=1)
+        with self.assertRaises(RuntimeError):
+            query.edge("a", "b", name="e", max_hops=2)
+        with self.assertRaises(RuntimeError):
+            query.edge("a", "b", name="a")
+        query.edge("a", "b", name="e")
+        with self.assertRaises(RuntimeError):
+            query.node("e")
+        with self.assertRaises(RuntimeError):
+            query.run(chunk_size=0)
+        with self.assertRaises(RuntimeError):
+            GraphQuery(self.db, sample_size=0)
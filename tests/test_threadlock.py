@@ -105,3 +105,195 @@ class TestThreadLock(unittest.TestCase):
         self.q.put((self.do_safe_reading, ()))
         self.q.put((self.do_safe_writing, ()))
         self.q.join()
+
+    def test_databases_do_not_contend(self):
+        from edgeable import GraphDatabase
+
+        blocked = threading.Event()
+        release = threading.Event()
+
+        def block(node):
+            blocked.set()
+            release.wait(5)
+
+        db1 = GraphDatabase()
+        db2 = GraphDatabase()
+        db2.put_node("A")
+        db1.on_create_node(block)
+        writer = threading.Thread(target=lambda: db1.put_node("A"), daemon=True)
+        writer.start()
+        blocked.wait(5)
+
+        # a read on another database completes while db1 is being written
+        reader = threading.Thread(target=db2.get_nodes, daemon=True)
+        reader.start()
+        reader.join(1)
+        self.assertFalse(reader.is_alive())
+
+        # a read on the same database waits for the writer
+        reader = threading.Thread(target=db1.get_nodes, daemon=True)
+        reader.start()
+        reader.join(0.25)
+        self.assertTrue(reader.is_alive())
+
+        release.set()
+        writer.join(5)
+        reader.join(5)
+        self.assertFalse(reader.is_alive())
+
+    def test_writers_exclude_writers(self):
+        self.q.put((self.do_safe_writing, ()))
+        self.q.put((self.do_safe_writing, ()))
+        self.q.put((self.do_safe_writing, ()))
+        self.q.join()
+
+    def test_read_within_write(self):
+        from edgeable import GraphDatabase
+
+        db = GraphDatabase()
+        counts = []
+        db.on_create_node(lambda node: counts.append(db.get_node_count()))
+        db.on_create_node(lambda node: counts.append(len(db.get_nodes())))
+        db.put_node("A")
+
+        self.assertEqual(counts, [0, 0])
+
+    def test_write_within_write(self):
+        from edgeable import GraphDatabase
+
+        db = GraphDatabase()
+        db.on_create_node(lambda node: node.get_id() != "A" or db.put_node("B"))
+        db.put_node("A")
+
+        self.assertTrue(db.has_node("B"))
+
+    def test_write_within_read_raises(self):
+        writing = GraphModifyLock(lambda: None)
+        reading = GraphReadLock(writing)
+
+        with self.assertRaises(RuntimeError):
+            reading()
+
+        # the lock is released after the exception
+        writing()
+
+    def test_writer_preferred(self):
+        order = []
+        reading = threading.Event()
+        release = threading.Event()
+
+        def first_reader():
+            reading.set()
+            release.wait(5)
+            order.append("first reader")
+
+        def writer():
+            order.append("writer")
+
+        def second_reader():
+            order.append("second reader")
+
+        threads = [
+            threading.Thread(target=GraphReadLock(first_reader)),
+            threading.Thread(target=GraphModifyLock(writer)),
+            threading.Thread(target=GraphReadLock(second_reader)),
+        ]
+        threads[0].start()
+        reading.wait(5)
+        threads[1].start()
+        time.sleep(0.1)
+        threads[2].start()
+        time.sleep(0.1)
+
+        # the second reader queues behind the waiting writer
+        self.assertEqual(order, [])
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(order, ["first reader", "writer", "second reader"])
+
+    def test_lock_stats(self):
+        from edgeable import GraphDatabase
+
+        db = GraphDatabase()
+        db.put_node("A")
+        db.put_node("B")
+        db.get_nodes()
+
+        stats = db.get_lock_stats()
+        self.assertEqual(stats["GraphDatabase.put_node"]["count"], 2)
+        self.assertEqual(stats["GraphDatabase.get_nodes"]["count"], 1)
+        self.assertGreaterEqual(stats["GraphDatabase.put_node"]["hold"], 0.0)
+
+    def test_non_blocking_write_contended(self):
+        import sys
+        from edgeable import GraphLock
+
+        lock = GraphLock()
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            lock.acquire_read()
+            holding.set()
+            release.wait(10)
+            lock.release()
+
+        def write():
+            lock.acquire_write()
+            lock.release()
+
+        def start_writers():
+            for writer in writers:
+                time.sleep(0.001)
+                writer.start()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        holding.wait(5)
+        writers = [threading.Thread(target=write, daemon=True) for _ in range(50)]
+        starter = threading.Thread(target=start_writers)
+        try:
+            # failing attempts while writers queue must not remove their
+            # requests from the queue
+            starter.start()
+            while starter.is_alive():
+                self.assertFalse(lock.acquire_write(blocking=False))
+        finally:
+            sys.setswitchinterval(interval)
+            release.set()
+        holder.join(5)
+        for writer in writers:
+            writer.join(5)
+            self.assertFalse(writer.is_alive())
+
+        self.assertEqual(list(lock._waiting_writers), [])
+        self.assertTrue(lock.acquire_write(blocking=False))
+        lock.release()
+
+    def test_non_blocking_unavailable(self):
+        from edgeable import GraphLock
+
+        lock = GraphLock()
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            lock.acquire_read()
+            holding.set()
+            release.wait(5)
+            lock.release()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        holding.wait(5)
+        self.assertFalse(lock.acquire_write(blocking=False))
+        self.assertTrue(lock.acquire_read(blocking=False))
+        lock.release()
+        release.set()
+        holder.join(5)
+        self.assertTrue(lock.acquire_write(blocking=False))
+        lock.release()